@@ -4,15 +4,91 @@ Persona-driven conversation agent powered by Claude 3.5 Sonnet.
 """
 
 import os
-from typing import Dict, Any, List
-
-from anthropic import Anthropic
+import re
+import threading
+import time
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 
 from models.state import HoneyPotState
 from utils.logger import logger, log_security_event
+from services.degradation import degradation, DegradationLevel
+from services.health import provider_circuits
+from utils.metrics import LLM_LATENCY
+from utils.tracing import record_span
+from utils.flight_recorder import note_llm
 from config import settings, PersonaType
 
 
+# Marks a fallback LLM client that has not been created yet
+_PENDING = object()
+
+# Meta-commentary the models add despite the prompt, e.g. "(Note: ...)".
+# An unclosed note runs to the end of the text received so far.
+META_COMMENTARY = re.compile(r"\s*\(\s*note\b[^)]*\)?", re.IGNORECASE)
+
+# Sentence terminators followed by whitespace; ellipses are pauses, not ends
+SENTENCE_END = re.compile(r"(\.{2,}|…)|[.!?]+[\"')]*(?=\s)")
+
+# Words whose trailing period does not end a sentence ("Rs. 500")
+ABBREVIATIONS = frozenset({"rs", "mr", "mrs", "ms", "dr", "sr", "jr", "no", "st"})
+
+
+def trim_reply(text: str, max_sentences: int) -> Tuple[str, bool]:
+    """
+    Clean a (possibly partial) LLM reply and cut it at the sentence limit.
+    
+    Args:
+        text: Reply text received so far
+        max_sentences: Sentences to keep (0 = no limit)
+        
+    Returns:
+        (reply, complete) tuple; complete is True once the limit was reached,
+        so the rest of the completion is not needed
+    """
+    text = META_COMMENTARY.sub("", text)
+    
+    if max_sentences:
+        sentences = 0
+        for match in SENTENCE_END.finditer(text):
+            if match.group(1):
+                continue
+            word = text[:match.start()].rsplit(None, 1)[-1:] or [""]
+            if match.group() == "." and word[0].lower() in ABBREVIATIONS:
+                continue
+            sentences += 1
+            if sentences == max_sentences:
+                return text[:match.end()].strip(), True
+    
+    return text.strip(), False
+
+
+class EmptyReply(Exception):
+    """Raised when a provider reply is empty once meta-commentary is removed."""
+
+
+class ReplyCancelled(Exception):
+    """Raised when a speculative reply is called off while it streams."""
+
+
+def close_stream(stream: Any) -> None:
+    """
+    Stop reading a provider stream and release its connection.
+    
+    Groq/OpenAI streams close their HTTP response. A Gemini streaming
+    response has no close(); the transport iterator it reads from is
+    cancelled (gRPC) or closed (REST) instead.
+    
+    Args:
+        stream: Provider stream
+    """
+    close = getattr(stream, "close", None)
+    if close is None:
+        iterator = getattr(stream, "_iterator", None)
+        close = getattr(iterator, "cancel", None) or getattr(iterator, "close", None)
+    if close is not None:
+        close()
+
+
 class ActorAgent:
     """
     The Actor generates human-like Hinglish responses to keep scammers engaged.
@@ -127,6 +203,24 @@ Turn 7+: "Haan haan bhejta hu details... Lekin tum pehle apna WhatsApp number do
 Remember: Act interested but keep asking for THEIR details first."""
     }
     
+    # Instant stalling lines for when the system is too busy to generate a reply
+    STALL_RESPONSES = {
+        "english": [
+            "Wait... my phone is hanging. One minute please",
+            "Sorry, network is very slow here... say again?",
+            "Hold on, someone is at the door... I'll be back",
+            "One second, I'm looking for my glasses...",
+            "My phone battery is low... wait, let me find the charger",
+        ],
+        "hinglish": [
+            "Ruko ruko... phone hang ho gaya hai. Ek minute",
+            "Network bahut slow hai yahan... phir se bolo?",
+            "Ek second, darwaze pe koi aaya hai...",
+            "Ruko, chashma dhoond raha hu...",
+            "Battery low hai... charger dhoondta hu, ruko",
+        ],
+    }
+    
     def __init__(self):
         """Initialize Actor agent with Groq (primary), OpenAI (backup), and Gemini (legacy)."""
         # Initialize Groq (FREE, FAST, RELIABLE!)
@@ -139,25 +233,255 @@ Remember: Act interested but keep asking for THEIR details first."""
             except Exception as e:
                 logger.warning(f"Failed to initialize Groq: {e}")
         
-        # Initialize OpenAI backup
-        self.openai_client = None
+        # Fallback SDKs are heavy imports; build them on first fallback
+        self._openai_client: Any = _PENDING
+        self._gemini_model: Any = _PENDING
+        if not settings.lazy_llm_fallbacks:
+            self.openai_client
+            self.gemini_model
+    
+    @property
+    def openai_client(self) -> Any:
+        """OpenAI backup client, created on first use (None if unavailable)."""
+        if self._openai_client is _PENDING:
+            self._openai_client = self._create_openai_client()
+        return self._openai_client
+    
+    @openai_client.setter
+    def openai_client(self, client: Any) -> None:
+        self._openai_client = client
+    
+    @property
+    def gemini_model(self) -> Any:
+        """Gemini fallback model, created on first use (None if unavailable)."""
+        if self._gemini_model is _PENDING:
+            self._gemini_model = self._create_gemini_model()
+        return self._gemini_model
+    
+    @gemini_model.setter
+    def gemini_model(self, model: Any) -> None:
+        self._gemini_model = model
+    
+    @staticmethod
+    def _create_openai_client() -> Any:
+        """
+        Initialize the OpenAI backup client.
+        
+        Returns:
+            OpenAI client, or None if not configured
+        """
         if settings.openai_api_key and settings.openai_api_key != "your_openai_key_here":
             try:
                 from openai import OpenAI
-                self.openai_client = OpenAI(api_key=settings.openai_api_key)
+                client = OpenAI(api_key=settings.openai_api_key)
                 logger.info("✅ OpenAI backup LLM initialized")
+                return client
             except Exception as e:
                 logger.warning(f"Failed to initialize OpenAI backup: {e}")
+        return None
+    
+    @staticmethod
+    def _create_gemini_model() -> Any:
+        """
+        Initialize the Gemini fallback model.
         
-        # Keep Gemini as fallback
+        Returns:
+            Gemini model, or None if it cannot be created
+        """
         try:
             import google.generativeai as genai
             genai.configure(api_key=settings.google_api_key)
-            self.gemini_model = genai.GenerativeModel(settings.gemini_model)
+            model = genai.GenerativeModel(settings.gemini_model)
             logger.info("✅ Gemini fallback LLM initialized")
+            return model
         except Exception as e:
             logger.warning(f"Failed to initialize Gemini: {e}")
-            self.gemini_model = None
+            return None
+    
+    def stall_response(self, message: str) -> str:
+        """
+        Pick an in-persona stalling reply without calling any LLM.
+        
+        Args:
+            message: The scammer's message (used for language detection)
+            
+        Returns:
+            Stalling reply
+        """
+        import random
+        
+        language = self._detect_language(message)
+        return random.choice(self.STALL_RESPONSES[language])
+    
+    @staticmethod
+    def _llm_outcome(error: Exception) -> str:
+        """
+        Classify a failed provider call.
+        
+        Args:
+            error: Exception raised by the provider SDK
+            
+        Returns:
+            "cancelled", "empty", "rate_limited", "timeout" or "error"
+        """
+        if isinstance(error, ReplyCancelled):
+            return "cancelled"
+        if isinstance(error, EmptyReply):
+            return "empty"
+        text = f"{type(error).__name__} {error}".lower()
+        if "429" in text or "ratelimit" in text or "rate limit" in text or "quota" in text:
+            return "rate_limited"
+        if "timeout" in text or "timed out" in text or "deadline" in text:
+            return "timeout"
+        return "error"
+    
+    @staticmethod
+    def _cancelled(cancel: Optional[threading.Event]) -> bool:
+        """True once a speculative generation has been called off."""
+        return cancel is not None and cancel.is_set()
+    
+    def _read_stream(self, stream: Any, texts: Iterable[str], cancel: Optional[threading.Event]) -> str:
+        """
+        Read a streamed completion until the sentence limit, then close it.
+        
+        Args:
+            stream: Provider stream (closed when reading stops)
+            texts: Text of each chunk
+            cancel: Speculation flag; reading stops once it is set
+            
+        Returns:
+            Trimmed reply
+            
+        Raises:
+            ReplyCancelled: If the speculation was called off mid-stream
+            EmptyReply: If nothing but meta-commentary was received
+        """
+        received = ""
+        try:
+            for text in texts:
+                received += text
+                if self._cancelled(cancel):
+                    raise ReplyCancelled("Speculative reply cancelled")
+                reply, complete = trim_reply(received, settings.actor_max_sentences)
+                if complete:
+                    break
+            else:
+                reply = trim_reply(received, settings.actor_max_sentences)[0]
+        finally:
+            close_stream(stream)
+        if not reply:
+            raise EmptyReply("Reply empty after removing meta-commentary")
+        return reply
+    
+    @staticmethod
+    def _checked(text: Optional[str]) -> str:
+        """
+        Strip a non-streamed reply.
+        
+        Args:
+            text: Reply text from the provider
+            
+        Returns:
+            Stripped reply
+            
+        Raises:
+            EmptyReply: If the provider returned no text
+        """
+        reply = (text or "").strip()
+        if not reply:
+            raise EmptyReply("Provider returned an empty reply")
+        return reply
+    
+    def _chat_reply(
+        self,
+        client: Any,
+        model: str,
+        messages: List[Dict[str, str]],
+        timeout: float,
+        cancel: Optional[threading.Event],
+    ) -> str:
+        """
+        Get a reply from a Groq/OpenAI-style chat completions client.
+        
+        Args:
+            client: Groq or OpenAI client
+            model: Model name
+            messages: Chat messages
+            timeout: Request timeout in seconds
+            cancel: Speculation flag
+            
+        Returns:
+            Reply (cut at the sentence limit when streamed)
+        """
+        if not settings.actor_streaming:
+            response = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=0.9,
+                max_tokens=100,
+                timeout=timeout
+            )
+            return self._checked(response.choices[0].message.content)
+        
+        stream = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=0.9,
+            max_tokens=100,
+            timeout=timeout,
+            stream=True
+        )
+        texts = (chunk.choices[0].delta.content or "" for chunk in stream if chunk.choices)
+        return self._read_stream(stream, texts, cancel)
+    
+    def _gemini_reply(self, prompt: str, cancel: Optional[threading.Event]) -> str:
+        """
+        Get a reply from the Gemini model.
+        
+        Args:
+            prompt: Single-prompt form of the persona prompt
+            cancel: Speculation flag
+            
+        Returns:
+            Reply (cut at the sentence limit when streamed)
+        """
+        response = self.gemini_model.generate_content(
+            prompt,
+            generation_config={
+                "temperature": 0.9,
+                "max_output_tokens": 100,
+            },
+            safety_settings={
+                'HARASSMENT': 'block_none',
+                'HATE_SPEECH': 'block_none',
+                'DANGEROUS': 'block_none',
+                'SEXUALLY_EXPLICIT': 'block_none',
+            },
+            request_options={"timeout": 8},
+            stream=settings.actor_streaming
+        )
+        if not settings.actor_streaming:
+            return self._checked(response.text)
+        return self._read_stream(response, (chunk.text for chunk in response), cancel)
+    
+    def _record_llm(self, provider: str, started: float, error: Optional[Exception] = None) -> None:
+        """
+        Record one provider attempt as a metric, a span, a flight record
+        and a circuit-state update.
+        
+        Args:
+            provider: "groq", "openai" or "gemini"
+            started: perf_counter() value at call start
+            error: Exception the attempt failed with, None on success
+        """
+        outcome = "success" if error is None else self._llm_outcome(error)
+        elapsed = time.perf_counter() - started
+        LLM_LATENCY.labels(provider, outcome).observe(elapsed)
+        note_llm(provider, outcome, elapsed * 1000)
+        record_span(f"llm.{provider}", started, error, provider=provider, outcome=outcome)
+        # A call we cancelled says nothing about the provider's health
+        if outcome != "cancelled":
+            provider_circuits.record(provider, error is None)
     
     def _detect_language(self, message: str) -> str:
         """
@@ -249,12 +573,13 @@ Mix Hindi and English naturally:
         
         return base_prompt + language_instruction
     
-    def _build_context(self, state: HoneyPotState) -> str:
+    def _build_context(self, state: HoneyPotState, max_messages: int = 6) -> str:
         """
         Build conversation context for Gemini.
         
         Args:
             state: Current state
+            max_messages: Number of most recent messages to include
             
         Returns:
             Formatted conversation history
@@ -262,7 +587,7 @@ Mix Hindi and English naturally:
         context = "Previous conversation:\n"
         
         # Add conversation history
-        for msg in state.get("messages", [])[-6:]:  # Last 6 messages
+        for msg in state.get("messages", [])[-max_messages:]:
             role = "Scammer" if msg["role"] == "scammer" else "You"
             context += f"{role}: {msg['content']}\n"
         
@@ -293,36 +618,27 @@ Mix Hindi and English naturally:
         else:  # Stall/Verify
             return "extracting"
     
-    def generate_response(self, state: HoneyPotState) -> HoneyPotState:
+    def _build_prompt(
+        self,
+        state: HoneyPotState,
+        persona: str,
+        language: str,
+        turn_number: int,
+        emotional_state: str,
+    ) -> Tuple[str, str, str]:
         """
-        Generate persona-based response using Gemini.
+        Assemble the persona prompt for this turn.
         
         Args:
             state: Current state
+            persona: Persona name
+            language: "english" or "hinglish"
+            turn_number: Current turn
+            emotional_state: Emotion for this turn
             
         Returns:
-            Updated state with actor response
+            (system_prompt, conversation_context, full_prompt_text) tuple
         """
-        session_id = state.get("session_id", "unknown")
-        turn_number = state.get("turn_number", 1)
-        persona = state.get("persona_used", settings.default_persona.value)
-        current_message = state.get("current_message", "")
-        
-        log_security_event(
-            logger,
-            "ACTOR",
-            f"Generating response with {persona} persona",
-            session_id=session_id,
-            turn=turn_number,
-        )
-        
-        # Detect language
-        language = self._detect_language(current_message)
-        
-        # Determine emotional state
-        emotional_state = self._get_emotional_state(turn_number)
-        state["emotional_state"] = emotional_state
-        
         # Get persona prompt
         base_prompt = self.PERSONA_PROMPTS.get(
             PersonaType(persona),
@@ -368,8 +684,66 @@ Mix Hindi and English naturally:
         
         system_prompt += emotion_context
         
-        # Build conversation context
-        conversation_context = self._build_context(state)
+        # Build conversation context (shortened under load)
+        conversation_context = self._build_context(
+            state,
+            max_messages=2 if degradation.degraded(DegradationLevel.SHORT_CONTEXT) else 6,
+        )
+        
+        # Single-prompt form for Gemini
+        full_prompt_text = f"{system_prompt}\n\n{conversation_context}\n\nYour response (1-2 sentences only, in {'English' if language == 'english' else 'Hinglish'}):"
+        
+        return system_prompt, conversation_context, full_prompt_text
+    
+    def generate_response(self, state: HoneyPotState) -> HoneyPotState:
+        """
+        Generate persona-based response using Gemini.
+        
+        Args:
+            state: Current state
+            
+        Returns:
+            Updated state with actor response
+        """
+        state.update(self.respond(state))
+        return state
+    
+    def respond(self, state: HoneyPotState, cancel: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """
+        Generate the persona response without modifying the state.
+        
+        Args:
+            state: Current state
+            cancel: Set when a speculative generation is no longer needed;
+                checked before each provider attempt
+            
+        Returns:
+            Actor fields to merge into the state (without a reply if cancelled)
+        """
+        update: Dict[str, Any] = {}
+        session_id = state.get("session_id", "unknown")
+        turn_number = state.get("turn_number", 1)
+        persona = state.get("persona_used", settings.default_persona.value)
+        current_message = state.get("current_message", "")
+        
+        log_security_event(
+            logger,
+            "ACTOR",
+            f"Generating response with {persona} persona",
+            session_id=session_id,
+            turn=turn_number,
+        )
+        
+        # Detect language
+        language = self._detect_language(current_message)
+        
+        # Determine emotional state
+        emotional_state = self._get_emotional_state(turn_number)
+        update["emotional_state"] = emotional_state
+        
+        system_prompt, conversation_context, full_prompt_text = self._build_prompt(
+            state, persona, language, turn_number, emotional_state
+        )
         
         # Log detected language
         log_security_event(
@@ -384,30 +758,32 @@ Mix Hindi and English naturally:
         llm_success = False
         llm_source = None
         
-        # Build prompt once
-        full_prompt_text = f"{system_prompt}\n\n{conversation_context}\n\nYour response (1-2 sentences only, in {'English' if language == 'english' else 'Hinglish'}):"
+        # Under heavy load, go straight to the fallback bank
+        skip_llm = degradation.degraded(DegradationLevel.FALLBACK_ONLY)
+        
+        chat_messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"{conversation_context}\n\nRespond in 1-2 sentences in {'English' if language == 'english' else 'Hinglish'}."}
+        ]
         
         # 1. Try Groq first (FREE, FAST, RELIABLE!)
-        if not llm_success and self.groq_client:
+        if not llm_success and not skip_llm and self.groq_client and not self._cancelled(cancel):
             try:
                 logger.info("Trying Groq LLM (primary)...")
+                started = time.perf_counter()
                 
-                response = self.groq_client.chat.completions.create(
-                    model=settings.groq_model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": f"{conversation_context}\n\nRespond in 1-2 sentences in {'English' if language == 'english' else 'Hinglish'}."}
-                    ],
-                    temperature=0.9,
-                    max_tokens=100,
-                    timeout=10
+                actor_response = self._chat_reply(
+                    self.groq_client,
+                    settings.groq_model,
+                    chat_messages,
+                    timeout=10,
+                    cancel=cancel,
                 )
-                
-                actor_response = response.choices[0].message.content.strip()
-                state["actor_response"] = actor_response
-                state["actor_complete"] = True
+                update["actor_response"] = actor_response
+                update["actor_complete"] = True
                 llm_success = True
                 llm_source = "Groq"
+                self._record_llm("groq", started)
                 
                 log_security_event(
                     logger,
@@ -419,29 +795,27 @@ Mix Hindi and English naturally:
                 )
                 
             except Exception as e:
+                self._record_llm("groq", started, e)
                 logger.warning(f"Groq failed: {str(e)[:100]}")
         
         # 2. Try OpenAI as backup
-        if not llm_success and self.openai_client:
+        if not llm_success and not skip_llm and self.openai_client and not self._cancelled(cancel):
             try:
                 logger.info("Trying OpenAI as backup...")
+                started = time.perf_counter()
                 
-                response = self.openai_client.chat.completions.create(
-                    model=settings.openai_model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": f"{conversation_context}\n\nRespond in 1-2 sentences in {'English' if language == 'english' else 'Hinglish'}."}
-                    ],
-                    temperature=0.9,
-                    max_tokens=100,
-                    timeout=8
+                actor_response = self._chat_reply(
+                    self.openai_client,
+                    settings.openai_model,
+                    chat_messages,
+                    timeout=8,
+                    cancel=cancel,
                 )
-                
-                actor_response = response.choices[0].message.content.strip()
-                state["actor_response"] = actor_response
-                state["actor_complete"] = True
+                update["actor_response"] = actor_response
+                update["actor_complete"] = True
                 llm_success = True
                 llm_source = "OpenAI"
+                self._record_llm("openai", started)
                 
                 log_security_event(
                     logger,
@@ -453,33 +827,23 @@ Mix Hindi and English naturally:
                 )
                 
             except Exception as e:
+                self._record_llm("openai", started, e)
                 logger.warning(f"OpenAI failed: {str(e)[:100]}")
         
         # 3. Try Gemini as last LLM option
-        if not llm_success and self.gemini_model:
+        if not llm_success and not skip_llm and self.gemini_model:
             max_retries = 2
             for attempt in range(max_retries):
+                if self._cancelled(cancel):
+                    break
+                started = time.perf_counter()
                 try:
-                    response = self.gemini_model.generate_content(
-                        full_prompt_text,
-                        generation_config={
-                            "temperature": 0.9,
-                            "max_output_tokens": 100,
-                        },
-                        safety_settings={
-                            'HARASSMENT': 'block_none',
-                            'HATE_SPEECH': 'block_none',
-                            'DANGEROUS': 'block_none',
-                            'SEXUALLY_EXPLICIT': 'block_none',
-                        },
-                        request_options={"timeout": 8}
-                    )
-                    
-                    actor_response = response.text.strip()
-                    state["actor_response"] = actor_response
-                    state["actor_complete"] = True
+                    actor_response = self._gemini_reply(full_prompt_text, cancel)
+                    update["actor_response"] = actor_response
+                    update["actor_complete"] = True
                     llm_success = True
                     llm_source = "Gemini"
+                    self._record_llm("gemini", started)
                     
                     log_security_event(
                         logger,
@@ -492,12 +856,21 @@ Mix Hindi and English naturally:
                     break
                     
                 except Exception as e:
+                    self._record_llm("gemini", started, e)
                     logger.warning(f"Gemini attempt {attempt + 1}/{max_retries} failed: {str(e)[:100]}")
-                    if attempt < max_retries - 1:
-                        import time
+                    if attempt < max_retries - 1 and not self._cancelled(cancel):
                         time.sleep(0.5)
                     continue
         
+        if not llm_success and self._cancelled(cancel):
+            log_security_event(
+                logger,
+                "ACTOR",
+                "Speculative response cancelled",
+                session_id=session_id,
+            )
+            return update
+        
         # 4. If all LLMs failed, use rich contextual fallbacks
         if not llm_success:
             logger.info("Gemini unavailable, using smart contextual responses")
@@ -667,12 +1040,12 @@ Mix Hindi and English naturally:
                     responses[(base_idx + 1) % len(responses)],
                     responses[(base_idx + random.randint(2, 4)) % len(responses)]
                 ]
-                state["actor_response"] = random.choice(candidates)
+                update["actor_response"] = random.choice(candidates)
             else:
                 response_idx = (turn_number - 1) % len(responses)
-                state["actor_response"] = responses[response_idx]
+                update["actor_response"] = responses[response_idx]
             
-            state["actor_complete"] = True
+            update["actor_complete"] = True
             
             log_security_event(
                 logger,
@@ -683,5 +1056,5 @@ Mix Hindi and English naturally:
                 emotion=emotional_state,
             )
         
-        return state
+        return update
 
@@ -6,9 +6,21 @@ Silent intelligence extraction without alerting the scammer.
 from typing import Dict, Any
 from datetime import datetime
 
-from models.state import HoneyPotState
+from models.state import HoneyPotState, apply_update
 from utils.logger import logger, log_security_event
 from utils.extraction import IntelligenceExtractor
+from services.degradation import degradation, DegradationLevel
+
+
+# State field -> IntelligenceExtractor.extract_all() key
+INDICATOR_FIELDS = {
+    "extracted_upi_ids": "upi_ids",
+    "extracted_bank_accounts": "bank_accounts",
+    "extracted_phone_numbers": "phone_numbers",
+    "extracted_urls": "urls",
+    "extracted_emails": "emails",
+    "extracted_keywords": "keywords",
+}
 
 
 class AuditorAgent:
@@ -32,6 +44,18 @@ class AuditorAgent:
         Returns:
             Updated state with extracted intelligence
         """
+        return apply_update(state, self.audit(state))
+    
+    def audit(self, state: HoneyPotState) -> Dict[str, Any]:
+        """
+        Extract intelligence without modifying the state.
+        
+        Args:
+            state: Current state
+            
+        Returns:
+            Update with only the new indicators and ledger entries
+        """
         session_id = state.get("session_id", "unknown")
         current_message = state.get("current_message", "")
         
@@ -45,50 +69,45 @@ class AuditorAgent:
         # ===================================
         # Extract All Intelligence
         # ===================================
-        extracted = self.extractor.extract_all(current_message)
-        
-        # Update state with NEW extractions (append to existing)
-        state["extracted_upi_ids"] = list(set(
-            state.get("extracted_upi_ids", []) + extracted["upi_ids"]
-        ))
-        
-        state["extracted_bank_accounts"] = list(set(
-            state.get("extracted_bank_accounts", []) + extracted["bank_accounts"]
-        ))
-        
-        state["extracted_phone_numbers"] = list(set(
-            state.get("extracted_phone_numbers", []) + extracted["phone_numbers"]
-        ))
-        
-        state["extracted_urls"] = list(set(
-            state.get("extracted_urls", []) + extracted["urls"]
-        ))
-        
-        state["extracted_emails"] = list(set(
-            state.get("extracted_emails", []) + extracted["emails"]
-        ))
-        
-        state["extracted_keywords"] = list(set(
-            state.get("extracted_keywords", []) + extracted["keywords"]
-        ))
+        # A coalesced burst is audited message by message so the ledger
+        # keeps one entry per scammer message
+        batch = state.get("pending_messages") or [current_message]
+        known = {field: set(state.get(field) or ()) for field in INDICATOR_FIELDS}
+        update: Dict[str, Any] = {field: [] for field in INDICATOR_FIELDS}
+        update["forensic_ledger"] = []
+        extractions = []
+        phone_second_pass = not degradation.degraded(DegradationLevel.SKIP_PHONE_SECOND_PASS)
+        
+        for text in batch:
+            extracted = self.extractor.extract_all(text, phone_second_pass)
+            extractions.append(extracted)
+            
+            # Record only indicators not seen earlier in the session
+            for field, key in INDICATOR_FIELDS.items():
+                for value in extracted[key]:
+                    if value not in known[field]:
+                        known[field].add(value)
+                        update[field].append(value)
+            
+            # ===================================
+            # Update Forensic Ledger
+            # ===================================
+            update["forensic_ledger"].append({
+                "timestamp": datetime.utcnow().isoformat(),
+                "turn_number": state.get("turn_number", 0),
+                "message_preview": text[:100],
+                "extracted": extracted,
+            })
         
         # ===================================
-        # Update Forensic Ledger
+        # Log Findings
         # ===================================
-        forensic_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "turn_number": state.get("turn_number", 0),
-            "message_preview": current_message[:100],
-            "extracted": extracted,
+        # Totals across the whole batch
+        extracted = {
+            field: [value for entry in extractions for value in entry[field]]
+            for field in ("upi_ids", "bank_accounts", "phone_numbers", "urls", "emails")
         }
         
-        forensic_ledger = state.get("forensic_ledger", [])
-        forensic_ledger.append(forensic_entry)
-        state["forensic_ledger"] = forensic_ledger
-        
-        # ===================================
-        # Log Findings
-        # ===================================
         findings = []
         if extracted["upi_ids"]:
             findings.append(f"UPI={len(extracted['upi_ids'])}")
@@ -119,9 +138,9 @@ class AuditorAgent:
         # ===================================
         # Check for High-Value Intel
         # ===================================
-        total_upi = len(state["extracted_upi_ids"])
-        total_urls = len(state["extracted_urls"])
-        total_phones = len(state["extracted_phone_numbers"])
+        total_upi = len(known["extracted_upi_ids"])
+        total_urls = len(known["extracted_urls"])
+        total_phones = len(known["extracted_phone_numbers"])
         
         high_value_threshold = 3  # Trigger callback if we have 3+ pieces of intel
         total_intel = total_upi + total_urls + total_phones
@@ -135,9 +154,9 @@ class AuditorAgent:
             )
             # Could set a flag here to prioritize callback
         
-        state["auditor_complete"] = True
+        update["auditor_complete"] = True
         
-        return state
+        return update
     
     def generate_summary(self, state: HoneyPotState) -> str:
         """
@@ -9,6 +9,7 @@ from models.state import HoneyPotState
 from utils.logger import logger, log_security_event
 from utils.forensics import ForensicsAnalyzer
 from utils.extraction import IntelligenceExtractor
+from services.degradation import degradation, DegradationLevel
 from config import settings
 
 
@@ -38,6 +39,20 @@ class ProfilerAgent:
         Returns:
             Updated state with profiler results
         """
+        state.update(self.assess(state))
+        return state
+    
+    def assess(self, state: HoneyPotState) -> Dict[str, Any]:
+        """
+        Run zero-trust analysis without modifying the state.
+        
+        Args:
+            state: Current LangGraph state
+            
+        Returns:
+            Profiler fields to merge into the state
+        """
+        update: Dict[str, Any] = {}
         session_id = state.get("session_id", "unknown")
         sender_id = state.get("sender_id", "")
         message = state.get("current_message", "")
@@ -57,7 +72,7 @@ class ProfilerAgent:
         
         if settings.enable_trai_validation:
             trai_valid, trai_reason = self.forensics.validate_trai_header(sender_id)
-            state["trai_valid"] = trai_valid
+            update["trai_valid"] = trai_valid
             log_security_event(
                 logger,
                 "PROFILER",
@@ -66,12 +81,15 @@ class ProfilerAgent:
                 valid=trai_valid,
             )
         else:
-            state["trai_valid"] = None
+            update["trai_valid"] = None
         
         # ===================================
         # Extract Intelligence
         # ===================================
-        extracted = self.extractor.extract_all(message)
+        extracted = self.extractor.extract_all(
+            message,
+            phone_second_pass=not degradation.degraded(DegradationLevel.SKIP_PHONE_SECOND_PASS),
+        )
         
         urls = extracted["urls"]
         suspicious_urls = extracted["suspicious_urls"]
@@ -95,14 +113,16 @@ class ProfilerAgent:
         # ===================================
         domain_age_days = None
         
-        if settings.enable_domain_age_check and urls:
+        skip_whois = degradation.degraded(DegradationLevel.SKIP_WHOIS)
+        
+        if settings.enable_domain_age_check and urls and not skip_whois:
             # Check first URL's domain
             domain = self.forensics.extract_domain_from_url(urls[0])
             if domain:
                 age_days, age_status = self.forensics.check_domain_age(domain)
                 if age_days is not None:
                     domain_age_days = age_days
-                    state["domain_age_days"] = age_days
+                    update["domain_age_days"] = age_days
                     log_security_event(
                         logger,
                         "PROFILER",
@@ -123,9 +143,9 @@ class ProfilerAgent:
             has_payment_info=has_payment_info,
         )
         
-        state["scam_probability"] = scam_score
-        state["risk_flags"] = risk_flags
-        state["profiler_complete"] = True
+        update["scam_probability"] = scam_score
+        update["risk_flags"] = risk_flags
+        update["profiler_complete"] = True
         
         log_security_event(
             logger,
@@ -139,7 +159,7 @@ class ProfilerAgent:
         # Decision: Should we engage?
         # ===================================
         if scam_score >= settings.scam_threshold:
-            state["should_continue"] = True
+            update["should_continue"] = True
             log_security_event(
                 logger,
                 "PROFILER",
@@ -147,7 +167,7 @@ class ProfilerAgent:
                 session_id=session_id,
             )
         else:
-            state["should_continue"] = False
+            update["should_continue"] = False
             log_security_event(
                 logger,
                 "PROFILER",
@@ -155,4 +175,4 @@ class ProfilerAgent:
                 session_id=session_id,
             )
         
-        return state
+        return update
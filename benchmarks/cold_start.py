@@ -0,0 +1,192 @@
+"""
+🧊 Cold-Start Benchmark
+Measures how long a fresh worker takes to import, become ready and answer
+its first request, and tracks the numbers over time.
+
+Every run starts a new Python process that:
+    1. imports main                      -> import_ms
+    2. runs the FastAPI lifespan startup
+       and waits for warm-up            -> ready_ms (from step 1)
+    3. sends one /api/honeypot request   -> first_request_ms, first_success_ms
+    4. sends a second request            -> second_request_ms (warm baseline)
+
+LLM clients are disabled in the child so the numbers do not depend on the
+network. Medians are appended to benchmarks/cold_start_history.jsonl and
+compared with the previous entry.
+
+Usage:
+    python benchmarks/cold_start.py [--runs 5] [--target-ms 8000] [--no-history]
+
+Exits with status 1 if the median time to ready exceeds the target
+(STARTUP_READY_TARGET_MS by default).
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+HISTORY_FILE = Path(__file__).resolve().parent / "cold_start_history.jsonl"
+
+METRICS = ("process_ms", "import_ms", "ready_ms", "first_request_ms", "first_success_ms", "second_request_ms")
+
+CHILD = r"""
+import time
+t0 = time.perf_counter()
+
+import asyncio, json
+import httpx
+
+import main
+t_import = time.perf_counter()
+
+from config import settings
+from graph import honeypot_graph
+
+
+def body(i):
+    return {
+        "sessionId": f"cold-start-{i}",
+        "message": {
+            "sender": "scammer",
+            "text": "URGENT: Your SBI account is blocked. Share OTP and pay Rs 1 to verify@paytm",
+            "timestamp": 1770000000000 + i,
+        },
+        "conversationHistory": [],
+    }
+
+
+async def run():
+    out = {"import_ms": (t_import - t0) * 1000}
+    async with main.app.router.lifespan_context(main.app):
+        while not main.is_ready():
+            await asyncio.sleep(0.005)
+        out["ready_ms"] = (time.perf_counter() - t0) * 1000
+
+        # Offline: every reply comes from the fallback bank
+        honeypot_graph.actor.groq_client = None
+        honeypot_graph.actor.openai_client = None
+        honeypot_graph.actor.gemini_model = None
+
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            headers = {"X-API-Key": settings.api_key}
+            for i, key in ((1, "first_request_ms"), (2, "second_request_ms")):
+                started = time.perf_counter()
+                response = await client.post("/api/honeypot", json=body(i), headers=headers)
+                out[key] = (time.perf_counter() - started) * 1000
+                if response.status_code != 200:
+                    raise SystemExit(f"request failed: {response.status_code} {response.text[:200]}")
+                if i == 1:
+                    out["first_success_ms"] = (time.perf_counter() - t0) * 1000
+    print("COLD_START " + json.dumps(out))
+
+
+asyncio.run(run())
+"""
+
+
+def run_once() -> dict:
+    """
+    Start one fresh worker process and collect its timings.
+
+    Returns:
+        Timings in milliseconds
+    """
+    env = dict(os.environ)
+    env.setdefault("ENABLE_DOMAIN_AGE_CHECK", "false")
+
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    process_ms = (time.perf_counter() - started) * 1000
+
+    for line in proc.stdout.splitlines():
+        if line.startswith("COLD_START "):
+            result = json.loads(line[len("COLD_START "):])
+            result["process_ms"] = process_ms
+            return result
+
+    raise RuntimeError(f"Benchmark child failed (exit {proc.returncode}):\n{proc.stderr[-2000:]}")
+
+
+def git_commit() -> str:
+    """Short commit hash of the tree being measured, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def last_entry() -> dict:
+    """Most recent history entry, or an empty dict."""
+    if not HISTORY_FILE.exists():
+        return {}
+    lines = [line for line in HISTORY_FILE.read_text().splitlines() if line.strip()]
+    return json.loads(lines[-1]) if lines else {}
+
+
+def main() -> int:
+    sys.path.insert(0, str(ROOT))
+    from config import settings
+
+    parser = argparse.ArgumentParser(description="Cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes to start")
+    parser.add_argument("--target-ms", type=float, default=settings.startup_ready_target_ms,
+                        help="max median time to ready (0 = no check)")
+    parser.add_argument("--no-history", action="store_true", help="do not append to the history file")
+    args = parser.parse_args()
+
+    runs = []
+    for i in range(args.runs):
+        result = run_once()
+        runs.append(result)
+        print(f"run {i + 1}/{args.runs}: " + "  ".join(f"{k}={result[k]:.0f}" for k in METRICS))
+
+    medians = {k: round(statistics.median(r[k] for r in runs), 1) for k in METRICS}
+    previous = last_entry().get("median_ms", {})
+
+    print("\nmedian (ms)          now    previous   delta")
+    for key in METRICS:
+        before = previous.get(key)
+        delta = f"{medians[key] - before:+.0f}" if before is not None else ""
+        print(f"  {key:<18} {medians[key]:>7.0f} {before if before is not None else '-':>10}   {delta}")
+
+    if not args.no_history:
+        entry = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "runs": args.runs,
+            "median_ms": medians,
+        }
+        with HISTORY_FILE.open("a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    if args.target_ms and medians["ready_ms"] > args.target_ms:
+        print(f"\n❌ Time to ready {medians['ready_ms']:.0f} ms exceeds target {args.target_ms:.0f} ms")
+        return 1
+
+    print("\n✅ Within target" if args.target_ms else "")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+🔀 Executor Benchmark
+Per-turn cost of the compiled LangGraph versus the built-in DirectExecutor
+(GRAPH_EXECUTOR=langgraph|direct).
+
+Two measurements per executor:
+    framework   pass-through nodes with the real routers and node
+                instrumentation, so the time is executor overhead only
+    workflow    full process_message turns over Mock Scammer sessions with
+                zero-latency stub LLMs and the in-memory session store
+
+Both executors get the same inputs and seeds; the workflow pass also checks
+that they produce the same replies (tests/test_performance.py has the full
+differential test).
+
+Usage:
+    python benchmarks/executor.py [--turns 2000] [--sessions 50] [--json out.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("ENABLE_DOMAIN_AGE_CHECK", "false")
+
+EXECUTORS = ("langgraph", "direct")
+SEED = 1337
+
+
+def build_graph(executor: str) -> Any:
+    """
+    HoneyPotGraph compiled with the given executor and stubbed LLMs.
+
+    Args:
+        executor: "langgraph" or "direct"
+
+    Returns:
+        HoneyPotGraph instance
+    """
+    from config import settings
+    from graph import HoneyPotGraph
+    from tests.stub_llm import StubBehavior, install_stubs
+
+    settings.graph_executor = executor
+    graph = HoneyPotGraph()
+    install_stubs(graph.actor, groq=StubBehavior(median_ms=0, latency="fixed", tokens_per_s=float("inf"), seed=SEED))
+    return graph
+
+
+def build_passthrough(executor: str) -> Any:
+    """
+    HoneyPotGraph whose nodes do nothing, so only executor overhead is left.
+
+    Args:
+        executor: "langgraph" or "direct"
+
+    Returns:
+        HoneyPotGraph instance
+    """
+    from config import settings
+    from graph import HoneyPotGraph
+
+    class PassthroughGraph(HoneyPotGraph):
+        def _start_node(self, state):
+            return {"current_phase": "START"}
+
+        def _detect_node(self, state):
+            return {"current_phase": "DETECT"}
+
+        def _engage_node(self, state):
+            return {"current_phase": "ENGAGE"}
+
+        def _extract_node(self, state):
+            return {"current_phase": "EXTRACT"}
+
+        async def _callback_node(self, state):
+            return {"current_phase": "CALLBACK"}
+
+    settings.graph_executor = executor
+    return PassthroughGraph()
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Mean/p50/p95 in microseconds."""
+    ordered = sorted(samples)
+    return {
+        "mean_us": round(statistics.fmean(ordered) * 1e6, 1),
+        "p50_us": round(ordered[len(ordered) // 2] * 1e6, 1),
+        "p95_us": round(ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)] * 1e6, 1),
+    }
+
+
+async def run_framework(executor: str, turns: int) -> List[float]:
+    """
+    Time `turns` invocations of the pass-through workflow.
+
+    Returns:
+        Per-invocation durations in seconds
+    """
+    graph = build_passthrough(executor)
+    state = {
+        "session_id": "executor-bench",
+        "turn_number": 1,
+        "scam_probability": 0.9,
+        "messages": [],
+    }
+    for _ in range(50):
+        await graph.graph.ainvoke(dict(state))
+
+    samples = []
+    for _ in range(turns):
+        started = time.perf_counter()
+        await graph.graph.ainvoke(dict(state))
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def run_workflow(executor: str, conversations: List[List[str]]) -> Tuple[List[float], List[str]]:
+    """
+    Play the conversations through process_message.
+
+    Returns:
+        (per-turn durations in seconds, replies in order)
+    """
+    from utils.redis_client import redis_client
+
+    graph = build_graph(executor)
+    await graph.process_message("executor-bench-warmup", "+919812345678", conversations[0][0])
+    redis_client.delete_state("executor-bench-warmup")
+
+    random.seed(SEED)
+    samples, replies = [], []
+    for index, conversation in enumerate(conversations):
+        session_id = f"executor-bench-{index}"
+        redis_client.delete_state(session_id)
+        for text in conversation:
+            started = time.perf_counter()
+            reply, _, _ = await graph.process_message(session_id, "+919812345678", text)
+            samples.append(time.perf_counter() - started)
+            replies.append(reply)
+        redis_client.delete_state(session_id)
+    return samples, replies
+
+
+def build_conversations(sessions: int) -> List[List[str]]:
+    """Seeded Mock Scammer conversations of 3-8 turns."""
+    from faker import Faker
+    from tests.mock_scammer import MockScammer
+
+    random.seed(SEED)
+    Faker.seed(SEED)
+    return [
+        [turn["message"] for turn in MockScammer.generate_conversation(random.randint(3, 8))]
+        for _ in range(sessions)
+    ]
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    from config import settings
+    from services.callback import callback_service
+    from utils.logger import logger
+    from utils.redis_client import redis_client
+
+    logger.setLevel("WARNING")
+    redis_client.client = None  # in-memory session store
+
+    async def discard_callback(payload, session_id):
+        return True, None
+
+    callback_service.send_callback = discard_callback
+    configured = settings.graph_executor
+
+    report: Dict[str, Any] = {"framework": {}, "workflow": {}}
+    conversations = build_conversations(args.sessions)
+    replies: Dict[str, List[str]] = {}
+    try:
+        for executor in EXECUTORS:
+            report["framework"][executor] = summarize(await run_framework(executor, args.turns))
+            samples, replies[executor] = await run_workflow(executor, conversations)
+            report["workflow"][executor] = {**summarize(samples), "turns": len(samples)}
+    finally:
+        settings.graph_executor = configured
+
+    for section in ("framework", "workflow"):
+        base, new = report[section]["langgraph"], report[section]["direct"]
+        report[section]["saved_us_per_turn"] = round(base["mean_us"] - new["mean_us"], 1)
+        report[section]["speedup"] = round(base["mean_us"] / new["mean_us"], 2) if new["mean_us"] else None
+    report["identical_replies"] = replies["langgraph"] == replies["direct"]
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Human-readable summary."""
+    print(f"{'':<11} {'executor':<10} {'mean µs':>10} {'p50 µs':>10} {'p95 µs':>10}")
+    for section in ("framework", "workflow"):
+        for executor in EXECUTORS:
+            row = report[section][executor]
+            print(f"{section:<11} {executor:<10} {row['mean_us']:>10,.1f} {row['p50_us']:>10,.1f} {row['p95_us']:>10,.1f}")
+        print(f"{'':<11} saved {report[section]['saved_us_per_turn']:,.1f} µs/turn ({report[section]['speedup']}x)\n")
+    print("✅ identical replies" if report["identical_replies"] else "❌ replies differ between executors")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="LangGraph vs direct executor overhead per turn")
+    parser.add_argument("--turns", type=int, default=2000, help="pass-through invocations per executor")
+    parser.add_argument("--sessions", type=int, default=50, help="Mock Scammer sessions per executor")
+    parser.add_argument("--json", type=Path, help="write the report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+    return 0 if report["identical_replies"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
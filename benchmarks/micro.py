@@ -0,0 +1,276 @@
+"""
+⚡ Microbenchmarks
+Throughput of the per-turn hot paths, with a baseline file and a
+regression gate.
+
+Cases:
+    extract.all / extract.<each extractor>     IntelligenceExtractor
+    forensics.trai_header / forensics.risk_score
+    state.serialize|deserialize.turn{1,10,35}  RedisClient state codec
+    actor.prompt.turn{1,10,35}                 ActorAgent prompt assembly
+
+Inputs are generated from the Mock Scammer templates and follow-ups with a
+fixed seed (English, Hinglish, multi-message bursts), and session states
+are built by running the real Auditor over generated conversations, so the
+numbers track what production turns look like.
+
+Usage:
+    python benchmarks/micro.py --save-baseline       # record this machine's baseline
+    python benchmarks/micro.py                       # compare, exit 1 on regression
+    python benchmarks/micro.py --filter extract --tolerance 0.10
+
+A case regresses when its throughput falls more than --tolerance (default
+15%) below the baseline. Baselines are machine-specific; record one on the
+machine that runs the comparison (benchmarks/micro_baseline.json).
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_FILE = Path(__file__).resolve().parent / "micro_baseline.json"
+
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("ENABLE_DOMAIN_AGE_CHECK", "false")
+
+SEED = 1337
+STATE_TURNS = (1, 10, 35)
+
+SENDER_IDS = ["VM-HDFCBK", "AD-SBIINB", "JD-AMAZON", "9876543210", "+919812345678", "SCAM42", "AB-123456", "scammer"]
+
+
+def build_corpus(size: int = 300) -> List[str]:
+    """
+    Realistic scam messages: templates, follow-ups and coalesced bursts.
+
+    Args:
+        size: Number of messages
+
+    Returns:
+        List of message texts
+    """
+    from faker import Faker
+    from tests.mock_scammer import MockScammer
+    from services.warmup import FALLBACK_SAMPLES
+
+    random.seed(SEED)
+    Faker.seed(SEED)
+
+    corpus = list(FALLBACK_SAMPLES)
+    while len(corpus) < size:
+        roll = random.random()
+        if roll < 0.6:
+            corpus.append(MockScammer.generate_scam_message()["message"])
+        elif roll < 0.85:
+            corpus.extend(turn["message"] for turn in MockScammer.generate_conversation(3)[1:])
+        else:
+            # Several messages sent in a burst and answered as one turn
+            corpus.append(" ".join(MockScammer.generate_scam_message()["message"] for _ in range(3)))
+    return corpus[:size]
+
+
+def build_state(turns: int, corpus: List[str]) -> Dict[str, Any]:
+    """
+    Session state after `turns` turns, built with the real Auditor.
+
+    Args:
+        turns: Number of completed turns
+        corpus: Scammer messages to draw from
+
+    Returns:
+        State dictionary as persisted to Redis
+    """
+    from datetime import timedelta
+
+    from agents.auditor import AuditorAgent
+    from tests.stub_llm import DEFAULT_REPLIES
+
+    rng = random.Random(SEED + turns)
+    auditor = AuditorAgent()
+    started = datetime(2026, 1, 1, 10, 0, 0)
+
+    state: Dict[str, Any] = {
+        "session_id": f"bench-{turns}",
+        "sender_id": "VM-HDFCBK",
+        "start_time": started,
+        "messages": [],
+        "persona_used": "confused_senior",
+        "callback_sent": False,
+        "callback_attempts": 0,
+        "extracted_upi_ids": [], "extracted_bank_accounts": [], "extracted_phone_numbers": [],
+        "extracted_urls": [], "extracted_emails": [], "extracted_keywords": [],
+        "forensic_ledger": [], "risk_flags": ["trai_violation", "suspicious_urls_1"],
+        "scam_probability": 0.85, "trai_valid": False, "domain_age_days": None,
+    }
+    for turn in range(1, turns + 1):
+        message = rng.choice(corpus)
+        at = (started + timedelta(seconds=30 * turn)).isoformat()
+        state["turn_number"] = turn
+        state["current_message"] = message
+        state["messages"].append({"role": "scammer", "content": message, "timestamp": at})
+        state = auditor.extract_intelligence(state)
+        state["actor_response"] = rng.choice(DEFAULT_REPLIES)
+        state["messages"].append({"role": "agent", "content": state["actor_response"], "timestamp": at})
+    state["last_update_time"] = started + timedelta(seconds=30 * turns)
+    return state
+
+
+def build_cases() -> Dict[str, Tuple[Callable[[], Any], int]]:
+    """
+    All benchmark cases.
+
+    Returns:
+        Case name -> (function running one batch, operations per batch)
+    """
+    from agents.actor import ActorAgent
+    from utils.extraction import IntelligenceExtractor as X
+    from utils.forensics import ForensicsAnalyzer as F
+    from utils.redis_client import RedisClient
+
+    corpus = build_corpus()
+    n = len(corpus)
+    cases: Dict[str, Tuple[Callable[[], Any], int]] = {}
+
+    def per_message(fn: Callable[[str], Any]) -> Callable[[], None]:
+        def batch() -> None:
+            for text in corpus:
+                fn(text)
+        return batch
+
+    cases["extract.all"] = (per_message(X.extract_all), n)
+    cases["extract.upi_ids"] = (per_message(X.extract_upi_ids), n)
+    cases["extract.bank_accounts"] = (per_message(X.extract_bank_accounts), n)
+    cases["extract.phone_numbers"] = (per_message(X.extract_phone_numbers), n)
+    cases["extract.urls"] = (per_message(X.extract_urls), n)
+    cases["extract.emails"] = (per_message(X.extract_emails), n)
+    cases["extract.keywords"] = (per_message(X.extract_keywords), n)
+
+    url_lists = [X.extract_urls(text) for text in corpus]
+    cases["extract.suspicious_urls"] = (lambda: [X.identify_suspicious_urls(urls) for urls in url_lists], n)
+
+    senders = SENDER_IDS * 50
+    cases["forensics.trai_header"] = (lambda: [F.validate_trai_header(s) for s in senders], len(senders))
+
+    rng = random.Random(SEED)
+    risk_inputs = [
+        (rng.random() < 0.3, rng.choice([None, 3, 45, 200, 4000]), rng.randint(0, 3), rng.randint(0, 12), rng.random() < 0.5)
+        for _ in range(500)
+    ]
+    cases["forensics.risk_score"] = (lambda: [F.calculate_risk_score(*args) for args in risk_inputs], len(risk_inputs))
+
+    actor = ActorAgent()
+    for turns in STATE_TURNS:
+        state = build_state(turns, corpus)
+        encoded = RedisClient.serialize_state(state)
+        cases[f"state.serialize.turn{turns}"] = (lambda s=state: RedisClient.serialize_state(s), 1)
+        cases[f"state.deserialize.turn{turns}"] = (lambda e=encoded: RedisClient.deserialize_state(e), 1)
+
+        language = actor._detect_language(state["current_message"])
+        emotion = actor._get_emotional_state(turns)
+        cases[f"actor.prompt.turn{turns}"] = (
+            lambda s=state, lang=language, e=emotion, t=turns: actor._build_prompt(s, "confused_senior", lang, t, e),
+            1,
+        )
+
+    return cases
+
+
+def measure(batch: Callable[[], Any], ops: int, min_time: float, repeats: int) -> float:
+    """
+    Best-of-`repeats` throughput, each repeat running for at least `min_time`.
+
+    Returns:
+        Operations per second
+    """
+    batch()  # warm caches and lazy imports
+
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            batch()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time / 10:
+            break
+        loops *= 2
+    loops = max(int(loops * (min_time / max(elapsed, 1e-9))), 1)
+
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(loops):
+            batch()
+        best = min(best, time.perf_counter() - started)
+    return loops * ops / best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmarks with a regression gate")
+    parser.add_argument("--filter", default="", help="only run cases containing this text")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per repeat")
+    parser.add_argument("--repeats", type=int, default=5, help="repeats per case (best is kept)")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed throughput drop vs baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    args = parser.parse_args()
+
+    from utils.logger import logger
+    logger.setLevel("WARNING")
+
+    cases = {name: case for name, case in build_cases().items() if args.filter in name}
+    baseline = json.loads(args.baseline.read_text())["ops_per_s"] if args.baseline.exists() else {}
+
+    results: Dict[str, float] = {}
+    regressions = []
+    print(f"{'case':<32} {'ops/s':>12} {'baseline':>12} {'change':>8}")
+    for name, (batch, ops) in cases.items():
+        results[name] = round(measure(batch, ops, args.min_time, args.repeats), 1)
+        before = baseline.get(name)
+        change = ""
+        if before:
+            ratio = results[name] / before - 1
+            change = f"{ratio:+.1%}"
+            if ratio < -args.tolerance:
+                regressions.append(name)
+                change += " ❌"
+        print(f"{name:<32} {results[name]:>12,.0f} {before or 0:>12,.0f} {change:>8}")
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "ops_per_s": results,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+    if args.save_baseline:
+        merged = {**baseline, **results}
+        args.baseline.write_text(json.dumps({**report, "ops_per_s": merged}, indent=2) + "\n")
+        print(f"\n💾 Baseline saved to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print("\nNo baseline yet; run with --save-baseline to record one.")
+        return 0
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} case(s) regressed more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+
+    print(f"\n✅ No regressions beyond {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,399 @@
+"""
+🔁 Session Replay
+Replays recorded traffic or stored sessions through HoneyPotGraph
+in-process, at full speed, and reports per-node cost.
+
+Sources (combinable):
+    --traffic FILE...     JSONL written by the app with TRAFFIC_RECORD_PATH set
+    --sessions-dir DIR    session states saved as JSON (GET /api/session/{id})
+    --from-redis          every session currently stored in Redis
+
+Each session's scammer messages are replayed turn by turn through
+process_message with Redis replaced by the in-memory store, callbacks
+discarded and the LLM stubbed (--llm stub), served from recordings
+(--llm replay:FILE, see tests/stub_llm.py) or disabled (--llm none, the
+fallback bank). Randomness is seeded, so two runs see the same turns.
+
+The report has end-to-end latency per turn and, per graph node, wall time,
+CPU time and allocations (tracemalloc peak and retained bytes).
+
+Usage:
+    python benchmarks/replay.py run --traffic recordings/traffic.*.jsonl --out new.json
+    python benchmarks/replay.py diff base.json new.json
+
+To compare two code versions, check the base out into a worktree and run
+the same replay against it with --root:
+    git worktree add /tmp/base main
+    python benchmarks/replay.py run --root /tmp/base --traffic ... --out base.json
+"""
+
+import argparse
+import asyncio
+import glob
+import importlib.util
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SEED = 7
+
+# (sender, message text, platform conversationHistory)
+Turn = Tuple[str, str, List[Dict[str, Any]]]
+
+
+# ===================================
+# Loading Sessions
+# ===================================
+
+def load_traffic(paths: List[str]) -> Dict[str, List[Turn]]:
+    """Group recorded requests by session, in arrival order."""
+    entries = []
+    for pattern in paths:
+        for path in sorted(glob.glob(pattern)):
+            with open(path, encoding="utf-8") as f:
+                entries.extend(json.loads(line) for line in f if line.strip())
+    entries.sort(key=lambda entry: entry["received_at"])
+
+    sessions: Dict[str, List[Turn]] = defaultdict(list)
+    for entry in entries:
+        request = entry["request"]
+        sessions[request["sessionId"]].append((
+            request["message"]["sender"],
+            request["message"]["text"],
+            request.get("conversationHistory", []),
+        ))
+    return dict(sessions)
+
+
+def turns_from_state(state: Dict[str, Any]) -> List[Turn]:
+    """Scammer messages of a stored session (ledger previews if messages are missing)."""
+    texts = [m["content"] for m in state.get("messages", []) if m.get("role") == "scammer"]
+    if not texts:
+        texts = [entry["message_preview"] for entry in state.get("forensic_ledger", [])]
+    sender = state.get("sender_id", "scammer")
+    return [(sender, text, []) for text in texts]
+
+
+def load_state_files(directory: str) -> Dict[str, List[Turn]]:
+    """Sessions from JSON state dumps."""
+    sessions = {}
+    for path in sorted(Path(directory).glob("*.json")):
+        state = json.loads(path.read_text(encoding="utf-8"))
+        sessions[state.get("session_id", path.stem)] = turns_from_state(state)
+    return sessions
+
+
+def load_redis_sessions() -> Dict[str, List[Turn]]:
+    """Sessions currently stored in Redis."""
+    import redis
+
+    from config import settings
+    from utils.redis_client import RedisClient
+
+    client = redis.from_url(settings.redis_url, decode_responses=True)
+    sessions = {}
+    for key in client.scan_iter("honeypot:session:*"):
+        serialized = client.get(key)
+        if serialized:
+            state = RedisClient.deserialize_state(serialized)
+            sessions[key.rsplit(":", 1)[-1]] = turns_from_state(state)
+    return sessions
+
+
+# ===================================
+# Replay
+# ===================================
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of a sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def build_graph(node_stats: Dict[str, List[Dict[str, float]]], track_alloc: bool) -> Any:
+    """
+    HoneyPotGraph whose nodes also record CPU time and allocations.
+
+    Replay runs one node at a time, so process-wide CPU time and the
+    tracemalloc peak can be attributed to the running node.
+    """
+    from graph import HoneyPotGraph
+
+    class ReplayGraph(HoneyPotGraph):
+        def _instrument(self, name: str, node: Callable) -> Callable:
+            timed = super()._instrument(name, node)
+
+            def begin() -> Tuple[float, float, int]:
+                current = 0
+                if track_alloc:
+                    current = tracemalloc.get_traced_memory()[0]
+                    tracemalloc.reset_peak()
+                return time.perf_counter(), time.process_time(), current
+
+            def end(started: Tuple[float, float, int]) -> None:
+                wall, cpu, memory = started
+                sample = {
+                    "wall_ms": (time.perf_counter() - wall) * 1000,
+                    "cpu_ms": (time.process_time() - cpu) * 1000,
+                }
+                if track_alloc:
+                    current, peak = tracemalloc.get_traced_memory()
+                    sample["alloc_peak_kb"] = (peak - memory) / 1024
+                    sample["retained_kb"] = (current - memory) / 1024
+                node_stats[name].append(sample)
+
+            if asyncio.iscoroutinefunction(timed):
+                async def measured_async(state):
+                    started = begin()
+                    try:
+                        return await timed(state)
+                    finally:
+                        end(started)
+                return measured_async
+
+            def measured(state):
+                started = begin()
+                try:
+                    return timed(state)
+                finally:
+                    end(started)
+            return measured
+
+    return ReplayGraph()
+
+
+def load_stubs() -> Any:
+    """tests/stub_llm.py of this tree (the replayed tree may predate it)."""
+    path = Path(__file__).resolve().parent.parent / "tests" / "stub_llm.py"
+    spec = importlib.util.spec_from_file_location("replay_stub_llm", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def configure_llm(actor: Any, mode: str) -> None:
+    """Stub, replay or disable the Actor's providers."""
+    stubs = load_stubs()
+    ReplayBook, StubBehavior, install_stubs = stubs.ReplayBook, stubs.StubBehavior, stubs.install_stubs
+
+    if mode == "none":
+        install_stubs(actor)
+    elif mode == "stub":
+        install_stubs(actor, groq=StubBehavior(median_ms=0, latency="fixed", tokens_per_s=float("inf"), seed=SEED))
+    elif mode.startswith("replay:"):
+        book = ReplayBook.load(mode.split(":", 1)[1])
+        install_stubs(actor, groq=StubBehavior(median_ms=0, latency="fixed", tokens_per_s=float("inf"), replay=book, seed=SEED))
+    else:
+        raise SystemExit(f"Unknown --llm mode: {mode}")
+
+
+async def replay(sessions: Dict[str, List[Turn]], args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Replay all sessions and build the report.
+
+    Returns:
+        Report dictionary
+    """
+    from services.callback import callback_service
+    from utils.logger import logger
+    from utils.redis_client import redis_client
+
+    logger.setLevel("WARNING")
+    redis_client.client = None
+    redis_client._memory_store.clear()
+
+    async def discard_callback(payload, session_id):
+        return True, None
+
+    callback_service.send_callback = discard_callback
+
+    node_stats: Dict[str, List[Dict[str, float]]] = defaultdict(list)
+    graph = build_graph(node_stats, not args.no_alloc)
+    configure_llm(graph.actor, args.llm)
+
+    # One untimed turn so lazy imports and caches are warm
+    await graph.process_message("replay-warmup", "scammer", "Your account is blocked, share OTP", None)
+    node_stats.clear()
+
+    random.seed(SEED)
+    if not args.no_alloc:
+        tracemalloc.start()
+
+    latencies = []
+    started = time.perf_counter()
+    for round_index in range(args.repeat):
+        for index, (session_id, turns) in enumerate(sessions.items()):
+            replay_id = f"replay-{round_index}-{index}-{session_id}"
+            for sender, text, history in turns:
+                turn_started = time.perf_counter()
+                await graph.process_message(replay_id, sender, text, history or None)
+                latencies.append((time.perf_counter() - turn_started) * 1000)
+    total_s = time.perf_counter() - started
+
+    if not args.no_alloc:
+        tracemalloc.stop()
+
+    ordered = sorted(latencies)
+    nodes = {}
+    for name, samples in node_stats.items():
+        walls = sorted(sample["wall_ms"] for sample in samples)
+        nodes[name] = {
+            "calls": len(samples),
+            "wall_ms_mean": round(statistics.fmean(walls), 3),
+            "wall_ms_p95": round(percentile(walls, 0.95), 3),
+            "cpu_ms_mean": round(statistics.fmean(sample["cpu_ms"] for sample in samples), 3),
+            "cpu_ms_total": round(sum(sample["cpu_ms"] for sample in samples), 1),
+        }
+        if not args.no_alloc:
+            nodes[name]["alloc_peak_kb_mean"] = round(statistics.fmean(s["alloc_peak_kb"] for s in samples), 2)
+            nodes[name]["retained_kb_total"] = round(sum(s["retained_kb"] for s in samples), 1)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "root": str(args.root),
+            "commit": git_commit(args.root),
+            "python": platform.python_version(),
+            "sessions": len(sessions),
+            "repeat": args.repeat,
+            "llm": args.llm,
+            "alloc_tracking": not args.no_alloc,
+        },
+        "turns": len(latencies),
+        "total_s": round(total_s, 3),
+        "turns_per_s": round(len(latencies) / total_s, 1) if total_s else 0.0,
+        "end_to_end_ms": {
+            "p50": round(percentile(ordered, 0.5), 3),
+            "p95": round(percentile(ordered, 0.95), 3),
+            "p99": round(percentile(ordered, 0.99), 3),
+            "mean": round(statistics.fmean(ordered), 3) if ordered else 0.0,
+            "max": round(ordered[-1], 3) if ordered else 0.0,
+        },
+        "nodes": nodes,
+    }
+
+
+def git_commit(root: Path) -> str:
+    """Short commit hash of the replayed tree, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=root, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# ===================================
+# Output
+# ===================================
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Human-readable summary of one run."""
+    meta = report["meta"]
+    e2e = report["end_to_end_ms"]
+    print(f"\n{report['turns']} turns from {meta['sessions']} sessions in {report['total_s']} s "
+          f"({report['turns_per_s']} turns/s)  commit {meta['commit']}  llm={meta['llm']}")
+    print(f"end-to-end ms  p50 {e2e['p50']}  p95 {e2e['p95']}  p99 {e2e['p99']}  max {e2e['max']}")
+
+    print(f"\n{'node':<10} {'calls':>6} {'wall ms':>9} {'p95 ms':>9} {'cpu ms':>9} {'alloc kB':>10} {'kept kB':>10}")
+    for name, node in report["nodes"].items():
+        print(f"{name:<10} {node['calls']:>6} {node['wall_ms_mean']:>9.3f} {node['wall_ms_p95']:>9.3f} "
+              f"{node['cpu_ms_mean']:>9.3f} {node.get('alloc_peak_kb_mean', 0):>10.1f} "
+              f"{node.get('retained_kb_total', 0):>10.1f}")
+
+
+def print_diff(base: Dict[str, Any], new: Dict[str, Any]) -> None:
+    """Side-by-side comparison of two reports."""
+    def row(label: str, before: Optional[float], after: Optional[float]) -> None:
+        if before is None or after is None:
+            print(f"{label:<32} {before if before is not None else '-':>10} {after if after is not None else '-':>10}")
+            return
+        change = f"{after / before - 1:+.1%}" if before else ""
+        print(f"{label:<32} {before:>10.3f} {after:>10.3f} {change:>9}")
+
+    print(f"base {base['meta']['commit']} ({base['turns']} turns)  ->  new {new['meta']['commit']} ({new['turns']} turns)\n")
+    print(f"{'metric':<32} {'base':>10} {'new':>10} {'change':>9}")
+    row("turns_per_s", base["turns_per_s"], new["turns_per_s"])
+    for key in ("p50", "p95", "p99", "mean"):
+        row(f"end_to_end.{key}_ms", base["end_to_end_ms"][key], new["end_to_end_ms"][key])
+
+    for name in sorted(set(base["nodes"]) | set(new["nodes"])):
+        before, after = base["nodes"].get(name, {}), new["nodes"].get(name, {})
+        for key in ("wall_ms_mean", "cpu_ms_mean", "alloc_peak_kb_mean"):
+            if key in before or key in after:
+                row(f"{name}.{key}", before.get(key), after.get(key))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay sessions through the graph")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="replay sessions and write a report")
+    run.add_argument("--traffic", nargs="*", default=[], help="recorded traffic JSONL files (globs allowed)")
+    run.add_argument("--sessions-dir", help="directory of session state JSON files")
+    run.add_argument("--from-redis", action="store_true", help="replay all sessions stored in Redis")
+    run.add_argument("--llm", default="stub", help="stub | none | replay:FILE")
+    run.add_argument("--limit", type=int, help="replay at most this many sessions")
+    run.add_argument("--repeat", type=int, default=1, help="replay the whole set this many times")
+    run.add_argument("--no-alloc", action="store_true", help="skip tracemalloc (faster, wall times closer to production)")
+    run.add_argument("--whois", action="store_true", help="keep live WHOIS lookups (off for determinism)")
+    run.add_argument("--root", type=Path, default=Path(__file__).resolve().parent.parent,
+                     help="source tree to replay against (e.g. a git worktree of another revision)")
+    run.add_argument("--out", type=Path, help="write the JSON report here")
+
+    diff = commands.add_parser("diff", help="compare two reports")
+    diff.add_argument("base", type=Path)
+    diff.add_argument("new", type=Path)
+
+    args = parser.parse_args()
+
+    if args.command == "diff":
+        print_diff(json.loads(args.base.read_text()), json.loads(args.new.read_text()))
+        return 0
+
+    sessions: Dict[str, List[Turn]] = {}
+    if args.traffic:
+        sessions.update(load_traffic(args.traffic))
+    if args.sessions_dir:
+        sessions.update(load_state_files(args.sessions_dir))
+
+    if args.llm.startswith("replay:"):
+        args.llm = "replay:" + str(Path(args.llm.split(":", 1)[1]).resolve())
+
+    # Import the application from the requested tree
+    args.root = args.root.resolve()
+    sys.path.insert(0, str(args.root))
+    os.chdir(args.root)
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    if not args.whois:
+        os.environ["ENABLE_DOMAIN_AGE_CHECK"] = "false"
+
+    if args.from_redis:
+        sessions.update(load_redis_sessions())
+    if args.limit:
+        sessions = dict(list(sessions.items())[:args.limit])
+    if not sessions:
+        raise SystemExit("No sessions to replay (use --traffic, --sessions-dir or --from-redis)")
+
+    report = asyncio.run(replay(sessions, args))
+    print_report(report)
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+"""
+⏱️ Bootstrap
+Start of the time-to-ready clock.
+
+Imported by main.py before anything else, so the timestamp is taken
+before the heavy framework and agent imports.
+"""
+
+import time
+
+# perf_counter() when the application started importing
+IMPORT_STARTED = time.perf_counter()
@@ -4,7 +4,7 @@ Loads and validates all environment variables using Pydantic Settings.
 """
 
 from enum import Enum
-from typing import Literal
+from typing import Dict, Literal, Optional
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -52,6 +52,28 @@ class Settings(BaseSettings):
         """Get the server port, preferring PORT env var (for Render) over api_port."""
         return self.port if self.port != 8000 else self.api_port
 
+    # ===================================
+    # Startup
+    # ===================================
+    startup_ready_target_ms: int = Field(
+        default=8000,
+        ge=0,
+        description="Target time from importing main to ready; slower starts are logged (0 disables)"
+    )
+    warmup_enabled: bool = Field(
+        default=True,
+        description="Prime regexes, phone metadata and the suffix list before reporting ready"
+    )
+    warmup_llm_connections: bool = Field(
+        default=True,
+        description="Open the primary LLM provider connection during warm-up"
+    )
+    warmup_timeout_s: float = Field(
+        default=30.0,
+        gt=0,
+        description="Upper bound on the whole warm-up stage"
+    )
+
     # ===================================
     # Redis Configuration
     # ===================================
@@ -61,6 +83,94 @@ class Settings(BaseSettings):
     redis_db: int = Field(default=0, ge=0, description="Redis database number")
     redis_password: str = Field(default="", description="Redis password (optional)")
     redis_ttl: int = Field(default=86400, ge=60, description="Session TTL in seconds")
+    graph_checkpointer: bool = Field(
+        default=False,
+        description="Persist session state through the LangGraph Redis checkpointer instead of whole-state saves (langgraph executor)"
+    )
+    checkpoint_history: int = Field(
+        default=20,
+        ge=0,
+        description="Older checkpoints kept per session before compaction"
+    )
+
+    # ===================================
+    # Session Concurrency
+    # ===================================
+    session_lease_ttl_ms: int = Field(
+        default=30000,
+        ge=1000,
+        description="Cross-worker session lease TTL in milliseconds (renewed while held)"
+    )
+    session_lease_wait_timeout: float = Field(
+        default=60.0,
+        ge=1.0,
+        description="Maximum seconds a turn waits for its session lease"
+    )
+    coalesce_window_ms: int = Field(
+        default=0,
+        ge=0,
+        le=10000,
+        description="Merge a session's messages arriving within this window into one turn (0 disables)"
+    )
+    replay_cache_ttl: int = Field(
+        default=300,
+        ge=0,
+        description="Seconds to keep replies for retried requests of the same message (0 disables)"
+    )
+
+    # ===================================
+    # Admission Control (per worker)
+    # ===================================
+    admission_max_concurrency: int = Field(
+        default=32,
+        ge=0,
+        description="Concurrent graph runs per worker (0 disables admission control)"
+    )
+    admission_max_queue: int = Field(
+        default=64,
+        ge=0,
+        description="Requests allowed to wait for a slot before shedding"
+    )
+    admission_queue_timeout_ms: int = Field(
+        default=2000,
+        ge=1,
+        description="Queue-time SLO: waiting longer than this sheds the request"
+    )
+
+    # ===================================
+    # Adaptive Degradation
+    # ===================================
+    degradation_enabled: bool = Field(
+        default=True,
+        description="Shed expensive work automatically when node latency breaks its SLO"
+    )
+    degradation_slo_ms: Dict[str, int] = Field(
+        default={"detect": 1500, "engage": 4000, "extract": 500},
+        description="Per-node p95 latency SLO in milliseconds"
+    )
+    degradation_window_s: int = Field(
+        default=60,
+        ge=5,
+        description="Rolling window for per-node latency percentiles"
+    )
+    degradation_cooldown_s: int = Field(
+        default=15,
+        ge=1,
+        description="Minimum seconds between degradation level changes"
+    )
+
+    # ===================================
+    # Session Hydration
+    # ===================================
+    history_hydration: bool = Field(
+        default=True,
+        description="Rebuild missing or stale session state from conversationHistory"
+    )
+    history_trust_max_messages: int = Field(
+        default=0,
+        ge=0,
+        description="Build state from conversationHistory alone, skipping the Redis read, up to this many messages (0 disables)"
+    )
 
     # ===================================
     # LLM Provider API Keys
@@ -89,6 +199,10 @@ class Settings(BaseSettings):
         default="llama-3.1-8b-instant",
         description="Groq model (FREE and super fast!)"
     )
+    lazy_llm_fallbacks: bool = Field(
+        default=True,
+        description="Import and create the OpenAI/Gemini fallback clients on first fallback instead of at startup"
+    )
 
     # ===================================
     # GUVI Hackathon Callback
@@ -118,6 +232,23 @@ class Settings(BaseSettings):
         default=PersonaType.CONFUSED_SENIOR,
         description="Default persona for Actor agent"
     )
+    graph_executor: Literal["langgraph", "direct"] = Field(
+        default="langgraph",
+        description="Workflow executor: compiled LangGraph, or the built-in direct-dispatch loop"
+    )
+    speculative_actor: bool = Field(
+        default=False,
+        description="Start the Actor's reply while the Profiler runs; discarded if the message is not engaged"
+    )
+    actor_streaming: bool = Field(
+        default=True,
+        description="Stream Actor completions and stop reading at the sentence limit"
+    )
+    actor_max_sentences: int = Field(
+        default=2,
+        ge=0,
+        description="Sentences kept from a streamed Actor reply (0 = no limit)"
+    )
 
     # ===================================
     # Forensics & Security
@@ -150,6 +281,140 @@ class Settings(BaseSettings):
         default=True,
         description="🛡️ Enable visual excellence in logs"
     )
+    log_async: bool = Field(
+        default=True,
+        description="Write logs from a background thread via QueueHandler/QueueListener"
+    )
+    log_sample_rates: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Fraction of security events kept per event type, e.g. {\"ACTOR\": 0.1}"
+    )
+    log_rate_limits: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Max security events per second per event type, e.g. {\"SYSTEM\": 50}"
+    )
+
+    # ===================================
+    # Tracing (OpenTelemetry, optional)
+    # ===================================
+    tracing_enabled: bool = Field(
+        default=False,
+        description="Emit OpenTelemetry spans (needs opentelemetry-sdk)"
+    )
+    tracing_sample_ratio: float = Field(
+        default=0.1,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of requests traced"
+    )
+    tracing_exporter: Literal["file", "otlp"] = Field(
+        default="file",
+        description="Span exporter: JSON lines file or OTLP/HTTP collector"
+    )
+    tracing_file_path: str = Field(
+        default="traces/spans.jsonl",
+        description="Span file for the 'file' exporter"
+    )
+    tracing_otlp_endpoint: str = Field(
+        default="http://localhost:4318/v1/traces",
+        description="Collector endpoint for the 'otlp' exporter"
+    )
+
+    # ===================================
+    # Slow-Request Flight Recorder
+    # ===================================
+    flight_recorder_size: int = Field(
+        default=50,
+        ge=0,
+        description="Slowest recent requests kept per worker for /admin/slow-requests (0 disables)"
+    )
+    flight_recorder_window_s: int = Field(
+        default=3600,
+        ge=1,
+        description="How long a slow request stays in the recorder"
+    )
+
+    # ===================================
+    # On-Demand Profiling (/admin/profile/*)
+    # ===================================
+    profiling_enabled: bool = Field(
+        default=False,
+        description="Allow CPU and memory profiling through the admin endpoints"
+    )
+    profiling_max_requests: int = Field(
+        default=200,
+        ge=1,
+        description="Upper bound on requests covered by one CPU profile"
+    )
+    profiling_tracemalloc_frames: int = Field(
+        default=10,
+        ge=1,
+        description="Stack depth recorded per allocation once tracemalloc is started"
+    )
+
+    # ===================================
+    # Traffic Recording (benchmarks/replay.py)
+    # ===================================
+    traffic_record_path: Optional[str] = Field(
+        default=None,
+        description="Append every /api/honeypot request to this JSONL file (per-worker suffix); unset disables"
+    )
+
+    # ===================================
+    # Event-Loop Monitor (/admin/event-loop)
+    # ===================================
+    loop_monitor_enabled: bool = Field(
+        default=True,
+        description="Continuously measure event-loop lag"
+    )
+    loop_monitor_interval_ms: int = Field(
+        default=100,
+        ge=10,
+        description="Lag sampling interval"
+    )
+    loop_monitor_window_s: int = Field(
+        default=60,
+        ge=1,
+        description="Window the lag percentiles are computed over"
+    )
+    loop_block_threshold_ms: int = Field(
+        default=100,
+        ge=0,
+        description="In DEBUG mode, capture the loop thread's stack when it is blocked this long (0 disables)"
+    )
+
+    # ===================================
+    # Health Probes (/livez, /readyz)
+    # ===================================
+    health_check_interval_s: float = Field(
+        default=5.0,
+        gt=0,
+        description="How often the background monitor refreshes dependency health"
+    )
+    health_max_loop_lag_ms: float = Field(
+        default=500.0,
+        gt=0,
+        description="Event-loop lag (p95 over the loop monitor window) above which the worker reports not ready"
+    )
+    health_require_redis: bool = Field(
+        default=False,
+        description="Report not ready while Redis is unreachable (instead of serving from memory)"
+    )
+    health_outbox_warn: int = Field(
+        default=100,
+        ge=1,
+        description="Failed-callback backlog reported as unhealthy"
+    )
+    circuit_failure_threshold: int = Field(
+        default=3,
+        ge=1,
+        description="Consecutive LLM provider failures before its circuit is reported open"
+    )
+    circuit_cooldown_s: float = Field(
+        default=30.0,
+        gt=0,
+        description="Seconds an open circuit waits before it is reported half-open"
+    )
 
     # ===================================
     # Environment
@@ -5,26 +5,104 @@ Orchestrates the multi-turn honey-pot workflow.
 State flow: START -> DETECT -> ENGAGE -> EXTRACT -> CALLBACK
 """
 
-from typing import Dict, Any, Literal
-from datetime import datetime
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Any, List, Literal, Optional, Set, Tuple, Union
+from datetime import datetime, timezone
 
-from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
-
-from models.state import HoneyPotState
+from models.state import HoneyPotState, REDUCERS, Replace, TRANSIENT_FIELDS, apply_update, with_update
 from models.schemas import CallbackPayload, ExtractedIntelligence
 from agents.profiler import ProfilerAgent
 from agents.actor import ActorAgent
-from agents.auditor import AuditorAgent
+from agents.auditor import AuditorAgent, INDICATOR_FIELDS
+from services.admission import admission_controller
 from services.callback import callback_service
+from services.degradation import degradation
 from utils.logger import logger, log_security_event
+from utils.metrics import NODE_LATENCY
+from utils.tracing import span
+from utils.flight_recorder import note, note_node
+from utils.profiling import request_profiler
+from utils.resources import resources
 from utils.redis_client import redis_client
+from utils.session_lock import session_locks
 from config import settings
 
 
+# Per-request fields that must win over the persisted copy when merging
+REQUEST_FIELDS = (
+    "session_id",
+    "sender_id",
+    "current_message",
+    "pending_messages",
+    "conversation_history",
+    "fencing_token",
+)
+
+
+def _from_epoch_ms(timestamp: int) -> datetime:
+    """Platform epoch-milliseconds timestamp as naive UTC (like datetime.utcnow())."""
+    return datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc).replace(tzinfo=None)
+
+
+# Terminal node name (the same sentinel LangGraph uses)
+END = "__end__"
+
+
+class DirectExecutor:
+    """
+    Minimal executor for the fixed honey-pot workflow.
+    
+    Runs the same node functions with the same routing as the compiled
+    LangGraph, without channel bookkeeping or task scheduling: each node's
+    update is merged into one state dict with the same reducers. Sync nodes
+    run in worker threads and routers see a copy of the state, as under
+    LangGraph.
+    """
+    
+    def __init__(self, entry: str, nodes: Dict[str, Callable], edges: Dict[str, Any]):
+        """
+        Args:
+            entry: First node
+            nodes: Node name -> node function
+            edges: Node name -> next node, or (router, {route: next node})
+        """
+        self.entry = entry
+        self.nodes = nodes
+        self.edges = edges
+        self._async = {name: asyncio.iscoroutinefunction(node) for name, node in nodes.items()}
+    
+    async def ainvoke(self, state: HoneyPotState) -> HoneyPotState:
+        """
+        Run the workflow from the entry node to END.
+        
+        Args:
+            state: Initial state
+            
+        Returns:
+            Final state
+        """
+        state = dict(state)
+        current = self.entry
+        while current != END:
+            node = self.nodes[current]
+            update = await node(state) if self._async[current] else await asyncio.to_thread(node, state)
+            if update:
+                apply_update(state, update)
+            
+            edge = self.edges[current]
+            if isinstance(edge, tuple):
+                router, routes = edge
+                current = routes[router(dict(state))]
+            else:
+                current = edge
+        return state
+
+
 class HoneyPotGraph:
     """
-    LangGraph-based state machine for the honey-pot workflow.
+    State machine for the honey-pot workflow (LangGraph or DirectExecutor).
     """
     
     def __init__(self):
@@ -32,73 +110,164 @@ class HoneyPotGraph:
         self.profiler = ProfilerAgent()
         self.actor = ActorAgent()
         self.auditor = AuditorAgent()
+        self.checkpointer = None
+        # session_id -> (speculative Actor task, its cancel flag), handed
+        # from DETECT to ENGAGE (turns of a session never overlap)
+        self._speculations: Dict[str, Tuple[asyncio.Task, threading.Event]] = {}
+        self._abandoned: Set[asyncio.Task] = set()
         
         # Build the graph
         self.graph = self._build_graph()
     
-    def _build_graph(self) -> StateGraph:
+    def _workflow(self) -> Tuple[str, Dict[str, Callable], Dict[str, Any]]:
+        """
+        The state machine, shared by both executors.
+        
+        Returns:
+            (entry node, instrumented nodes, edges) where an edge is either
+            the next node name or a (router, {route: node}) pair
         """
-        Build the LangGraph state machine.
+        speculative = settings.speculative_actor
+        nodes = {
+            "start": self._instrument("start", self._start_node),
+            "detect": self._instrument("detect", self._speculative_detect_node if speculative else self._detect_node),
+            "engage": self._instrument("engage", self._speculative_engage_node if speculative else self._engage_node),
+            "extract": self._instrument("extract", self._extract_node),
+            "callback": self._instrument("callback", self._callback_node),
+        }
+        edges = {
+            "start": "detect",
+            # Conditional routing after detection
+            "detect": (self._should_engage, {"engage": "engage", "end": END}),
+            "engage": "extract",
+            # Conditional routing after extraction
+            "extract": (self._should_callback, {"callback": "callback", "end": END}),
+            "callback": END,
+        }
+        return "start", nodes, edges
+    
+    def _build_graph(self) -> Any:
+        """
+        Build the state machine with the configured executor.
+        
+        LangGraph is imported here rather than at module import, so importing
+        the app stays fast and the cost lands in the lifespan warm-up.
         
         Returns:
-            Compiled state graph
+            Compiled state graph, or a DirectExecutor
         """
+        entry, nodes, edges = self._workflow()
+        
+        if settings.graph_executor == "direct":
+            return DirectExecutor(entry, nodes, edges)
+        
+        from langgraph.graph import StateGraph, END as LANGGRAPH_END
+        
+        if settings.graph_checkpointer:
+            self.checkpointer = self._build_checkpointer()
+        
         # Create the graph
         workflow = StateGraph(HoneyPotState)
         
         # Add nodes
-        workflow.add_node("start", self._start_node)
-        workflow.add_node("detect", self._detect_node)
-        workflow.add_node("engage", self._engage_node)
-        workflow.add_node("extract", self._extract_node)
-        workflow.add_node("callback", self._callback_node)
+        for name, node in nodes.items():
+            workflow.add_node(name, node)
         
         # Set entry point
-        workflow.set_entry_point("start")
+        workflow.set_entry_point(entry)
         
         # Add edges
-        workflow.add_edge("start", "detect")
+        for source, edge in edges.items():
+            if isinstance(edge, tuple):
+                router, routes = edge
+                workflow.add_conditional_edges(
+                    source,
+                    router,
+                    {route: LANGGRAPH_END if target == END else target for route, target in routes.items()},
+                )
+            else:
+                workflow.add_edge(source, LANGGRAPH_END if edge == END else edge)
         
-        # Conditional routing after detection
-        workflow.add_conditional_edges(
-            "detect",
-            self._should_engage,
-            {
-                "engage": "engage",
-                "end": END,
-            }
-        )
+        # Compile graph
+        return workflow.compile(checkpointer=self.checkpointer)
+    
+    def _build_checkpointer(self) -> Any:
+        """
+        Checkpoint saver for GRAPH_CHECKPOINTER, keyed by session_id.
         
-        workflow.add_edge("engage", "extract")
+        Returns:
+            RedisCheckpointSaver, or an in-process MemorySaver when Redis is
+            unavailable (development only, like the in-memory session store)
+        """
+        if redis_client.client is not None:
+            from utils.checkpointer import RedisCheckpointSaver
+            return RedisCheckpointSaver(redis_client.client)
         
-        # Conditional routing after extraction
-        workflow.add_conditional_edges(
-            "extract",
-            self._should_callback,
-            {
-                "callback": "callback",
-                "end": END,
-            }
-        )
+        from langgraph.checkpoint.memory import MemorySaver
+        logger.warning("⚠️ Redis unavailable, graph checkpoints kept in memory (not persistent)")
+        return MemorySaver()
+    
+    def _instrument(self, name: str, node: Callable) -> Callable:
+        """
+        Wrap a node so every execution is timed and traced.
         
-        workflow.add_edge("callback", END)
+        Args:
+            name: Node name
+            node: Sync or async node function
+            
+        Returns:
+            Wrapped node of the same kind
+        """
+        if asyncio.iscoroutinefunction(node):
+            async def timed_async(state: HoneyPotState) -> HoneyPotState:
+                started = time.perf_counter()
+                try:
+                    with span(f"node.{name}", session_id=state.get("session_id")):
+                        return await node(state)
+                finally:
+                    self._observe_node(name, started)
+            return timed_async
+        
+        def timed(state: HoneyPotState) -> HoneyPotState:
+            started = time.perf_counter()
+            try:
+                with span(f"node.{name}", session_id=state.get("session_id")), request_profiler.thread_profile():
+                    return node(state)
+            finally:
+                self._observe_node(name, started)
+        return timed
+    
+    def _observe_node(self, name: str, started: float) -> None:
+        """
+        Record a finished node execution.
         
-        # Compile graph
-        return workflow.compile()
+        Args:
+            name: Node name
+            started: perf_counter() value at node start
+        """
+        elapsed = time.perf_counter() - started
+        NODE_LATENCY.labels(name).observe(elapsed)
+        note_node(name, elapsed * 1000)
+        degradation.record(name, elapsed * 1000)
     
     # ===================================
     # State Machine Nodes
     # ===================================
     
-    def _start_node(self, state: HoneyPotState) -> HoneyPotState:
+    def _start_node(self, state: HoneyPotState) -> Dict[str, Any]:
         """
         START node: Initialize or load session state.
         
+        State comes from the checkpoint the graph resumed from (when
+        GRAPH_CHECKPOINTER is on) or from Redis, or is rebuilt from
+        conversationHistory when Redis has lost it (eviction) or the
+        conversation is short enough to skip the read.
+        
         Args:
             state: Current state
             
         Returns:
-            Updated state
+            Session fields plus this turn's scammer message(s)
         """
         session_id = state["session_id"]
         
@@ -109,64 +278,219 @@ class HoneyPotGraph:
             session_id=session_id,
         )
         
-        # Try to load existing state from Redis
-        existing_state = redis_client.load_state(session_id)
+        history = state.get("conversation_history") or []
         
-        if existing_state:
-            # Merge with incoming state
-            state.update(existing_state)
+        # Short conversations can be rebuilt from the request alone
+        trust_history = (
+            settings.history_hydration
+            and 0 < len(history) <= settings.history_trust_max_messages
+        )
+        
+        # Checkpointed sessions arrive with their stored channels already loaded
+        restored = self.checkpointer is not None and "turn_number" in state
+        
+        # Try to load existing state from Redis
+        if trust_history:
+            existing_state = None
+        elif restored:
+            existing_state = state
+        else:
+            existing_state = redis_client.load_state(session_id)
+        
+        # History messages the stored state has not seen yet
+        missing: List[Dict[str, Any]] = []
+        if existing_state and settings.history_hydration and history:
+            missing = self._missing_history(existing_state.get("messages", []), history)
+            if any(m["sender"] == "scammer" for m in missing):
+                log_security_event(
+                    logger,
+                    "SYSTEM",
+                    "Stored state is behind conversationHistory, catching up",
+                    session_id=session_id,
+                    missing=len(missing),
+                    history=len(history),
+                )
+            else:
+                missing = []
+        
+        if existing_state is state:
+            # Resumed from the checkpoint: only this turn's changes are written
+            session = {"turn_number": state["turn_number"]}
+            if missing:
+                self._hydrate_from_history(session, missing)
             log_security_event(
                 logger,
                 "SYSTEM",
-                f"Continuing session (turn {state.get('turn_number', 0) + 1})",
+                f"Continuing session (turn {session['turn_number'] + 1})",
                 session_id=session_id,
             )
-        else:
-            # New session
-            state["start_time"] = datetime.utcnow()
-            state["turn_number"] = 0
-            state["messages"] = []
-            state["persona_used"] = settings.default_persona.value
-            state["callback_sent"] = False
-            state["callback_attempts"] = 0
-            
-            # Initialize agent completion flags
-            state["profiler_complete"] = False
-            state["actor_complete"] = False
-            state["auditor_complete"] = False
-            
-            # Initialize extraction arrays
-            state["extracted_upi_ids"] = []
-            state["extracted_bank_accounts"] = []
-            state["extracted_phone_numbers"] = []
-            state["extracted_urls"] = []
-            state["extracted_emails"] = []
-            state["extracted_keywords"] = []
-            state["forensic_ledger"] = []
-            state["risk_flags"] = []
-            
+        elif existing_state:
+            # Stored session, keeping this request's own fields
+            session = {k: v for k, v in existing_state.items() if not (k in REQUEST_FIELDS and k in state)}
+            if missing:
+                self._hydrate_from_history(session, missing)
             log_security_event(
                 logger,
                 "SYSTEM",
-                "New session initialized",
+                f"Continuing session (turn {session.get('turn_number', 0) + 1})",
                 session_id=session_id,
             )
+        else:
+            session = {}
+            self._init_session(session)
+            
+            if settings.history_hydration and history:
+                session["start_time"] = _from_epoch_ms(history[0]["timestamp"])
+                self._hydrate_from_history(session, history)
+                log_security_event(
+                    logger,
+                    "SYSTEM",
+                    f"Session rebuilt from conversationHistory (turn {session['turn_number'] + 1})",
+                    session_id=session_id,
+                    messages=len(history),
+                    redis_skipped=trust_history,
+                )
+            else:
+                log_security_event(
+                    logger,
+                    "SYSTEM",
+                    "New session initialized",
+                    session_id=session_id,
+                )
         
         # Increment turn counter
-        state["turn_number"] = state.get("turn_number", 0) + 1
-        state["last_update_time"] = datetime.utcnow()
-        state["current_phase"] = "START"
-        
-        # Add scammer message to history
-        state["messages"].append({
-            "role": "scammer",
-            "content": state["current_message"],
-            "timestamp": datetime.utcnow().isoformat(),
-        })
+        session["turn_number"] = session.get("turn_number", 0) + 1
+        session["last_update_time"] = datetime.utcnow()
+        session["current_phase"] = "START"
+        
+        # Add scammer message(s) to history - one entry per coalesced message.
+        # Without a checkpoint the graph starts with empty channels, so the
+        # stored history goes through the append reducer too.
+        session["messages"] = session.get("messages", []) + [
+            {
+                "role": "scammer",
+                "content": text,
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+            for text in state.get("pending_messages") or [state["current_message"]]
+        ]
         
-        return state
+        if restored and existing_state is not state:
+            # A loaded or rebuilt session replaces the checkpointed lists
+            # instead of merging into them
+            for field in REDUCERS.keys() & session.keys():
+                session[field] = Replace(session[field])
+        
+        # The platform history is only needed by this node
+        session["conversation_history"] = []
+        
+        return session
+    
+    def _init_session(self, state: Dict[str, Any]) -> None:
+        """
+        Initialize a fresh session in place.
+        
+        Args:
+            state: Session fields being built by the START node
+        """
+        state["start_time"] = datetime.utcnow()
+        state["turn_number"] = 0
+        state["messages"] = []
+        state["persona_used"] = settings.default_persona.value
+        state["callback_sent"] = False
+        state["callback_attempts"] = 0
+        
+        # Initialize agent completion flags
+        state["profiler_complete"] = False
+        state["actor_complete"] = False
+        state["auditor_complete"] = False
+        
+        # Initialize extraction arrays
+        for field in INDICATOR_FIELDS:
+            state[field] = []
+        state["forensic_ledger"] = []
+        state["risk_flags"] = []
     
-    def _detect_node(self, state: HoneyPotState) -> HoneyPotState:
+    @staticmethod
+    def _missing_history(messages: List[Dict[str, Any]], history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        History messages that come after the stored conversation.
+        
+        Aligned on the number of stored scammer messages; our replies that
+        follow the last stored scammer message are already stored too.
+        
+        Args:
+            messages: Stored messages ({"role", "content", "timestamp"})
+            history: Platform messages ({"sender", "text", "timestamp"})
+            
+        Returns:
+            Tail of the history not in the stored state
+        """
+        stored_scammer = sum(1 for m in messages if m["role"] == "scammer")
+        stored_replies = 0
+        for m in reversed(messages):
+            if m["role"] == "scammer":
+                break
+            stored_replies += 1
+        
+        start = 0
+        seen = 0
+        for index, m in enumerate(history):
+            if seen == stored_scammer:
+                break
+            if m["sender"] == "scammer":
+                seen += 1
+            start = index + 1
+        
+        while stored_replies and start < len(history) and history[start]["sender"] != "scammer":
+            start += 1
+            stored_replies -= 1
+        
+        return history[start:]
+    
+    def _hydrate_from_history(self, session: Dict[str, Any], history: List[Dict[str, Any]]) -> None:
+        """
+        Add platform conversationHistory messages to a session in place.
+        
+        Rebuilds a session Redis has lost (on a freshly initialized session),
+        or catches up a stored one that is behind the platform. All scammer
+        messages go through a single batched extraction pass, recorded as
+        one forensic ledger entry; list fields are merged with their reducers.
+        
+        Args:
+            session: Session fields being built by the START node
+            history: Messages to add ({"sender", "text", "timestamp"})
+        """
+        scammer_texts = [m["text"] for m in history if m["sender"] == "scammer"]
+        
+        update: Dict[str, Any] = {
+            "turn_number": session.get("turn_number", 0) + len(scammer_texts),
+            "messages": [
+                {
+                    "role": "scammer" if m["sender"] == "scammer" else "agent",
+                    "content": m["text"],
+                    "timestamp": _from_epoch_ms(m["timestamp"]).isoformat(),
+                }
+                for m in history
+            ],
+        }
+        
+        if scammer_texts:
+            extracted = self.auditor.extractor.extract_all("\n\n".join(scammer_texts))
+            
+            for field, key in INDICATOR_FIELDS.items():
+                update[field] = extracted[key]
+            update["forensic_ledger"] = [{
+                "timestamp": datetime.utcnow().isoformat(),
+                "turn_number": update["turn_number"],
+                "message_preview": f"[hydrated from {len(history)} history messages]",
+                "extracted": extracted,
+                "hydrated": True,
+            }]
+        
+        apply_update(session, update)
+    
+    def _detect_node(self, state: HoneyPotState) -> Dict[str, Any]:
         """
         DETECT node: Run Profiler agent.
         
@@ -174,13 +498,66 @@ class HoneyPotGraph:
             state: Current state
             
         Returns:
-            Updated state
+            Profiler fields
         """
-        state["current_phase"] = "DETECT"
-        state = self.profiler.analyze(state)
-        return state
+        return {"current_phase": "DETECT", **self.profiler.assess(state)}
+    
+    async def _speculative_detect_node(self, state: HoneyPotState) -> Dict[str, Any]:
+        """
+        DETECT node with SPECULATIVE_ACTOR: run the Profiler while the Actor
+        already generates the reply.
+        
+        The Actor does not read Profiler output, so its reply is the same one
+        ENGAGE would produce. When the message is not engaged the generation
+        is cancelled: no further provider attempts are made and a reply
+        already in flight is discarded.
+        
+        Args:
+            state: Current state
+            
+        Returns:
+            Profiler fields
+        """
+        cancel = threading.Event()
+        speculation = asyncio.create_task(asyncio.to_thread(self.actor.respond, dict(state), cancel))
+        engaged = False
+        try:
+            update = await asyncio.to_thread(self._detect_node, state)
+            engaged = self._engages({**state, **update})
+        finally:
+            if engaged:
+                self._speculations[state["session_id"]] = (speculation, cancel)
+            else:
+                cancel.set()
+                self._abandon(speculation)
+        return update
     
-    def _engage_node(self, state: HoneyPotState) -> HoneyPotState:
+    def _abandon(self, task: asyncio.Task) -> None:
+        """
+        Let a cancelled speculation finish in its worker thread, unobserved.
+        
+        Args:
+            task: Speculative Actor task
+        """
+        self._abandoned.add(task)
+        # Pruned as soon as the worker thread is done
+        task.add_done_callback(self._abandoned.discard)
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    
+    def _drop_speculation(self, session_id: str) -> None:
+        """
+        Cancel a speculation its turn did not use (the turn failed or was
+        cancelled before ENGAGE collected the reply).
+        
+        Args:
+            session_id: Session identifier
+        """
+        pending = self._speculations.pop(session_id, None)
+        if pending is not None and not pending[0].done():
+            pending[1].set()
+            self._abandon(pending[0])
+    
+    def _engage_node(self, state: HoneyPotState) -> Dict[str, Any]:
         """
         ENGAGE node: Run Actor agent.
         
@@ -188,21 +565,48 @@ class HoneyPotGraph:
             state: Current state
             
         Returns:
-            Updated state
+            Actor fields plus the reply for the history
         """
-        state["current_phase"] = "ENGAGE"
-        state = self.actor.generate_response(state)
+        return self._reply_update(self.actor.respond(state))
+    
+    async def _speculative_engage_node(self, state: HoneyPotState) -> Dict[str, Any]:
+        """
+        ENGAGE node with SPECULATIVE_ACTOR: wait for the reply started in DETECT.
+        
+        Args:
+            state: Current state
+            
+        Returns:
+            Actor fields plus the reply for the history
+        """
+        # Left registered so process_message can cancel it if this turn fails
+        pending = self._speculations.get(state["session_id"])
+        if pending is None:
+            return await asyncio.to_thread(self._engage_node, state)
+        return self._reply_update(await asyncio.shield(pending[0]))
+    
+    def _reply_update(self, actor_update: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        ENGAGE node update for an Actor result.
+        
+        Args:
+            actor_update: Fields returned by ActorAgent.respond
+            
+        Returns:
+            Actor fields plus the reply for the history
+        """
+        update = {"current_phase": "ENGAGE", **actor_update}
         
         # Add actor response to history
-        state["messages"].append({
+        update["messages"] = [{
             "role": "agent",
-            "content": state["actor_response"],
+            "content": update["actor_response"],
             "timestamp": datetime.utcnow().isoformat(),
-        })
+        }]
         
-        return state
+        return update
     
-    def _extract_node(self, state: HoneyPotState) -> HoneyPotState:
+    def _extract_node(self, state: HoneyPotState) -> Dict[str, Any]:
         """
         EXTRACT node: Run Auditor agent.
         
@@ -210,10 +614,9 @@ class HoneyPotGraph:
             state: Current state
             
         Returns:
-            Updated state
+            New intelligence and engagement duration
         """
-        state["current_phase"] = "EXTRACT"
-        state = self.auditor.extract_intelligence(state)
+        update = {"current_phase": "EXTRACT", **self.auditor.audit(state)}
         
         # Calculate engagement duration
         start_time = state.get("start_time")
@@ -222,17 +625,18 @@ class HoneyPotGraph:
             if isinstance(start_time, str):
                 from dateutil import parser
                 start_time = parser.isoparse(start_time)
-                state["start_time"] = start_time
+                update["start_time"] = start_time
             
             duration = (datetime.utcnow() - start_time).total_seconds()
-            state["engagement_duration"] = duration
+            update["engagement_duration"] = duration
         
-        # Save state to Redis after each turn
-        redis_client.save_state(state["session_id"], state)
+        # Save state to Redis after each turn (the checkpointer saves every step)
+        if self.checkpointer is None:
+            redis_client.save_state(state["session_id"], with_update(state, update))
         
-        return state
+        return update
     
-    async def _callback_node(self, state: HoneyPotState) -> HoneyPotState:
+    async def _callback_node(self, state: HoneyPotState) -> Dict[str, Any]:
         """
         CALLBACK node: Send final intelligence to GUVI.
         
@@ -240,11 +644,10 @@ class HoneyPotGraph:
             state: Current state
             
         Returns:
-            Updated state
+            Callback status fields
         """
         from models.schemas import ExtractedIntelligenceCallback
         
-        state["current_phase"] = "CALLBACK"
         session_id = state["session_id"]
         
         log_security_event(
@@ -275,17 +678,21 @@ class HoneyPotGraph:
         )
         
         # Send callback
-        state["callback_attempts"] = state.get("callback_attempts", 0) + 1
         success, error = await callback_service.send_callback(payload, session_id)
         
-        state["callback_sent"] = True
-        state["callback_success"] = success
-        state["callback_error"] = error
+        update = {
+            "current_phase": "CALLBACK",
+            "callback_attempts": state.get("callback_attempts", 0) + 1,
+            "callback_sent": True,
+            "callback_success": success,
+            "callback_error": error,
+        }
         
         # Save final state
-        redis_client.save_state(session_id, state)
+        if self.checkpointer is None:
+            redis_client.save_state(session_id, with_update(state, update))
         
-        return state
+        return update
     
     # ===================================
     # Conditional Edge Functions
@@ -301,27 +708,39 @@ class HoneyPotGraph:
         Returns:
             Next node to execute
         """
-        # ALWAYS engage for testing - we want to see the persona responses!
-        # In production, you can add back the threshold check
-        should_engage = state.get("should_continue", False)
-        scam_probability = state.get("scam_probability", 0.0)
+        engaged = self._engages(state)
         
         log_security_event(
             logger,
             "SYSTEM",
-            f"Scam probability: {scam_probability:.2f} | Threshold: {settings.scam_threshold} | Engaging: {should_engage or scam_probability >= 0.3}",
+            f"Scam probability: {state.get('scam_probability', 0.0):.2f} | Threshold: {settings.scam_threshold} | Engaging: {engaged}",
             session_id=state.get("session_id"),
         )
         
-        # Lower threshold for testing (0.3 instead of 0.7)
-        # This ensures we engage with most messages to test the persona
-        if should_engage or scam_probability >= 0.3:
+        if engaged:
             return "engage"
         else:
             # Even for low-probability messages, give a curious response
             state["actor_response"] = "I don't understand... What is this about?"
             return "end"
     
+    @staticmethod
+    def _engages(state: Dict[str, Any]) -> bool:
+        """
+        Engagement decision for a profiled message.
+        
+        Args:
+            state: State with Profiler fields
+            
+        Returns:
+            True if the Actor should reply
+        """
+        # ALWAYS engage for testing - we want to see the persona responses!
+        # In production, you can add back the threshold check.
+        # Lower threshold for testing (0.3 instead of 0.7)
+        # This ensures we engage with most messages to test the persona
+        return state.get("should_continue", False) or state.get("scam_probability", 0.0) >= 0.3
+    
     def _should_callback(self, state: HoneyPotState) -> Literal["callback", "end"]:
         """
         Decide whether to send callback or continue conversation.
@@ -355,36 +774,95 @@ class HoneyPotGraph:
         self,
         session_id: str,
         sender_id: str,
-        message: str,
+        message: Union[str, List[str]],
+        history: Optional[List[Dict[str, Any]]] = None,
     ) -> tuple[str, int, bool]:
         """
         Process an incoming message through the state machine.
         
+        Turns of the same session are applied one at a time, in arrival
+        order; different sessions run concurrently. The admission slot is
+        taken once the session lock is held, so turns queued behind their
+        own session do not count against the concurrency limit.
+        
         Args:
             session_id: Session identifier
             sender_id: Sender ID
-            message: Message content
+            message: Message content, or a coalesced burst of messages
+                in arrival order (answered as a single turn)
+            history: Platform conversationHistory, used to rebuild state
+                that is missing from Redis
             
         Returns:
             (response, turn_number, is_complete) tuple
+            
+        Raises:
+            AdmissionRejected: If the worker is over capacity
+            SessionLockTimeout: If another worker holds the session too long
         """
-        # Initialize state
-        initial_state: HoneyPotState = {
-            "session_id": session_id,
-            "sender_id": sender_id,
-            "current_message": message,
-        }
-        
-        # Run graph
-        # Note: LangGraph's async execution requires awaiting
-        final_state = await self.graph.ainvoke(initial_state)
+        messages = [message] if isinstance(message, str) else list(message)
+        note(burst=len(messages), degradation_level=degradation.level.name)
+        
+        async with session_locks.hold(session_id) as fencing_token, admission_controller.admit():
+            # Initialize state
+            initial_state: HoneyPotState = {
+                "session_id": session_id,
+                "sender_id": sender_id,
+                "current_message": "\n".join(messages),
+                "pending_messages": messages,
+                "conversation_history": history or [],
+                "fencing_token": fencing_token,
+            }
+            
+            # Run graph
+            # Note: LangGraph's async execution requires awaiting
+            try:
+                if self.checkpointer is not None:
+                    config = {"configurable": {"thread_id": session_id, "fencing_token": fencing_token}}
+                    final_state = await self.graph.ainvoke(initial_state, config)
+                else:
+                    final_state = await self.graph.ainvoke(initial_state)
+            finally:
+                self._drop_speculation(session_id)
         
         response = final_state.get("actor_response", "Okay.")
         turn_number = final_state.get("turn_number", 1)
         is_complete = final_state.get("callback_sent", False)
+        note(turn=turn_number)
         
         return response, turn_number, is_complete
+    
+    async def load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a session's stored state.
+        
+        Args:
+            session_id: Session identifier
+            
+        Returns:
+            State from the latest checkpoint, or the Redis session blob,
+            None if neither exists
+        """
+        if self.checkpointer is not None:
+            snapshot = await self.graph.aget_state({"configurable": {"thread_id": session_id}})
+            if snapshot.values:
+                return {k: v for k, v in snapshot.values.items() if k not in TRANSIENT_FIELDS}
+        return redis_client.load_state(session_id)
+    
+    async def delete_session(self, session_id: str) -> bool:
+        """
+        Delete a session's checkpoints and Redis session blob.
+        
+        Args:
+            session_id: Session identifier
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if self.checkpointer is not None:
+            await self.checkpointer.adelete_thread(session_id)
+        return redis_client.delete_state(session_id)
 
 
-# Global graph instance
-honeypot_graph = HoneyPotGraph()
+# Global graph instance (agents and LLM clients are built on first use)
+honeypot_graph: HoneyPotGraph = resources.register("graph", HoneyPotGraph)
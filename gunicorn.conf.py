@@ -0,0 +1,25 @@
+"""
+🦄 Gunicorn Configuration
+Server hooks for multiprocess Prometheus metrics.
+
+Command-line flags in the Dockerfile still set workers, bind and timeouts.
+"""
+
+import os
+import shutil
+
+
+def on_starting(server):
+    """Clear sample files left over from a previous master process."""
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Drop live gauges of a dead worker so they stop being aggregated."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -3,11 +3,18 @@
 FastAPI application for the India AI Impact Buildathon.
 """
 
+# Start of the time-to-ready clock (before the heavy imports below)
+from bootstrap import IMPORT_STARTED
+
+import asyncio
+import os
 import time
 from contextlib import asynccontextmanager
 from datetime import datetime
+from typing import Literal
 
-from fastapi import FastAPI, HTTPException, Security, Depends, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Security, Depends, BackgroundTasks, Response
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.security import APIKeyHeader
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -17,8 +24,22 @@ from models.schemas import (
     HealthCheckResponse,
 )
 from graph import honeypot_graph
+from services.coalescer import MessageCoalescer
+from services.replay_cache import replay_cache
+from services.admission import admission_controller, AdmissionRejected
+from services.degradation import degradation
+from services.warmup import warmup
+from services.health import health_monitor
 from utils.logger import logger, log_security_event
+from utils.metrics import REQUEST_LATENCY, STARTUP_DURATION, render_metrics
+from utils.tracing import setup_tracing, shutdown_tracing, span, current_trace_id
+from utils.flight_recorder import flight_recorder, note
+from utils.loop_monitor import loop_monitor
+from utils.traffic_recorder import traffic_recorder
+from utils.profiling import request_profiler, memory_profiler, ProfileMode, ProfilerBusy
+from utils.resources import resources
 from utils.redis_client import redis_client
+from utils.session_lock import SessionLockTimeout
 from config import settings
 
 
@@ -43,13 +64,22 @@ async def lifespan(app: FastAPI):
         f"Environment: {settings.environment.value}",
         debug=settings.debug,
     )
+    setup_tracing()
+    loop_monitor.start()
+    
+    # Build Redis, LLM clients and the graph in this worker (after fork)
+    await resources.warm()
     log_security_event(
         logger,
         "SYSTEM",
         f"Redis: {settings.redis_host}:{settings.redis_port}",
-        connected=redis_client.is_connected(),
+        connected=redis_client.client is not None,
     )
     
+    # Warm up in the background; probes answer meanwhile, /readyz stays 503
+    warmup_task = asyncio.create_task(warm_up())
+    health_monitor.start()
+    
     yield
     
     # Shutdown
@@ -58,7 +88,40 @@ async def lifespan(app: FastAPI):
         "SYSTEM",
         "Shutting down gracefully...",
     )
-    redis_client.close()
+    warmup_task.cancel()
+    await health_monitor.stop()
+    await loop_monitor.stop()
+    traffic_recorder.close()
+    shutdown_tracing()
+    resources.close()
+
+
+async def warm_up() -> None:
+    """Run the warm-up stage, then record time to ready."""
+    await warmup.run()
+    
+    ready_ms = (time.perf_counter() - IMPORT_STARTED) * 1000
+    STARTUP_DURATION.set(ready_ms / 1000)
+    if settings.startup_ready_target_ms and ready_ms > settings.startup_ready_target_ms:
+        logger.warning(
+            f"⚠️ Startup took {ready_ms:.0f} ms (target {settings.startup_ready_target_ms} ms)"
+        )
+    else:
+        log_security_event(logger, "SYSTEM", "Ready", startup_ms=int(ready_ms))
+
+
+def is_ready() -> bool:
+    """Resources are built and warm-up has finished in this worker."""
+    return resources.ready and warmup.done
+
+
+async def process_turn(*args) -> tuple[str, int, bool]:
+    """Run one graph turn (the graph is built on first use)."""
+    return await honeypot_graph.process_message(*args)
+
+
+# Bursts of messages for one session are answered as a single turn
+message_coalescer = MessageCoalescer(process_turn)
 
 
 # ===================================
@@ -143,6 +206,8 @@ async def root():
         "timestamp": datetime.utcnow().isoformat(),
         "endpoints": {
             "health": "/health",
+            "liveness": "/livez",
+            "readiness": "/readyz",
             "honeypot": "/api/honeypot (POST)",
             "test": "/api/test (GET)"
         }
@@ -167,15 +232,69 @@ async def health_check():
     """
     Health check endpoint.
     
+    Reads the health monitor's cached checks; never pings Redis itself.
+    
     Returns:
-        Health status and Redis connectivity
+        Health status, readiness, Redis connectivity, admission and
+        degradation state
     """
+    redis_status = health_monitor.snapshot.get("redis", {})
     return HealthCheckResponse(
         status="healthy",
-        redis_connected=redis_client.is_connected(),
+        ready=is_ready(),
+        redis_connected=redis_status.get("mode") == "redis" and redis_status.get("ok", False),
+        admission=admission_controller.stats(),
+        degradation=degradation.stats(),
+        resources=resources.status(),
+        warmup=warmup.stats(),
+        dependencies=health_monitor.snapshot or None,
     )
 
 
+@app.get("/livez")
+async def liveness_probe():
+    """
+    Liveness probe: 503 once the health monitor stops refreshing, which
+    means the event loop is wedged and the worker should be restarted.
+    
+    Dependencies are deliberately not checked here.
+    """
+    liveness = health_monitor.liveness()
+    return JSONResponse(status_code=200 if liveness["ok"] else 503, content=liveness)
+
+
+@app.get("/readyz")
+@app.get("/ready")
+async def readiness_probe():
+    """
+    Readiness probe: 503 until resources are built and warm-up has
+    finished, and whenever the cached checks are stale, event-loop lag is
+    too high or (with HEALTH_REQUIRE_REDIS) Redis is unreachable.
+    
+    Returns:
+        Readiness, cached dependency checks, per-resource build state and
+        warm-up steps
+    """
+    readiness = health_monitor.readiness(is_ready())
+    ready = readiness.pop("ok")
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, **readiness, "resources": resources.status(), "warmup": warmup.stats()},
+    )
+
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Prometheus scrape endpoint (aggregated across workers).
+    
+    Returns:
+        Metrics in the Prometheus text exposition format
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 # OPTIONS handler for CORS preflight
 @app.options("/api/honeypot")
 async def honeypot_options():
@@ -218,41 +337,94 @@ async def honeypot_endpoint(
         sender=sender,
         length=len(message_text),
     )
+    if traffic_recorder.enabled:
+        traffic_recorder.record(request.model_dump(mode="json"))
     
-    try:
-        # Process message through LangGraph
-        response_text, turn_number, is_complete = await honeypot_graph.process_message(
-            session_id=session_id,
-            sender_id=sender,
-            message=message_text,
-        )
-        
-        # Return GUVI format
-        response = HoneyPotResponse(
-            status="success",
-            reply=response_text
-        )
-        
-        engagement_duration = time.time() - start_time
-        
-        log_security_event(
-            logger,
-            "SYSTEM",
-            "Response generated",
-            session_id=session_id,
-            turn=turn_number,
-            duration_ms=int(engagement_duration * 1000),
-            complete=is_complete,
-        )
-        
-        return response
-        
-    except Exception as e:
-        logger.error(f"Error processing GUVI message: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=500,
-            detail=f"Internal server error: {str(e)[:200]}",
-        )
+    # Root span of the turn; nodes, LLM calls, Redis and callbacks nest under it.
+    # The flight recorder keeps the same breakdown for the slowest requests.
+    with span(
+        "honeypot.request",
+        session_id=session_id,
+        sender=sender,
+        message_length=len(message_text),
+        history_length=len(request.conversationHistory),
+    ), flight_recorder.capture(session_id, len(message_text)), request_profiler.track():
+        note(trace_id=current_trace_id())
+        try:
+            # Process message through LangGraph (coalescing bursts if enabled).
+            # Retries of the same message replay the first reply.
+            response_text, turn_number, is_complete = await replay_cache.run(
+                session_id,
+                request.message.timestamp,
+                lambda: message_coalescer.submit(
+                    session_id=session_id,
+                    sender_id=sender,
+                    message=message_text,
+                    history=[m.model_dump() for m in request.conversationHistory],
+                ),
+            )
+            
+            # Return GUVI format
+            response = HoneyPotResponse(
+                status="success",
+                reply=response_text
+            )
+            
+            engagement_duration = time.time() - start_time
+            REQUEST_LATENCY.labels("success").observe(engagement_duration)
+            
+            log_security_event(
+                logger,
+                "SYSTEM",
+                "Response generated",
+                session_id=session_id,
+                turn=turn_number,
+                duration_ms=int(engagement_duration * 1000),
+                complete=is_complete,
+                trace_id=current_trace_id(),
+            )
+            
+            return response
+            
+        except AdmissionRejected as e:
+            # Over capacity: stall in persona instead of failing or timing out
+            log_security_event(
+                logger,
+                "SYSTEM",
+                "Shed request answered with stalling reply",
+                session_id=session_id,
+                reason=e.reason,
+            )
+            REQUEST_LATENCY.labels("shed").observe(time.time() - start_time)
+            note(outcome="shed")
+            return HoneyPotResponse(
+                status="success",
+                reply=honeypot_graph.actor.stall_response(message_text),
+            )
+            
+        except SessionLockTimeout as e:
+            # Another worker is still on this session: stall rather than fail
+            log_security_event(
+                logger,
+                "SYSTEM",
+                "Busy session answered with stalling reply",
+                session_id=session_id,
+                reason=str(e),
+            )
+            REQUEST_LATENCY.labels("busy").observe(time.time() - start_time)
+            note(outcome="busy")
+            return HoneyPotResponse(
+                status="success",
+                reply=honeypot_graph.actor.stall_response(message_text),
+            )
+            
+        except Exception as e:
+            logger.error(f"Error processing GUVI message: {e}", exc_info=True)
+            REQUEST_LATENCY.labels("error").observe(time.time() - start_time)
+            raise HTTPException(
+                status_code=500,
+                detail=f"Internal server error: {str(e)[:200]}",
+            )
 
 
 @app.get("/api/session/{session_id}")
@@ -270,7 +442,7 @@ async def get_session_state(
     Returns:
         Session state from Redis
     """
-    state = redis_client.load_state(session_id)
+    state = await honeypot_graph.load_session(session_id)
     
     if not state:
         raise HTTPException(
@@ -296,7 +468,7 @@ async def delete_session(
     Returns:
         Deletion confirmation
     """
-    success = redis_client.delete_state(session_id)
+    success = await honeypot_graph.delete_session(session_id)
     
     if success:
         return {"message": f"Session {session_id} deleted"}
@@ -307,6 +479,177 @@ async def delete_session(
         )
 
 
+@app.get("/admin/slow-requests")
+async def slow_requests(
+    clear: bool = False,
+    api_key: str = Depends(verify_api_key),
+):
+    """
+    Dump the slowest recent requests of this worker.
+    
+    Args:
+        clear: Reset the recorder after dumping
+        api_key: Validated API key
+        
+    Returns:
+        Recorded requests, slowest first, with per-node and per-provider timings
+    """
+    entries = flight_recorder.dump()
+    if clear:
+        flight_recorder.clear()
+    
+    return {
+        "worker_pid": os.getpid(),
+        "capacity": settings.flight_recorder_size,
+        "window_s": settings.flight_recorder_window_s,
+        "requests": entries,
+    }
+
+
+@app.get("/admin/event-loop")
+async def event_loop_report(
+    clear: bool = False,
+    api_key: str = Depends(verify_api_key),
+):
+    """
+    Event-loop lag percentiles and (DEBUG mode) call sites that blocked
+    the loop, with the stack captured while it was blocked.
+    
+    Args:
+        clear: Reset samples and recorded call sites after reporting
+        api_key: Validated API key
+        
+    Returns:
+        Lag percentiles and blocking call sites, worst first
+    """
+    report = loop_monitor.report()
+    if clear:
+        loop_monitor.clear()
+    
+    return {"worker_pid": os.getpid(), **report}
+
+
+def require_profiling() -> None:
+    """
+    Reject profiling requests unless PROFILING_ENABLED is set.
+    
+    Raises:
+        HTTPException: If profiling is disabled
+    """
+    if not settings.profiling_enabled:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+
+
+@app.post("/admin/profile/cpu")
+async def start_cpu_profile(
+    mode: ProfileMode = "sampling",
+    requests: int = 20,
+    interval_ms: int = 5,
+    api_key: str = Depends(verify_api_key),
+    _: None = Depends(require_profiling),
+):
+    """
+    Profile the next N /api/honeypot requests on this worker.
+    
+    Args:
+        mode: "cprofile" (pstats) or "sampling" (collapsed stacks, all threads)
+        requests: Number of requests to profile
+        interval_ms: Sampling interval for "sampling" mode
+        api_key: Validated API key
+        
+    Returns:
+        Profiler status
+    """
+    try:
+        request_profiler.arm(mode, max(requests, 1), max(interval_ms, 1))
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    return {"worker_pid": os.getpid(), **request_profiler.status()}
+
+
+@app.get("/admin/profile/cpu")
+async def get_cpu_profile(
+    api_key: str = Depends(verify_api_key),
+    _: None = Depends(require_profiling),
+):
+    """
+    Fetch the finished CPU profile, or the progress of a running one.
+    
+    Args:
+        api_key: Validated API key
+        
+    Returns:
+        pstats text or collapsed stacks once finished, status JSON before
+    """
+    report = request_profiler.report()
+    if request_profiler.session is None and report is not None:
+        return PlainTextResponse(report)
+    
+    return {"worker_pid": os.getpid(), **request_profiler.status()}
+
+
+@app.post("/admin/profile/memory")
+async def take_memory_snapshot(
+    api_key: str = Depends(verify_api_key),
+    _: None = Depends(require_profiling),
+):
+    """
+    Take a tracemalloc snapshot (starts tracing on first call).
+    
+    Args:
+        api_key: Validated API key
+        
+    Returns:
+        Snapshot id and traced memory
+    """
+    return {"worker_pid": os.getpid(), **memory_profiler.snapshot()}
+
+
+@app.get("/admin/profile/memory/diff")
+async def diff_memory_snapshot(
+    since: int,
+    limit: int = 25,
+    key_type: Literal["lineno", "filename", "traceback"] = "lineno",
+    api_key: str = Depends(verify_api_key),
+    _: None = Depends(require_profiling),
+):
+    """
+    Allocation growth since an earlier snapshot.
+    
+    Args:
+        since: Snapshot id returned by POST /admin/profile/memory
+        limit: Number of allocation sites
+        key_type: Grouping of allocation sites
+        api_key: Validated API key
+        
+    Returns:
+        Top allocation sites by growth
+    """
+    try:
+        return {"worker_pid": os.getpid(), **memory_profiler.diff(since, limit, key_type)}
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown snapshot: {since}")
+
+
+@app.delete("/admin/profile/memory")
+async def stop_memory_profiling(
+    api_key: str = Depends(verify_api_key),
+    _: None = Depends(require_profiling),
+):
+    """
+    Stop tracemalloc and drop all snapshots.
+    
+    Args:
+        api_key: Validated API key
+        
+    Returns:
+        Confirmation
+    """
+    memory_profiler.stop()
+    return {"status": "stopped"}
+
+
 @app.get("/api/test")
 async def test_endpoint():
     """
@@ -319,6 +662,8 @@ async def test_endpoint():
         "timestamp": datetime.utcnow().isoformat(),
         "endpoints": {
             "health": "/health",
+            "liveness": "/livez",
+            "readiness": "/readyz",
             "honeypot": "/api/honeypot (POST)",
             "test": "/api/test (GET)"
         }
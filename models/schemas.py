@@ -108,10 +108,31 @@ class HealthCheckResponse(BaseModel):
     """
     Health check endpoint response.
     """
-    status: str = Field(default="healthy", description="Service status")
+    status: str = Field(default="healthy", description="Service status (liveness)")
+    ready: bool = Field(default=True, description="Whether the worker can serve traffic (readiness)")
     timestamp: datetime = Field(
         default_factory=datetime.utcnow,
         description="Health check timestamp"
     )
     redis_connected: bool = Field(..., description="Redis connection status")
     version: str = Field(default="1.0.0", description="API version")
+    admission: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Admission control counters (queue depth, wait time, shed counts)"
+    )
+    degradation: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Current degradation level and rolling per-node p95"
+    )
+    resources: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Build state of lazily initialized singletons"
+    )
+    warmup: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Startup warm-up progress and per-step timings"
+    )
+    dependencies: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Cached dependency checks from the background health monitor"
+    )
@@ -1,12 +1,86 @@
 """
 🛡️ LangGraph State Definition
 TypedDict-based state for the multi-agent state machine.
+
+Nodes return only the keys they changed. Fields annotated with a reducer
+merge that update into the current value instead of replacing it:
+append_items for the message history and forensic ledger, union_items for
+extracted indicators.
 """
 
-from typing import TypedDict, List, Dict, Any, Optional
+from typing import Annotated, TypedDict, List, Dict, Any, Optional, get_type_hints
 from datetime import datetime
 
 
+class Replace(list):
+    """
+    Update for a reducer field that replaces the current value.
+    
+    Used when a node loads or rebuilds a whole session, e.g. over state
+    restored from a checkpoint.
+    """
+
+
+def append_items(existing: Optional[List[Any]], new: Optional[List[Any]]) -> List[Any]:
+    """
+    Reducer: append new entries.
+    
+    Returns a new list: LangGraph applies a node's writes to scratch copies
+    of the channels when routing, so its reducers must not mutate values.
+    
+    Args:
+        existing: Current list (None when unset)
+        new: Entries added by a node
+        
+    Returns:
+        New list with the entries appended
+    """
+    if isinstance(new, Replace):
+        return list(new)
+    return [*(existing or ()), *(new or ())]
+
+
+def extend_items(existing: Optional[List[Any]], new: Optional[List[Any]]) -> List[Any]:
+    """
+    In-place append_items, used by apply_update.
+    
+    Costs O(new entries) however long the history is.
+    
+    Args:
+        existing: Current list (None when unset), extended in place
+        new: Entries added by a node
+        
+    Returns:
+        The current list with the entries appended
+    """
+    if isinstance(new, Replace) or existing is None:
+        return list(new or ())
+    existing.extend(new or ())
+    return existing
+
+
+def union_items(existing: Optional[List[Any]], new: Optional[List[Any]]) -> List[Any]:
+    """
+    Reducer: add values not already present, keeping first-seen order.
+    
+    Args:
+        existing: Current list (None when unset)
+        new: Values found by a node
+        
+    Returns:
+        New list without duplicates
+    """
+    if isinstance(new, Replace):
+        return list(new)
+    merged = list(existing or ())
+    seen = set(merged)
+    for value in new or ():
+        if value not in seen:
+            seen.add(value)
+            merged.append(value)
+    return merged
+
+
 class HoneyPotState(TypedDict, total=False):
     """
     State maintained throughout the LangGraph execution.
@@ -25,9 +99,11 @@ class HoneyPotState(TypedDict, total=False):
     # ===================================
     # Conversation History
     # ===================================
-    messages: List[Dict[str, Any]]  # [{"role": "scammer/agent", "content": "...", "timestamp": ...}]
+    messages: Annotated[List[Dict[str, Any]], append_items]  # [{"role": "scammer/agent", "content": "...", "timestamp": ...}]
     sender_id: str
     current_message: str
+    pending_messages: List[str]  # Messages answered by this turn (>1 when coalesced)
+    conversation_history: List[Dict[str, Any]]  # Platform-supplied history (not persisted)
     
     # ===================================
     # Profiler Agent Output
@@ -49,13 +125,13 @@ class HoneyPotState(TypedDict, total=False):
     # ===================================
     # Auditor Agent Output (Silent)
     # ===================================
-    extracted_upi_ids: List[str]
-    extracted_bank_accounts: List[str]
-    extracted_phone_numbers: List[str]
-    extracted_urls: List[str]
-    extracted_emails: List[str]
-    extracted_keywords: List[str]
-    forensic_ledger: List[Dict[str, Any]]  # Timestamped extraction events
+    extracted_upi_ids: Annotated[List[str], union_items]
+    extracted_bank_accounts: Annotated[List[str], union_items]
+    extracted_phone_numbers: Annotated[List[str], union_items]
+    extracted_urls: Annotated[List[str], union_items]
+    extracted_emails: Annotated[List[str], union_items]
+    extracted_keywords: Annotated[List[str], union_items]
+    forensic_ledger: Annotated[List[Dict[str, Any]], append_items]  # Timestamped extraction events
     auditor_complete: bool
     
     # ===================================
@@ -65,6 +141,7 @@ class HoneyPotState(TypedDict, total=False):
     should_continue: bool
     should_callback: bool
     engagement_duration: float  # Seconds
+    fencing_token: Optional[int]  # Session lease token guarding state writes
     
     # ===================================
     # Callback Status
@@ -73,3 +150,56 @@ class HoneyPotState(TypedDict, total=False):
     callback_success: bool
     callback_attempts: int
     callback_error: Optional[str]
+
+
+# Request-scoped fields that are never written to Redis
+TRANSIENT_FIELDS = frozenset({"conversation_history"})
+
+# Field -> reducer, for fields that merge updates instead of replacing them
+REDUCERS = {
+    name: hint.__metadata__[0]
+    for name, hint in get_type_hints(HoneyPotState, include_extras=True).items()
+    if hasattr(hint, "__metadata__")
+}
+
+# In-place variants apply_update uses on states it owns
+IN_PLACE_REDUCERS = {append_items: extend_items}
+
+
+def apply_update(state: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge a node's update into the state, the way LangGraph does.
+    
+    Appended lists are extended in place; use with_update() to leave the
+    state untouched.
+    
+    Args:
+        state: State to update in place
+        update: Keys returned by a node
+        
+    Returns:
+        The same state
+    """
+    for key, value in update.items():
+        reducer = REDUCERS.get(key)
+        reducer = IN_PLACE_REDUCERS.get(reducer, reducer)
+        state[key] = reducer(state.get(key), value) if reducer else value
+    return state
+
+
+def with_update(state: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge a node's update into a copy of the state.
+    
+    Args:
+        state: State to leave untouched
+        update: Keys returned by a node
+        
+    Returns:
+        New state with the update applied
+    """
+    merged = dict(state)
+    for key in REDUCERS.keys() & update.keys():
+        if isinstance(merged.get(key), list):
+            merged[key] = list(merged[key])
+    return apply_update(merged, update)
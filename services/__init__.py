@@ -1,8 +1,29 @@
 """Services package initialization."""
 
 from services.callback import callback_service, CallbackService
+from services.coalescer import MessageCoalescer
+from services.replay_cache import replay_cache, ReplayCache
+from services.admission import admission_controller, AdmissionController, AdmissionRejected
+from services.degradation import degradation, DegradationController, DegradationLevel
+from services.warmup import warmup, WarmUp
+from services.health import health_monitor, HealthMonitor, provider_circuits, ProviderCircuits
 
 __all__ = [
     "callback_service",
     "CallbackService",
+    "MessageCoalescer",
+    "replay_cache",
+    "ReplayCache",
+    "admission_controller",
+    "AdmissionController",
+    "AdmissionRejected",
+    "degradation",
+    "DegradationController",
+    "DegradationLevel",
+    "warmup",
+    "WarmUp",
+    "health_monitor",
+    "HealthMonitor",
+    "provider_circuits",
+    "ProviderCircuits",
 ]
@@ -0,0 +1,168 @@
+"""
+🚦 Admission Control
+Per-worker concurrency limit with a bounded, time-boxed wait queue.
+
+A request either gets one of `admission_max_concurrency` slots, waits in a
+FIFO queue of at most `admission_max_queue` entries for up to
+`admission_queue_timeout_ms`, or is shed immediately. Shed requests are
+answered with an instant in-persona stalling reply by the caller.
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict
+
+from utils.logger import logger, log_security_event
+from utils.metrics import ADMISSION_ACTIVE, ADMISSION_QUEUE_DEPTH, ADMISSION_SHED, ADMISSION_WAIT
+from config import settings
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed because the worker is over capacity."""
+
+    def __init__(self, reason: str):
+        super().__init__(f"Request shed: {reason}")
+        self.reason = reason
+
+
+class AdmissionController:
+    """
+    Semaphore with a bounded FIFO queue and a queue-time SLO.
+    """
+
+    def __init__(self):
+        """Initialize counters."""
+        self._active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+
+    @property
+    def active(self) -> int:
+        """Requests currently holding a slot."""
+        return self._active
+
+    @property
+    def queue_depth(self) -> int:
+        """Requests currently waiting for a slot."""
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        Hold a concurrency slot for the duration of the block.
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait exceeds the SLO
+        """
+        limit = settings.admission_max_concurrency
+        if limit <= 0:
+            yield
+            return
+
+        started = time.perf_counter()
+
+        if self._active < limit and not self._waiters:
+            self._active += 1
+            ADMISSION_ACTIVE.inc()
+        else:
+            await self._enqueue()
+
+        self._record_admission((time.perf_counter() - started) * 1000)
+
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _enqueue(self) -> None:
+        """
+        Wait in the FIFO queue until a slot is handed over.
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait times out
+        """
+        if len(self._waiters) >= settings.admission_max_queue:
+            self.shed_queue_full += 1
+            self._log_shed("queue_full")
+            raise AdmissionRejected("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        ADMISSION_QUEUE_DEPTH.inc()
+
+        try:
+            await asyncio.wait_for(waiter, settings.admission_queue_timeout_ms / 1000)
+        except asyncio.TimeoutError:
+            # Slot was handed over in the same tick the timeout fired
+            if waiter.done() and not waiter.cancelled():
+                return
+            self.shed_timeout += 1
+            self._log_shed("queue_timeout")
+            raise AdmissionRejected("queue_timeout")
+        except asyncio.CancelledError:
+            # Slot was handed over just as the client went away
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            ADMISSION_QUEUE_DEPTH.dec()
+
+    def _release(self) -> None:
+        """Hand the slot to the next live waiter, or free it."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+        ADMISSION_ACTIVE.dec()
+
+    def _record_admission(self, wait_ms: float) -> None:
+        """Track queue wait time of an admitted request."""
+        self.admitted += 1
+        self.wait_ms_total += wait_ms
+        self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+        ADMISSION_WAIT.observe(wait_ms / 1000)
+
+    def _log_shed(self, reason: str) -> None:
+        """Log and count a shed request."""
+        ADMISSION_SHED.labels(reason).inc()
+        log_security_event(
+            logger,
+            "SYSTEM",
+            "⚠️ Over capacity, shedding request",
+            reason=reason,
+            active=self._active,
+            queued=len(self._waiters),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of admission counters for health and metrics.
+
+        Returns:
+            Counter dictionary
+        """
+        return {
+            "limit": settings.admission_max_concurrency,
+            "active": self._active,
+            "queue_depth": len(self._waiters),
+            "admitted": self.admitted,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_timeout": self.shed_timeout,
+            "wait_ms_avg": round(self.wait_ms_total / self.admitted, 2) if self.admitted else 0.0,
+            "wait_ms_max": round(self.wait_ms_max, 2),
+        }
+
+
+# Global admission controller (one per worker process)
+admission_controller = AdmissionController()
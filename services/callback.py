@@ -16,9 +16,16 @@ from tenacity import (
 
 from models.schemas import CallbackPayload
 from utils.logger import logger, log_security_event
+from utils.metrics import CALLBACKS
+from utils.tracing import span
+from utils.resources import resources
 from config import settings
 
 
+# Payloads that still failed after all retries are saved here
+FALLBACK_DIR = "failed_callbacks"
+
+
 class CallbackService:
     """
     Handles callbacks to the GUVI hackathon endpoint with automatic retries.
@@ -67,13 +74,15 @@ class CallbackService:
                 session_id=session_id,
             )
             
-            response = await client.post(
-                self.callback_url,
-                json=payload,
-                headers=headers,
-            )
-            
-            response.raise_for_status()
+            # One span per attempt, so retries show up side by side
+            with span("callback.attempt", session_id=session_id):
+                response = await client.post(
+                    self.callback_url,
+                    json=payload,
+                    headers=headers,
+                )
+                
+                response.raise_for_status()
             
             log_security_event(
                 logger,
@@ -114,21 +123,25 @@ class CallbackService:
                 response=str(result)[:100],
             )
             
+            CALLBACKS.labels("success").inc()
             return True, None
             
         except httpx.HTTPStatusError as e:
             error_msg = f"HTTP {e.response.status_code}: {e.response.text[:200]}"
             logger.error(f"❌ Callback failed after retries: {error_msg}")
+            CALLBACKS.labels("http_error").inc()
             return False, error_msg
             
         except httpx.TimeoutException:
             error_msg = "Request timeout after all retries"
             logger.error(f"❌ Callback timeout: {error_msg}")
+            CALLBACKS.labels("timeout").inc()
             return False, error_msg
             
         except Exception as e:
             error_msg = f"Unexpected error: {str(e)[:200]}"
             logger.error(f"❌ Callback error: {error_msg}")
+            CALLBACKS.labels("error").inc()
             return False, error_msg
     
     async def send_callback_background(
@@ -147,12 +160,12 @@ class CallbackService:
         
         if not success:
             # Fallback: Save to local file
-            fallback_path = f"failed_callbacks/{session_id}.json"
+            fallback_path = f"{FALLBACK_DIR}/{session_id}.json"
             try:
                 import os
                 import json
                 
-                os.makedirs("failed_callbacks", exist_ok=True)
+                os.makedirs(FALLBACK_DIR, exist_ok=True)
                 
                 with open(fallback_path, "w") as f:
                     json.dump(
@@ -170,5 +183,5 @@ class CallbackService:
                 logger.error(f"❌ Failed to save fallback file: {e}")
 
 
-# Global callback service instance
-callback_service = CallbackService()
+# Global callback service instance (built on first use)
+callback_service: CallbackService = resources.register("callback", CallbackService)
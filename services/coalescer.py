@@ -0,0 +1,113 @@
+"""
+🧺 Message Coalescing
+Merges rapid-fire scammer bursts into a single turn.
+
+The first message of a session opens a window of `coalesce_window_ms`.
+Messages of the same session arriving inside the window join the batch;
+when it closes, the batch is processed once (one profiler run, one LLM call)
+and every waiting request receives the same reply.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from utils.logger import logger, log_security_event
+from config import settings
+
+
+ProcessFn = Callable[..., Awaitable[tuple[str, int, bool]]]
+
+
+class _Batch:
+    """Messages collected for one session during an open window."""
+
+    def __init__(self, sender_id: str, message: str, history: Optional[List[Dict[str, Any]]]):
+        self.sender_id = sender_id
+        self.messages: List[str] = [message]
+        # History as seen before the burst started
+        self.history = history
+        self.task: "asyncio.Task[tuple[str, int, bool]] | None" = None
+
+
+class MessageCoalescer:
+    """
+    Per-session coalescing window in front of the graph.
+    """
+
+    def __init__(self, process: ProcessFn):
+        """
+        Initialize the coalescer.
+
+        Args:
+            process: Turn processor, normally HoneyPotGraph.process_message
+        """
+        self.process = process
+        self._open: Dict[str, _Batch] = {}
+
+    async def submit(
+        self,
+        session_id: str,
+        sender_id: str,
+        message: str,
+        history: Optional[List[Dict[str, Any]]] = None,
+    ) -> tuple[str, int, bool]:
+        """
+        Submit a message, joining the session's open batch if there is one.
+
+        Args:
+            session_id: Session identifier
+            sender_id: Sender ID
+            message: Message content
+            history: Platform conversationHistory of the request
+
+        Returns:
+            (response, turn_number, is_complete) tuple for the batch
+        """
+        if settings.coalesce_window_ms <= 0:
+            return await self.process(session_id, sender_id, message, history)
+
+        batch = self._open.get(session_id)
+        if batch is not None:
+            batch.messages.append(message)
+            log_security_event(
+                logger,
+                "SYSTEM",
+                "Message coalesced into open burst",
+                session_id=session_id,
+                burst=len(batch.messages),
+            )
+        else:
+            batch = _Batch(sender_id, message, history)
+            self._open[session_id] = batch
+            batch.task = asyncio.create_task(self._flush(session_id, batch))
+
+        # Shield so one disconnected client does not cancel the whole burst
+        return await asyncio.shield(batch.task)
+
+    async def _flush(self, session_id: str, batch: _Batch) -> tuple[str, int, bool]:
+        """
+        Close the window and process the batch as one turn.
+
+        Args:
+            session_id: Session identifier
+            batch: Collected messages
+
+        Returns:
+            (response, turn_number, is_complete) tuple
+        """
+        try:
+            await asyncio.sleep(settings.coalesce_window_ms / 1000)
+        finally:
+            # Later messages open a new window (queued behind this turn)
+            if self._open.get(session_id) is batch:
+                del self._open[session_id]
+
+        if len(batch.messages) > 1:
+            log_security_event(
+                logger,
+                "SYSTEM",
+                f"Processing burst of {len(batch.messages)} messages as one turn",
+                session_id=session_id,
+            )
+
+        return await self.process(session_id, batch.sender_id, batch.messages, batch.history)
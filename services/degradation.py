@@ -0,0 +1,183 @@
+"""
+📉 Adaptive Degradation Ladder
+Sheds expensive work step by step when node latency breaks its SLO.
+
+Levels are cumulative - each one keeps everything the previous level skips:
+
+    NORMAL                  full pipeline
+    SKIP_WHOIS              no WHOIS domain age lookup in the Profiler
+    SKIP_PHONE_SECOND_PASS  phone extraction only with the IN region pass
+    SHORT_CONTEXT           Actor sends only the last 2 messages as context
+    FALLBACK_ONLY           Actor answers from the fallback bank, no LLM call
+
+The level goes up one step when any node's rolling p95 exceeds its SLO and
+down one step when every node is comfortably below it, with a cooldown
+between changes to avoid flapping. Samples arrive from the worker threads
+that run sync nodes, so the window is guarded by a lock, and the p95s are
+re-evaluated every few samples rather than on every node call.
+"""
+
+import threading
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from utils.logger import logger, log_security_event
+from utils.metrics import DEGRADATION_LEVEL
+from config import settings
+
+
+class DegradationLevel(IntEnum):
+    """Ordered degradation levels."""
+    NORMAL = 0
+    SKIP_WHOIS = 1
+    SKIP_PHONE_SECOND_PASS = 2
+    SHORT_CONTEXT = 3
+    FALLBACK_ONLY = 4
+
+
+class DegradationController:
+    """
+    Tracks rolling per-node latency and picks the current degradation level.
+    """
+
+    # Samples needed before a node's p95 is trusted
+    MIN_SAMPLES = 20
+    # p95 below this fraction of the SLO counts as recovered
+    RECOVERY_RATIO = 0.6
+    # Re-evaluate after this many samples, or this long since the last time
+    EVALUATE_EVERY = 16
+    EVALUATE_INTERVAL_S = 1.0
+
+    def __init__(self):
+        """Initialize with an empty window at NORMAL."""
+        self.level = DegradationLevel.NORMAL
+        self._samples: Dict[str, Deque[Tuple[float, float]]] = {}
+        self._lock = threading.Lock()
+        self._last_change = 0.0
+        self._last_evaluate = 0.0
+        self._pending = 0
+
+    def degraded(self, level: DegradationLevel) -> bool:
+        """
+        Check whether work skipped at `level` should be skipped now.
+
+        Args:
+            level: Degradation step to check
+
+        Returns:
+            True if the current level is at or above `level`
+        """
+        return self.level >= level
+
+    def record(self, node: str, duration_ms: float) -> None:
+        """
+        Record a node execution and periodically re-evaluate the level.
+
+        Safe to call from worker threads.
+
+        Args:
+            node: Graph node name
+            duration_ms: Wall-clock duration in milliseconds
+        """
+        now = time.monotonic()
+        with self._lock:
+            samples = self._samples.get(node)
+            if samples is None:
+                samples = self._samples[node] = deque(maxlen=512)
+            samples.append((now, duration_ms))
+            self._pending += 1
+
+            if not settings.degradation_enabled:
+                return
+            if self._pending < self.EVALUATE_EVERY and now - self._last_evaluate < self.EVALUATE_INTERVAL_S:
+                return
+
+            self._pending = 0
+            self._last_evaluate = now
+            self._evaluate(now)
+
+    def p95(self, node: str) -> Optional[float]:
+        """
+        Rolling p95 latency of a node over the configured window.
+
+        Args:
+            node: Graph node name
+
+        Returns:
+            p95 in milliseconds, or None without enough recent samples
+        """
+        with self._lock:
+            return self._p95(node)
+
+    def _p95(self, node: str) -> Optional[float]:
+        """p95 of a node; caller holds the lock."""
+        samples = self._samples.get(node)
+        if not samples:
+            return None
+
+        horizon = time.monotonic() - settings.degradation_window_s
+        while samples and samples[0][0] < horizon:
+            samples.popleft()
+
+        if len(samples) < self.MIN_SAMPLES:
+            return None
+
+        durations = sorted(duration for _, duration in samples)
+        return durations[int(len(durations) * 0.95) - 1]
+
+    def _evaluate(self, now: float) -> None:
+        """Move the level one step if the SLOs call for it; caller holds the lock."""
+        if now - self._last_change < settings.degradation_cooldown_s:
+            return
+
+        ratios = []
+        for node, slo_ms in settings.degradation_slo_ms.items():
+            p95 = self._p95(node)
+            if p95 is not None:
+                ratios.append(p95 / slo_ms)
+
+        if not ratios:
+            return
+
+        worst = max(ratios)
+        if worst > 1.0 and self.level < DegradationLevel.FALLBACK_ONLY:
+            self._set_level(DegradationLevel(self.level + 1), worst)
+        elif worst < self.RECOVERY_RATIO and self.level > DegradationLevel.NORMAL:
+            self._set_level(DegradationLevel(self.level - 1), worst)
+
+    def _set_level(self, level: DegradationLevel, worst_ratio: float) -> None:
+        """Change level and log it; caller holds the lock."""
+        log_security_event(
+            logger,
+            "SYSTEM",
+            f"{'⚠️ Degrading' if level > self.level else '✅ Recovering'} to {level.name}",
+            previous=self.level.name,
+            worst_p95_vs_slo=f"{worst_ratio:.2f}",
+        )
+        self.level = level
+        DEGRADATION_LEVEL.set(int(level))
+        self._last_change = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the controller for health and metrics.
+
+        Returns:
+            Level and per-node rolling p95
+        """
+        with self._lock:
+            return {
+                "level": int(self.level),
+                "level_name": self.level.name,
+                "p95_ms": {
+                    node: round(p95, 1)
+                    for node in self._samples
+                    if (p95 := self._p95(node)) is not None
+                },
+            }
+
+
+# Global degradation controller (one per worker process)
+degradation = DegradationController()
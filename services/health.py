@@ -0,0 +1,235 @@
+"""
+🩺 Health Monitor
+Background dependency checks behind the /livez and /readyz probes.
+
+Probes only read the last cached snapshot, so they answer in microseconds
+and never touch Redis themselves. Every `health_check_interval_s` the monitor:
+
+    - pings Redis (in a thread, with a timeout)
+    - summarizes each LLM provider's circuit from recent call outcomes
+    - counts callbacks waiting in the local fallback outbox
+    - reads event-loop lag from the loop monitor (or, when that is
+      disabled, from its own sleep overshoot)
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+from utils.logger import logger, log_security_event
+from utils.loop_monitor import loop_monitor
+from config import settings
+
+
+class ProviderCircuits:
+    """
+    Per-provider circuit state derived from consecutive call failures.
+
+        closed     calls are succeeding
+        open       `circuit_failure_threshold` failures in a row, the last
+                   one less than `circuit_cooldown_s` ago
+        half_open  failing, but the cooldown has passed (next call is a probe)
+    """
+
+    def __init__(self):
+        """Initialize with no history."""
+        self._providers: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, provider: str, ok: bool) -> None:
+        """
+        Record the outcome of one provider call.
+
+        Args:
+            provider: "groq", "openai" or "gemini"
+            ok: Whether the call succeeded
+        """
+        entry = self._providers.setdefault(provider, {"failures": 0, "last_failure": 0.0, "calls": 0})
+        entry["calls"] += 1
+        if ok:
+            entry["failures"] = 0
+        else:
+            entry["failures"] += 1
+            entry["last_failure"] = time.monotonic()
+
+    def state(self, provider: str) -> str:
+        """
+        Current circuit state of a provider.
+
+        Args:
+            provider: Provider name
+
+        Returns:
+            "closed", "open" or "half_open"
+        """
+        entry = self._providers.get(provider)
+        if entry is None or entry["failures"] < settings.circuit_failure_threshold:
+            return "closed"
+        if time.monotonic() - entry["last_failure"] < settings.circuit_cooldown_s:
+            return "open"
+        return "half_open"
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Circuit summary of every provider seen so far.
+
+        Returns:
+            State and consecutive failures per provider
+        """
+        return {
+            provider: {
+                "state": self.state(provider),
+                "consecutive_failures": entry["failures"],
+                "calls": entry["calls"],
+            }
+            for provider, entry in self._providers.items()
+        }
+
+
+class HealthMonitor:
+    """
+    Periodically refreshes a cached health snapshot.
+    """
+
+    def __init__(self):
+        """Initialize with an empty snapshot."""
+        self.snapshot: Dict[str, Any] = {}
+        self.checked_at: Optional[float] = None
+        self.loop_lag_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the background loop on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Check, sleep, measure how late we woke up, repeat."""
+        interval = settings.health_check_interval_s
+        while True:
+            try:
+                await self.check()
+            except Exception as e:
+                logger.warning(f"Health check failed: {e}")
+
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            self.loop_lag_ms = max((time.perf_counter() - expected) * 1000, 0.0)
+
+    async def check(self) -> Dict[str, Any]:
+        """
+        Run all dependency checks once and cache the result.
+
+        Returns:
+            Fresh snapshot
+        """
+        redis_status = await self._check_redis()
+        outbox = await asyncio.to_thread(self._outbox_backlog)
+        lag_ms = loop_monitor.lag_ms(0.95) if loop_monitor.running else self.loop_lag_ms
+
+        snapshot = {
+            "redis": redis_status,
+            "llm_providers": provider_circuits.summary(),
+            "callback_outbox": {
+                "pending": outbox,
+                "ok": outbox < settings.health_outbox_warn,
+            },
+            "event_loop": {
+                "lag_ms": round(lag_ms, 1),
+                "ok": lag_ms < settings.health_max_loop_lag_ms,
+            },
+        }
+
+        previous = self.snapshot
+        self.snapshot = snapshot
+        self.checked_at = time.monotonic()
+
+        if previous and previous["redis"]["ok"] != redis_status["ok"]:
+            log_security_event(
+                logger,
+                "SYSTEM",
+                "✅ Redis reachable again" if redis_status["ok"] else "⚠️ Redis health check failing",
+                detail=redis_status.get("error"),
+            )
+        return snapshot
+
+    async def _check_redis(self) -> Dict[str, Any]:
+        """Ping Redis without blocking the loop."""
+        from utils.redis_client import redis_client
+
+        if redis_client.client is None:
+            return {"ok": not settings.health_require_redis, "mode": "memory"}
+
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.to_thread(redis_client.client.ping), timeout=2.0)
+            return {"ok": True, "mode": "redis", "ping_ms": round((time.perf_counter() - started) * 1000, 1)}
+        except Exception as e:
+            return {"ok": False, "mode": "redis", "error": f"{type(e).__name__}: {str(e)[:100]}"}
+
+    @staticmethod
+    def _outbox_backlog() -> int:
+        """Count callbacks saved locally after failing."""
+        from services.callback import FALLBACK_DIR
+
+        try:
+            return sum(1 for entry in os.scandir(FALLBACK_DIR) if entry.name.endswith(".json"))
+        except FileNotFoundError:
+            return 0
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the snapshot was refreshed recently (the monitor is alive)."""
+        return (
+            self.checked_at is not None
+            and time.monotonic() - self.checked_at < 3 * settings.health_check_interval_s
+        )
+
+    def liveness(self) -> Dict[str, Any]:
+        """
+        Liveness: the monitor keeps running, so the event loop is not wedged.
+
+        Returns:
+            Dictionary with an "ok" flag
+        """
+        return {
+            "ok": self.checked_at is None or self.fresh,
+            "checked_s_ago": round(time.monotonic() - self.checked_at, 1) if self.checked_at else None,
+        }
+
+    def readiness(self, started: bool) -> Dict[str, Any]:
+        """
+        Readiness: started, checks fresh, Redis and event loop healthy.
+
+        LLM circuits and the callback outbox are reported but do not gate
+        traffic; the Actor has a fallback bank and callbacks are retried.
+
+        Args:
+            started: Resources built and warm-up finished
+
+        Returns:
+            Dictionary with an "ok" flag and the cached checks
+        """
+        snapshot = self.snapshot
+        ok = (
+            started
+            and self.fresh
+            and snapshot.get("redis", {}).get("ok", False)
+            and snapshot.get("event_loop", {}).get("ok", False)
+        )
+        return {"ok": bool(ok), "started": started, "fresh": self.fresh, **snapshot}
+
+
+# Global provider circuits and health monitor (one per worker process)
+provider_circuits = ProviderCircuits()
+health_monitor = HealthMonitor()
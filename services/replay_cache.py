@@ -0,0 +1,192 @@
+"""
+♻️ Idempotent Replay Cache
+Answers retried /api/honeypot requests without re-running the graph.
+
+Requests are keyed by (sessionId, message.timestamp). The first request for
+a key generates the reply; retries within `replay_cache_ttl` get the cached
+reply back, and concurrent duplicates (same worker or another worker) wait
+for the single in-flight execution instead of starting their own.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from utils.logger import logger, log_security_event
+from utils.redis_client import redis_client
+from config import settings
+
+
+Reply = Tuple[str, int, bool]
+
+
+class ReplayCache:
+    """
+    Single-flight reply cache: in-process for this worker, Redis across workers.
+    """
+
+    # Recently generated replies kept in-process (also covers memory-only mode)
+    MAX_LOCAL_ENTRIES = 4096
+
+    def __init__(self):
+        """Initialize the cache."""
+        self._inflight: Dict[Tuple[str, int], "asyncio.Task[Reply]"] = {}
+        self._local: "OrderedDict[Tuple[str, int], Tuple[float, Reply]]" = OrderedDict()
+
+    async def run(
+        self,
+        session_id: str,
+        message_timestamp: int,
+        compute: Callable[[], Awaitable[Reply]],
+    ) -> Reply:
+        """
+        Return the reply for a message, generating it at most once.
+
+        Args:
+            session_id: Session identifier
+            message_timestamp: Epoch milliseconds of the incoming message
+            compute: Generates the reply when it is not cached
+
+        Returns:
+            (response, turn_number, is_complete) tuple
+        """
+        ttl = settings.replay_cache_ttl
+        if ttl <= 0:
+            return await compute()
+
+        key = (session_id, message_timestamp)
+
+        cached = self._get_local(key)
+        if cached is not None:
+            self._log_replay(session_id, message_timestamp)
+            return cached
+
+        task = self._inflight.get(key)
+        if task is not None:
+            log_security_event(
+                logger,
+                "SYSTEM",
+                "Duplicate request joined in-flight execution",
+                session_id=session_id,
+                timestamp=message_timestamp,
+            )
+            return await asyncio.shield(task)
+
+        # Registered before the first await so local duplicates always join it
+        task = asyncio.create_task(self._execute(key, compute))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        return await asyncio.shield(task)
+
+    async def _execute(
+        self,
+        key: Tuple[str, int],
+        compute: Callable[[], Awaitable[Reply]],
+    ) -> Reply:
+        """
+        Generate the reply once across workers and cache it.
+
+        Args:
+            key: (session_id, message_timestamp)
+            compute: Generates the reply
+
+        Returns:
+            (response, turn_number, is_complete) tuple
+        """
+        session_id, message_timestamp = key
+        ttl = settings.replay_cache_ttl
+
+        cached = await asyncio.to_thread(redis_client.get_reply, session_id, message_timestamp)
+        if cached is not None:
+            reply = tuple(cached)
+            self._put_local(key, reply)
+            self._log_replay(session_id, message_timestamp)
+            return reply
+
+        claimed = await asyncio.to_thread(redis_client.claim_reply, session_id, message_timestamp, ttl)
+        if not claimed:
+            reply = await self._wait_for_peer(session_id, message_timestamp)
+            if reply is not None:
+                return reply
+
+        try:
+            reply = tuple(await compute())
+        except BaseException:
+            # Let the next retry generate the reply again
+            await asyncio.to_thread(redis_client.drop_reply, session_id, message_timestamp)
+            raise
+
+        self._put_local(key, reply)
+        await asyncio.to_thread(redis_client.store_reply, session_id, message_timestamp, list(reply), ttl)
+        return reply
+
+    async def _wait_for_peer(self, session_id: str, message_timestamp: int) -> Optional[Reply]:
+        """
+        Wait for another worker that is generating the same reply.
+
+        Args:
+            session_id: Session identifier
+            message_timestamp: Epoch milliseconds of the incoming message
+
+        Returns:
+            The peer's reply, or None if this worker should generate it
+            (the peer gave up or did not finish in time)
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.session_lease_wait_timeout
+        ttl = settings.replay_cache_ttl
+
+        log_security_event(
+            logger,
+            "SYSTEM",
+            "Duplicate request waiting for another worker",
+            session_id=session_id,
+            timestamp=message_timestamp,
+        )
+
+        while loop.time() < deadline:
+            await asyncio.sleep(0.05)
+            cached = await asyncio.to_thread(redis_client.get_reply, session_id, message_timestamp)
+            if cached is not None:
+                return tuple(cached)
+            # Claim dropped after a failure: take over
+            if await asyncio.to_thread(redis_client.claim_reply, session_id, message_timestamp, ttl):
+                return None
+
+        logger.warning(f"⚠️ Timed out waiting for duplicate of {session_id}, generating locally")
+        return None
+
+    @staticmethod
+    def _log_replay(session_id: str, message_timestamp: int) -> None:
+        """Log a request answered from the cache."""
+        log_security_event(
+            logger,
+            "SYSTEM",
+            "Retried request answered from replay cache",
+            session_id=session_id,
+            timestamp=message_timestamp,
+        )
+
+    def _get_local(self, key: Tuple[str, int]) -> Optional[Reply]:
+        """Look up a reply generated by this worker."""
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, reply = entry
+        if expires_at < time.monotonic():
+            del self._local[key]
+            return None
+        return reply
+
+    def _put_local(self, key: Tuple[str, int], reply: Reply) -> None:
+        """Remember a generated reply, evicting the oldest beyond the cap."""
+        self._local[key] = (time.monotonic() + settings.replay_cache_ttl, reply)
+        self._local.move_to_end(key)
+        while len(self._local) > self.MAX_LOCAL_ENTRIES:
+            self._local.popitem(last=False)
+
+
+# Global replay cache instance
+replay_cache = ReplayCache()
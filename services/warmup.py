@@ -0,0 +1,170 @@
+"""
+🔥 Startup Warm-Up
+Primes lazily initialized libraries and provider connections before the
+worker reports ready, so the first real request runs at steady-state speed.
+
+Steps (each timed, none fatal):
+    extraction   regexes and phonenumbers region metadata
+    forensics    tldextract public suffix list, TRAI header checks
+    llm          TLS connection to the primary LLM provider
+
+Synthetic inputs come from the Mock Scammer templates, with a small built-in
+set when the test helpers are not installed.
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List
+
+from utils.logger import logger, log_security_event
+from config import settings
+
+
+# Used when tests/mock_scammer.py (or faker) is not available
+FALLBACK_SAMPLES = [
+    "URGENT: Your SBI account will be blocked in 24 hours. Update KYC: http://sbi-kyc-update.xyz/verify",
+    "Congratulations! You won ₹50000 in lottery. Send ₹500 processing fee to winner2024@paytm",
+    "Alert! Unauthorized transaction of ₹9999 detected. Call +91 98765 43210 or 080-2345-6789 now",
+    "Badhaai ho! Aapko inaam mila hai. Account 123456789012 IFSC SBIN0001234 mein transfer karein",
+    "Urgent hiring! Send resume to hr.jobs@gmail.com. Registration fee ₹500 to jobs@ybl",
+]
+
+# Deterministic values for the Mock Scammer template placeholders
+TEMPLATE_VALUES = {
+    "url": "http://secure-bank-verify.tk/login",
+    "bank": "HDFC",
+    "amount": "25000",
+    "otp": "482913",
+    "phone": "+91 98765 43210",
+    "company": "KBC",
+    "upi": "claim.prize@okaxis",
+    "email": "support.kyc@gmail.com",
+}
+
+
+def sample_messages() -> List[str]:
+    """
+    Synthetic scam messages covering every template category.
+
+    Returns:
+        List of message texts
+    """
+    try:
+        from tests.mock_scammer import MockScammer
+    except ImportError:
+        return list(FALLBACK_SAMPLES)
+
+    return [
+        message.format(**TEMPLATE_VALUES)
+        for template in MockScammer.SCAM_TEMPLATES
+        for message in template["messages"]
+    ] + FALLBACK_SAMPLES
+
+
+class WarmUp:
+    """
+    Runs the warm-up steps once per worker and records how long each took.
+    """
+
+    def __init__(self):
+        """Initialize as not done."""
+        self.done = False
+        self.duration_ms = None
+        self.steps: Dict[str, Dict[str, Any]] = {}
+
+    async def run(self) -> None:
+        """Run all steps in worker threads, bounded by the warm-up timeout."""
+        started = time.perf_counter()
+
+        if settings.warmup_enabled:
+            messages = sample_messages()
+            steps: List[tuple[str, Callable[[], Any]]] = [
+                ("extraction", lambda: self._prime_extraction(messages)),
+                ("forensics", lambda: self._prime_forensics(messages)),
+            ]
+            if settings.warmup_llm_connections:
+                steps.append(("llm", self._prime_llm_connections))
+
+            deadline = started + settings.warmup_timeout_s
+            for name, step in steps:
+                await self._run_step(name, step, max(deadline - time.perf_counter(), 0.1))
+
+        self.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        self.done = True
+        log_security_event(
+            logger,
+            "SYSTEM",
+            "🔥 Warm-up complete",
+            duration_ms=self.duration_ms,
+            **{f"{name}_ms": step.get("ms") for name, step in self.steps.items()},
+        )
+
+    async def _run_step(self, name: str, step: Callable[[], Any], timeout: float) -> None:
+        """Run one step in a thread and record its outcome."""
+        started = time.perf_counter()
+        try:
+            detail = await asyncio.wait_for(asyncio.to_thread(step), timeout)
+            self.steps[name] = {"ok": True, "detail": detail}
+        except Exception as e:
+            logger.warning(f"⚠️ Warm-up step '{name}' failed: {type(e).__name__}: {str(e)[:100]}")
+            self.steps[name] = {"ok": False, "detail": f"{type(e).__name__}: {str(e)[:100]}"}
+        self.steps[name]["ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    @staticmethod
+    def _prime_extraction(messages: List[str]) -> str:
+        """Compile regexes and load phonenumbers metadata."""
+        from utils.extraction import IntelligenceExtractor
+
+        found = 0
+        for message in messages:
+            result = IntelligenceExtractor.extract_all(message)
+            found += sum(len(v) for v in result.values() if isinstance(v, list))
+        return f"{len(messages)} messages, {found} artifacts"
+
+    @staticmethod
+    def _prime_forensics(messages: List[str]) -> str:
+        """Load the tldextract suffix list and run the header checks."""
+        from utils.extraction import IntelligenceExtractor
+        from utils.forensics import ForensicsAnalyzer
+
+        domains = set()
+        for message in messages:
+            for url in IntelligenceExtractor.extract_urls(message):
+                domain = ForensicsAnalyzer.extract_domain_from_url(url)
+                if domain:
+                    domains.add(domain)
+        for sender in ("VM-HDFCBK", "9876543210", "AB-123456", "scammer"):
+            ForensicsAnalyzer.validate_trai_header(sender)
+        return f"{len(domains)} domains"
+
+    @staticmethod
+    def _prime_llm_connections() -> str:
+        """Open the connection pool of the primary (and eager fallback) providers."""
+        from graph import honeypot_graph
+
+        actor = honeypot_graph.actor
+        opened = []
+
+        if actor.groq_client:
+            actor.groq_client.models.list(timeout=5)
+            opened.append("groq")
+
+        # Fallback clients only exist yet when they are created eagerly
+        if not settings.lazy_llm_fallbacks and actor.openai_client:
+            actor.openai_client.models.list(timeout=5)
+            opened.append("openai")
+
+        return ", ".join(opened) or "no providers configured"
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Warm-up status for health reporting.
+
+        Returns:
+            Done flag, total duration and per-step results
+        """
+        return {"done": self.done, "duration_ms": self.duration_ms, "steps": self.steps}
+
+
+# Global warm-up stage (one per worker process)
+warmup = WarmUp()
@@ -0,0 +1,17 @@
+"""
+🛡️ Shared Test Fixtures
+"""
+
+import pytest
+
+from graph import HoneyPotGraph
+
+
+@pytest.fixture
+def offline_graph() -> HoneyPotGraph:
+    """Graph with all remote LLMs disabled (smart fallbacks only)."""
+    graph = HoneyPotGraph()
+    graph.actor.groq_client = None
+    graph.actor.openai_client = None
+    graph.actor.gemini_model = None
+    return graph
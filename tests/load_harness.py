@@ -0,0 +1,288 @@
+"""
+🏋️ Load-Test Harness
+Drives /api/honeypot with many concurrent multi-turn MockScammer sessions.
+
+Sessions arrive as a Poisson process (--rate new sessions per second). Each
+one plays a MockScammer conversation of --turns turns (a number or a
+"min-max" range), waits an exponentially distributed think time (--think-ms
+mean) between turns and sends the accumulated conversationHistory the way
+the GUVI platform does.
+
+By default the app runs in-process (httpx ASGITransport + lifespan) with
+the LLM providers replaced by tests/stub_llm.py stubs (--llm-* options) and
+GUVI callbacks discarded. --url targets an already running server instead.
+
+Usage:
+    python tests/load_harness.py --sessions 2000 --rate 200 --turns 3-8 --think-ms 500
+    python tests/load_harness.py --url http://localhost:8000 --api-key KEY --sessions 100
+
+Reports p50/p95/p99 latency, throughput, error rates and latency by turn
+number (how it grows as sessions get longer). --json writes the report;
+--max-error-rate turns the run into a pass/fail check.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+import httpx
+
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from tests.mock_scammer import MockScammer  # noqa: E402
+from tests.stub_llm import ReplayBook, StubBehavior, install_stubs  # noqa: E402
+
+
+def parse_turns(value: str) -> Tuple[int, int]:
+    """Parse "5" or "3-8" into an inclusive range."""
+    low, _, high = value.partition("-")
+    return int(low), int(high or low)
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of a sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class LoadTest:
+    """
+    Open-loop load generator and result collector.
+    """
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.turns = parse_turns(args.turns)
+        # (turn number, latency seconds, status code or exception name)
+        self.results: List[Tuple[int, float, str]] = []
+        self.active = 0
+        self.peak_active = 0
+
+    async def run_session(self, client: httpx.AsyncClient, index: int) -> None:
+        """Play one multi-turn conversation."""
+        session_id = f"load-{self.args.seed}-{index}"
+        conversation = MockScammer.generate_conversation(random.randint(*self.turns))
+        history: List[Dict[str, Any]] = []
+        headers = {"X-API-Key": self.args.api_key}
+
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        try:
+            for turn, scam in enumerate(conversation, start=1):
+                message = {
+                    "sender": "scammer",
+                    "text": scam["message"],
+                    "timestamp": int(time.time() * 1000),
+                }
+                body = {"sessionId": session_id, "message": message, "conversationHistory": history}
+
+                started = time.perf_counter()
+                try:
+                    response = await client.post("/api/honeypot", json=body, headers=headers)
+                    outcome = str(response.status_code)
+                except Exception as e:
+                    response = None
+                    outcome = type(e).__name__
+                self.results.append((turn, time.perf_counter() - started, outcome))
+
+                if response is None or response.status_code != 200:
+                    return
+
+                reply = response.json().get("reply", "")
+                history = history + [
+                    message,
+                    {"sender": "user", "text": reply, "timestamp": int(time.time() * 1000)},
+                ]
+
+                if turn < len(conversation) and self.args.think_ms > 0:
+                    await asyncio.sleep(random.expovariate(1000 / self.args.think_ms))
+        finally:
+            self.active -= 1
+
+    async def run(self, client: httpx.AsyncClient) -> float:
+        """
+        Start sessions at the configured arrival rate and wait for all.
+
+        Returns:
+            Wall-clock duration in seconds
+        """
+        started = time.perf_counter()
+        tasks = []
+        for index in range(self.args.sessions):
+            tasks.append(asyncio.create_task(self.run_session(client, index)))
+            if self.args.rate > 0:
+                await asyncio.sleep(random.expovariate(self.args.rate))
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - started
+
+    def report(self, duration: float) -> Dict[str, Any]:
+        """
+        Summarize the collected results.
+
+        Args:
+            duration: Wall-clock duration of the run
+
+        Returns:
+            Report dictionary
+        """
+        outcomes = Counter(outcome for _, _, outcome in self.results)
+        ok = sorted(latency for _, latency, outcome in self.results if outcome == "200")
+        total = len(self.results)
+
+        by_turn: Dict[int, List[float]] = defaultdict(list)
+        for turn, latency, outcome in self.results:
+            if outcome == "200":
+                by_turn[turn].append(latency)
+
+        turns = []
+        for turn in sorted(by_turn):
+            latencies = sorted(by_turn[turn])
+            turns.append({
+                "turn": turn,
+                "requests": len(latencies),
+                "p50_ms": round(percentile(latencies, 0.5) * 1000, 1),
+                "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+            })
+
+        growth = None
+        if len(turns) > 1 and turns[0]["p50_ms"] > 0:
+            growth = round(turns[-1]["p50_ms"] / turns[0]["p50_ms"], 2)
+
+        return {
+            "config": {
+                "sessions": self.args.sessions,
+                "rate": self.args.rate,
+                "turns": self.args.turns,
+                "think_ms": self.args.think_ms,
+                "llm_latency_ms": None if self.args.url else self.args.llm_latency_ms,
+                "target": self.args.url or "in-process",
+            },
+            "duration_s": round(duration, 2),
+            "requests": total,
+            "throughput_rps": round(total / duration, 1) if duration else 0.0,
+            "peak_concurrent_sessions": self.peak_active,
+            "error_rate": round(1 - outcomes.get("200", 0) / total, 4) if total else 0.0,
+            "outcomes": dict(outcomes),
+            "latency_ms": {
+                "p50": round(percentile(ok, 0.5) * 1000, 1),
+                "p95": round(percentile(ok, 0.95) * 1000, 1),
+                "p99": round(percentile(ok, 0.99) * 1000, 1),
+                "mean": round(statistics.fmean(ok) * 1000, 1) if ok else 0.0,
+                "max": round(ok[-1] * 1000, 1) if ok else 0.0,
+            },
+            "per_turn": turns,
+            "last_to_first_turn_p50": growth,
+        }
+
+
+@asynccontextmanager
+async def in_process_client(args: argparse.Namespace) -> AsyncIterator[httpx.AsyncClient]:
+    """Start the app in this process with stubbed LLMs and callbacks."""
+    os.environ.setdefault("ENABLE_DOMAIN_AGE_CHECK", "false")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    import main
+    from config import settings
+    from graph import honeypot_graph
+    from services.callback import callback_service
+
+    args.api_key = args.api_key or settings.api_key
+
+    async def discard_callback(payload, session_id):
+        return True, None
+
+    async with main.app.router.lifespan_context(main.app):
+        replay = ReplayBook.load(args.llm_replay) if args.llm_replay else None
+        install_stubs(
+            honeypot_graph.actor,
+            groq=StubBehavior(
+                median_ms=args.llm_latency_ms,
+                error_rate=args.llm_error_rate,
+                rate_limit_rate=args.llm_429_rate,
+                hang_rate=args.llm_hang_rate,
+                replay=replay,
+                seed=args.seed,
+            ),
+            openai=StubBehavior(median_ms=args.llm_latency_ms, replay=replay, seed=args.seed + 1),
+        )
+        callback_service.send_callback = discard_callback
+
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=60) as client:
+            yield client
+
+
+@asynccontextmanager
+async def remote_client(args: argparse.Namespace) -> AsyncIterator[httpx.AsyncClient]:
+    """Client for an already running server."""
+    limits = httpx.Limits(max_connections=args.max_connections)
+    async with httpx.AsyncClient(base_url=args.url, timeout=60, limits=limits) as client:
+        yield client
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Human-readable summary."""
+    latency = report["latency_ms"]
+    print(f"\n{report['requests']} requests in {report['duration_s']} s "
+          f"({report['throughput_rps']} req/s), peak {report['peak_concurrent_sessions']} concurrent sessions")
+    print(f"error rate {report['error_rate']:.2%}  outcomes {report['outcomes']}")
+    print(f"latency ms  p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}  max {latency['max']}")
+    print("\nturn  requests   p50 ms   p95 ms")
+    for row in report["per_turn"]:
+        print(f"{row['turn']:>4} {row['requests']:>9} {row['p50_ms']:>8} {row['p95_ms']:>8}")
+    if report["last_to_first_turn_p50"] is not None:
+        print(f"\nlast/first turn p50: {report['last_to_first_turn_p50']}x")
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    random.seed(args.seed)
+    client_factory = remote_client if args.url else in_process_client
+    async with client_factory(args) as client:
+        load = LoadTest(args)
+        duration = await load.run(client)
+    return load.report(duration)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Concurrent multi-turn load test for /api/honeypot")
+    parser.add_argument("--sessions", type=int, default=500, help="total sessions to run")
+    parser.add_argument("--rate", type=float, default=100.0, help="new sessions per second (0 = all at once)")
+    parser.add_argument("--turns", default="3-8", help="turns per session: N or MIN-MAX")
+    parser.add_argument("--think-ms", type=float, default=500.0, help="mean think time between turns")
+    parser.add_argument("--llm-latency-ms", type=float, default=400.0, help="median stub LLM latency (in-process)")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="stub Groq 5xx rate (falls back to OpenAI)")
+    parser.add_argument("--llm-429-rate", type=float, default=0.0, help="stub Groq 429 rate")
+    parser.add_argument("--llm-hang-rate", type=float, default=0.0, help="stub Groq hang rate (runs into the timeout)")
+    parser.add_argument("--llm-replay", help="serve recorded responses (tests/stub_llm.py recordings)")
+    parser.add_argument("--url", help="target a running server instead of the in-process app")
+    parser.add_argument("--api-key", default=os.environ.get("API_KEY"), help="X-API-Key (defaults to API_KEY)")
+    parser.add_argument("--max-connections", type=int, default=1000, help="HTTP connection limit (--url)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed (also prefixes session ids)")
+    parser.add_argument("--json", type=Path, help="write the report to this file")
+    parser.add_argument("--max-error-rate", type=float, help="exit 1 if the error rate is higher")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+    if args.max_error_rate is not None and report["error_rate"] > args.max_error_rate:
+        print(f"\n❌ Error rate {report['error_rate']:.2%} exceeds {args.max_error_rate:.2%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
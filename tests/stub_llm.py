@@ -0,0 +1,595 @@
+"""
+🤖 Stub LLM Providers
+Offline stand-ins for Groq, OpenAI and Gemini with configurable latency
+and failure behavior, for benchmarks and regression tests of the Actor's
+fallback chain, timeouts and retries.
+
+In-process adapters (same call shapes the Actor uses):
+    StubChatClient    client.chat.completions.create(..., stream=False|True)
+                      client.models.list()                (Groq / OpenAI)
+    StubGeminiModel   model.generate_content(..., stream=False|True)
+
+    install_stubs(actor, groq=StubBehavior(median_ms=300, rate_limit_rate=0.1))
+
+Every call draws a latency from the configured distribution and may fail
+with an error, a 429 or a hang (sleeps until the caller's timeout).
+Streaming emits the reply word by word at `tokens_per_s`.
+
+Record / replay:
+    record_actor(actor, "recordings.jsonl")    # wrap the real clients
+    StubBehavior(replay=ReplayBook.load("recordings.jsonl"), latency="recorded")
+
+HTTP server (for running the real app and SDKs against it):
+    python tests/stub_llm.py --port 8900 --median-ms 400 --rate-limit-rate 0.05
+    GROQ_BASE_URL=http://localhost:8900 OPENAI_BASE_URL=http://localhost:8900/v1 uvicorn main:app
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Literal, Optional, Tuple
+
+
+Distribution = Literal["fixed", "uniform", "lognormal", "exponential", "recorded"]
+Outcome = Literal["success", "error", "rate_limited", "hang"]
+
+DEFAULT_REPLIES = [
+    "Which account sir? I have two accounts, please tell me properly.",
+    "Arre, I am not understanding. What is OTP? Please explain slowly.",
+    "Ok ok, where should I send the money? Give me your UPI ID again.",
+    "My son handles all this. Can you give me your phone number?",
+    "Wait, my phone is showing some message. Is this the same bank?",
+]
+
+
+# ===================================
+# Errors (classified by ActorAgent._llm_outcome like the real SDK errors)
+# ===================================
+
+class StubAPIError(Exception):
+    """Provider returned a 5xx."""
+
+
+class StubRateLimitError(StubAPIError):
+    """Provider returned a 429."""
+
+
+class StubTimeoutError(StubAPIError):
+    """Call exceeded the caller's timeout."""
+
+
+# ===================================
+# Record / Replay
+# ===================================
+
+def request_key(provider: str, payload: Any) -> str:
+    """Stable key of a request (messages or prompt) for replay lookups."""
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(f"{provider}:{blob}".encode()).hexdigest()[:16]
+
+
+class ReplayBook:
+    """
+    Recorded provider responses, looked up by request key.
+
+    Unknown requests get the provider's recordings in order, so a replay
+    still exercises realistic reply texts and latencies.
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        self.by_key: Dict[str, Dict[str, Any]] = {}
+        self.by_provider: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in entries:
+            self.by_key[entry["key"]] = entry
+            self.by_provider.setdefault(entry["provider"], []).append(entry)
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> "ReplayBook":
+        """Load a JSONL file written by a recorder."""
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+        return cls([json.loads(line) for line in lines if line.strip()])
+
+    def lookup(self, provider: str, key: str) -> Optional[Dict[str, Any]]:
+        """Recorded entry for this request, or the provider's next one."""
+        if key in self.by_key:
+            return self.by_key[key]
+        entries = self.by_provider.get(provider)
+        if not entries:
+            return None
+        with self._lock:
+            index = self._cursor.get(provider, 0)
+            self._cursor[provider] = index + 1
+        return entries[index % len(entries)]
+
+
+class _Recorder:
+    """Appends real provider responses to a JSONL file."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def write(self, provider: str, key: str, text: str, latency_ms: float) -> None:
+        entry = {"provider": provider, "key": key, "text": text, "latency_ms": round(latency_ms, 1)}
+        with self._lock, self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+class _RecordingStream:
+    """
+    Passes a real stream through and records the text read from it when it
+    ends or is closed (latency = time to the first chunk, as the stubs use).
+    """
+
+    def __init__(self, stream: Any, text_of: Any, record: Any, started: float):
+        self._stream = stream
+        self._chunks = iter(stream)
+        self._text_of = text_of
+        self._record = record
+        self._started = started
+        self._first_ms: Optional[float] = None
+        self._parts: List[str] = []
+        self._recorded = False
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self) -> Any:
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._finish()
+            raise
+        if self._first_ms is None:
+            self._first_ms = (time.perf_counter() - self._started) * 1000
+        self._parts.append(self._text_of(chunk) or "")
+        return chunk
+
+    def close(self) -> None:
+        from agents.actor import close_stream
+
+        close_stream(self._stream)
+        self._finish()
+
+    def _finish(self) -> None:
+        if not self._recorded:
+            self._recorded = True
+            self._record("".join(self._parts), self._first_ms or 0.0)
+
+
+class RecordingChatClient:
+    """Wraps a real Groq/OpenAI client and records every completion."""
+
+    def __init__(self, client: Any, provider: str, recorder: _Recorder):
+        self._client = client
+        self._provider = provider
+        self._recorder = recorder
+        self.models = client.models
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs) -> Any:
+        started = time.perf_counter()
+        response = self._client.chat.completions.create(**kwargs)
+        key = request_key(self._provider, kwargs.get("messages"))
+        if kwargs.get("stream"):
+            return _RecordingStream(
+                response,
+                lambda chunk: chunk.choices[0].delta.content if chunk.choices else "",
+                lambda text, latency_ms: self._recorder.write(self._provider, key, text, latency_ms),
+                started,
+            )
+        self._recorder.write(
+            self._provider,
+            key,
+            response.choices[0].message.content,
+            (time.perf_counter() - started) * 1000,
+        )
+        return response
+
+
+class RecordingGeminiModel:
+    """Wraps a real Gemini model and records every completion."""
+
+    def __init__(self, model: Any, recorder: _Recorder):
+        self._model = model
+        self._recorder = recorder
+
+    def generate_content(self, prompt: Any, **kwargs) -> Any:
+        started = time.perf_counter()
+        response = self._model.generate_content(prompt, **kwargs)
+        key = request_key("gemini", prompt)
+        if kwargs.get("stream"):
+            return _RecordingStream(
+                response,
+                lambda chunk: chunk.text,
+                lambda text, latency_ms: self._recorder.write("gemini", key, text, latency_ms),
+                started,
+            )
+        self._recorder.write("gemini", key, response.text, (time.perf_counter() - started) * 1000)
+        return response
+
+
+def record_actor(actor: Any, path: str) -> None:
+    """
+    Record the real responses of every configured provider of an Actor.
+
+    Args:
+        actor: ActorAgent with live clients
+        path: JSONL file to append to
+    """
+    recorder = _Recorder(path)
+    if actor.groq_client:
+        actor.groq_client = RecordingChatClient(actor.groq_client, "groq", recorder)
+    if actor.openai_client:
+        actor.openai_client = RecordingChatClient(actor.openai_client, "openai", recorder)
+    if actor.gemini_model:
+        actor.gemini_model = RecordingGeminiModel(actor.gemini_model, recorder)
+
+
+# ===================================
+# Behavior
+# ===================================
+
+@dataclass
+class StubBehavior:
+    """
+    How a stub provider responds.
+
+    Latency is drawn per call: "fixed" (median_ms), "uniform" (0.5x-1.5x),
+    "lognormal" (median_ms, sigma), "exponential" (mean median_ms) or
+    "recorded" (latency stored with the replayed response).
+    """
+
+    median_ms: float = 300.0
+    latency: Distribution = "lognormal"
+    sigma: float = 0.5
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    hang_rate: float = 0.0
+    hang_s: float = 30.0
+    tokens_per_s: float = 50.0
+    replies: List[str] = field(default_factory=lambda: list(DEFAULT_REPLIES))
+    replay: Optional[ReplayBook] = None
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        self._random = random.Random(self.seed)
+        self._lock = threading.Lock()
+        self.calls: Dict[str, int] = {"success": 0, "error": 0, "rate_limited": 0, "hang": 0}
+
+    def plan(self, provider: str, payload: Any) -> Tuple[Outcome, float, str]:
+        """
+        Decide the outcome of one call.
+
+        Args:
+            provider: Provider name (replay lookups)
+            payload: Messages or prompt (replay lookups)
+
+        Returns:
+            (outcome, delay in seconds, reply text)
+        """
+        with self._lock:
+            roll = self._random.random()
+            scale = self._random.lognormvariate(0, self.sigma)
+            uniform = self._random.uniform(0.5, 1.5)
+            exponential = self._random.expovariate(1.0)
+            text = self._random.choice(self.replies)
+
+        recorded = self.replay.lookup(provider, request_key(provider, payload)) if self.replay else None
+        if recorded:
+            text = recorded["text"]
+
+        delay_ms = {
+            "fixed": self.median_ms,
+            "uniform": self.median_ms * uniform,
+            "lognormal": self.median_ms * scale,
+            "exponential": self.median_ms * exponential,
+            "recorded": recorded["latency_ms"] if recorded else self.median_ms,
+        }[self.latency]
+
+        if roll < self.hang_rate:
+            outcome: Outcome = "hang"
+            delay_ms = self.hang_s * 1000
+        elif roll < self.hang_rate + self.rate_limit_rate:
+            outcome = "rate_limited"
+            delay_ms = min(delay_ms, 50.0)
+        elif roll < self.hang_rate + self.rate_limit_rate + self.error_rate:
+            outcome = "error"
+        else:
+            outcome = "success"
+
+        with self._lock:
+            self.calls[outcome] += 1
+        return outcome, delay_ms / 1000, text
+
+    @staticmethod
+    def raise_for(outcome: Outcome, provider: str) -> None:
+        """Raise the SDK-like error for a failed outcome."""
+        if outcome == "rate_limited":
+            raise StubRateLimitError(f"Error code: 429 - {provider} rate limit exceeded (stub)")
+        if outcome == "error":
+            raise StubAPIError(f"Error code: 500 - {provider} internal server error (stub)")
+
+    def tokens(self, text: str) -> List[str]:
+        """Split a reply into stream chunks (words with their spacing)."""
+        words = text.split(" ")
+        return [word + (" " if i < len(words) - 1 else "") for i, word in enumerate(words)]
+
+
+def _wait(outcome: Outcome, delay: float, timeout: Optional[float]) -> None:
+    """Sleep for the call's latency, raising like an SDK on timeout."""
+    if timeout is not None and delay >= timeout:
+        time.sleep(timeout)
+        raise StubTimeoutError("Request timed out (stub)")
+    time.sleep(delay)
+    if outcome == "hang":
+        raise StubTimeoutError("Request timed out (stub)")
+
+
+class _Stream:
+    """Iterable of stream chunks with close(), like the SDK stream objects."""
+
+    def __init__(self, chunks: Iterator[Any]):
+        self._chunks = chunks
+        self.closed = False
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self) -> Any:
+        if self.closed:
+            raise StopIteration
+        return next(self._chunks)
+
+    def close(self) -> None:
+        self.closed = True
+        self._chunks.close()
+
+
+class _GeminiStream:
+    """
+    Streaming GenerateContentResponse: no close(), only the transport
+    iterator it reads from, as in google.generativeai.
+    """
+
+    def __init__(self, chunks: Iterator[Any]):
+        self._iterator = _Stream(chunks)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._iterator)
+
+    @property
+    def closed(self) -> bool:
+        return self._iterator.closed
+
+
+# ===================================
+# In-Process Adapters
+# ===================================
+
+class StubChatClient:
+    """
+    Groq/OpenAI-shaped client: chat.completions.create and models.list.
+    """
+
+    def __init__(self, provider: str = "groq", behavior: Optional[StubBehavior] = None):
+        self.provider = provider
+        self.behavior = behavior or StubBehavior()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self.models = SimpleNamespace(list=lambda **kwargs: SimpleNamespace(data=[]))
+
+    def _create(self, messages: List[Dict[str, str]], timeout: Optional[float] = None,
+                stream: bool = False, **kwargs) -> Any:
+        outcome, delay, text = self.behavior.plan(self.provider, messages)
+        if not stream:
+            _wait(outcome, delay, timeout)
+            self.behavior.raise_for(outcome, self.provider)
+            message = SimpleNamespace(role="assistant", content=text)
+            return SimpleNamespace(
+                choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")],
+                model=kwargs.get("model"),
+            )
+        return _Stream(self._stream(outcome, delay, timeout, text))
+
+    def _stream(self, outcome: Outcome, delay: float, timeout: Optional[float], text: str) -> Iterator[Any]:
+        _wait(outcome, delay, timeout)
+        self.behavior.raise_for(outcome, self.provider)
+        for token in self.behavior.tokens(text):
+            time.sleep(1 / self.behavior.tokens_per_s)
+            delta = SimpleNamespace(content=token)
+            yield SimpleNamespace(choices=[SimpleNamespace(index=0, delta=delta, finish_reason=None)])
+        yield SimpleNamespace(choices=[SimpleNamespace(index=0, delta=SimpleNamespace(content=None), finish_reason="stop")])
+
+
+class StubGeminiModel:
+    """
+    google.generativeai GenerativeModel-shaped stub.
+    """
+
+    def __init__(self, behavior: Optional[StubBehavior] = None):
+        self.behavior = behavior or StubBehavior()
+
+    def generate_content(self, prompt: Any, request_options: Optional[Dict[str, Any]] = None,
+                         stream: bool = False, **kwargs) -> Any:
+        timeout = (request_options or {}).get("timeout")
+        outcome, delay, text = self.behavior.plan("gemini", prompt)
+        if not stream:
+            _wait(outcome, delay, timeout)
+            self.behavior.raise_for(outcome, "gemini")
+            return SimpleNamespace(text=text)
+        return _GeminiStream(self._stream(outcome, delay, timeout, text))
+
+    def _stream(self, outcome: Outcome, delay: float, timeout: Optional[float], text: str) -> Iterator[Any]:
+        _wait(outcome, delay, timeout)
+        self.behavior.raise_for(outcome, "gemini")
+        for token in self.behavior.tokens(text):
+            time.sleep(1 / self.behavior.tokens_per_s)
+            yield SimpleNamespace(text=token)
+
+
+def install_stubs(
+    actor: Any,
+    groq: Optional[StubBehavior] = None,
+    openai: Optional[StubBehavior] = None,
+    gemini: Optional[StubBehavior] = None,
+) -> None:
+    """
+    Replace an Actor's providers with stubs (None disables that provider).
+
+    Args:
+        actor: ActorAgent instance
+        groq: Behavior of the primary provider
+        openai: Behavior of the backup provider
+        gemini: Behavior of the last-resort provider
+    """
+    actor.groq_client = StubChatClient("groq", groq) if groq else None
+    actor.openai_client = StubChatClient("openai", openai) if openai else None
+    actor.gemini_model = StubGeminiModel(gemini) if gemini else None
+
+
+# ===================================
+# HTTP Server
+# ===================================
+
+def create_app(behaviors: Dict[str, StubBehavior]) -> Any:
+    """
+    FastAPI app speaking the Groq, OpenAI and Gemini REST shapes.
+
+    Args:
+        behaviors: Behavior per provider ("groq", "openai", "gemini")
+
+    Returns:
+        ASGI application
+    """
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse, StreamingResponse
+
+    app = FastAPI(title="Stub LLM")
+
+    async def plan(provider: str, payload: Any) -> Tuple[Optional[JSONResponse], str, StubBehavior]:
+        behavior = behaviors[provider]
+        outcome, delay, text = behavior.plan(provider, payload)
+        await asyncio.sleep(delay)
+        if outcome == "rate_limited":
+            body = {"error": {"message": "Rate limit exceeded (stub)", "type": "rate_limit_exceeded", "code": 429}}
+            return JSONResponse(status_code=429, content=body, headers={"retry-after": "1"}), text, behavior
+        if outcome in ("error", "hang"):
+            body = {"error": {"message": "Internal server error (stub)", "type": "server_error", "code": 500}}
+            return JSONResponse(status_code=500, content=body), text, behavior
+        return None, text, behavior
+
+    async def chat_completions(provider: str, request: Request) -> Any:
+        body = await request.json()
+        error, text, behavior = await plan(provider, body.get("messages"))
+        if error is not None:
+            return error
+
+        created = int(time.time())
+        if not body.get("stream"):
+            return {
+                "id": f"stub-{created}",
+                "object": "chat.completion",
+                "created": created,
+                "model": body.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(text.split()), "total_tokens": len(text.split())},
+            }
+
+        async def events():
+            for token in behavior.tokens(text):
+                await asyncio.sleep(1 / behavior.tokens_per_s)
+                chunk = {
+                    "id": f"stub-{created}", "object": "chat.completion.chunk", "created": created,
+                    "model": body.get("model"),
+                    "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/openai/v1/chat/completions")
+    async def groq_chat(request: Request):
+        return await chat_completions("groq", request)
+
+    @app.post("/v1/chat/completions")
+    async def openai_chat(request: Request):
+        return await chat_completions("openai", request)
+
+    @app.get("/openai/v1/models")
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": []}
+
+    @app.post("/v1beta/models/{model_action}")
+    async def gemini(model_action: str, request: Request):
+        body = await request.json()
+        prompt = [part.get("text") for content in body.get("contents", []) for part in content.get("parts", [])]
+        error, text, behavior = await plan("gemini", prompt[0] if len(prompt) == 1 else prompt)
+        if error is not None:
+            return error
+
+        def candidate(chunk: str) -> Dict[str, Any]:
+            return {"candidates": [{"content": {"role": "model", "parts": [{"text": chunk}]}, "index": 0}]}
+
+        if not model_action.endswith(":streamGenerateContent"):
+            return candidate(text)
+
+        async def events():
+            for token in behavior.tokens(text):
+                await asyncio.sleep(1 / behavior.tokens_per_s)
+                yield f"data: {json.dumps(candidate(token))}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/stats")
+    async def stats():
+        return {provider: behavior.calls for provider, behavior in behaviors.items()}
+
+    return app
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Stub Groq/OpenAI/Gemini server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--median-ms", type=float, default=300.0, help="median latency")
+    parser.add_argument("--latency", default="lognormal", choices=["fixed", "uniform", "lognormal", "exponential", "recorded"])
+    parser.add_argument("--sigma", type=float, default=0.5, help="lognormal spread")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of calls answered with 429")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="share of calls that hang for --hang-s")
+    parser.add_argument("--hang-s", type=float, default=30.0)
+    parser.add_argument("--tokens-per-s", type=float, default=50.0, help="streaming speed")
+    parser.add_argument("--replay", help="JSONL recordings to serve")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    replay = ReplayBook.load(args.replay) if args.replay else None
+    behaviors = {
+        provider: StubBehavior(
+            median_ms=args.median_ms, latency=args.latency, sigma=args.sigma,
+            error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate,
+            hang_rate=args.hang_rate, hang_s=args.hang_s, tokens_per_s=args.tokens_per_s,
+            replay=replay, seed=args.seed,
+        )
+        for provider in ("groq", "openai", "gemini")
+    }
+    uvicorn.run(create_app(behaviors), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+🛡️ Concurrency Tests
+Tests per-session ordering, coalescing, replay and admission of concurrent turns.
+"""
+
+import asyncio
+
+import pytest
+
+from config import settings
+from services.coalescer import MessageCoalescer
+from services.replay_cache import ReplayCache
+from services.admission import admission_controller, AdmissionController, AdmissionRejected
+from utils.redis_client import redis_client
+from utils.session_lock import SessionLockManager, SessionLockTimeout
+
+
+SCAM_MESSAGE = "URGENT! Your account is blocked. Verify OTP immediately or send payment"
+
+
+class TestSessionLocks:
+    """Test the per-session lock map."""
+
+    @pytest.mark.asyncio
+    async def test_different_sessions_run_in_parallel(self):
+        """Holding one session must not block another."""
+        locks = SessionLockManager()
+
+        async with locks.hold("lock-a"):
+            await asyncio.wait_for(self._enter(locks, "lock-b"), timeout=1)
+
+        assert locks.active_sessions == 0
+
+    @pytest.mark.asyncio
+    async def test_same_session_is_serialized(self):
+        """Turns of one session run one at a time, in order."""
+        locks = SessionLockManager()
+        order = []
+
+        async def turn(i: int):
+            async with locks.hold("lock-c"):
+                order.append(f"in-{i}")
+                await asyncio.sleep(0.01)
+                order.append(f"out-{i}")
+
+        await asyncio.gather(*(turn(i) for i in range(3)))
+
+        assert order == ["in-0", "out-0", "in-1", "out-1", "in-2", "out-2"]
+
+    @pytest.mark.asyncio
+    async def test_busy_session_gets_stall_reply(self, monkeypatch):
+        """A session held by another worker is answered in persona, not with a 500."""
+        import main
+        from models.schemas import IncomingMessage
+
+        async def busy(*args, **kwargs):
+            raise SessionLockTimeout("Session lock-d is busy on another worker")
+
+        monkeypatch.setattr(main.replay_cache, "run", busy)
+        request = IncomingMessage(
+            sessionId="lock-d",
+            message={"sender": "scammer", "text": SCAM_MESSAGE, "timestamp": 1700000000000},
+        )
+
+        response = await main.honeypot_endpoint(request, None)
+
+        assert response.status == "success"
+        assert response.reply in sum(main.honeypot_graph.actor.STALL_RESPONSES.values(), [])
+
+    @staticmethod
+    async def _enter(locks: SessionLockManager, session_id: str):
+        async with locks.hold(session_id):
+            pass
+
+
+class TestConcurrentTurns:
+    """Test that concurrent turns of one session lose no data."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_messages_keep_every_turn(self, offline_graph):
+        """Simultaneous messages for one session all land in the saved state."""
+        session_id = "concurrency-test-1"
+        redis_client.delete_state(session_id)
+
+        results = await asyncio.gather(*(
+            offline_graph.process_message(session_id, "scammer", f"{SCAM_MESSAGE} #{i}")
+            for i in range(4)
+        ))
+
+        assert sorted(turn for _, turn, _ in results) == [1, 2, 3, 4]
+
+        state = redis_client.load_state(session_id)
+        scammer_messages = [m["content"] for m in state["messages"] if m["role"] == "scammer"]
+        assert scammer_messages == [f"{SCAM_MESSAGE} #{i}" for i in range(4)]
+        assert len(state["forensic_ledger"]) == 4
+
+        redis_client.delete_state(session_id)
+
+
+class TestMessageCoalescing:
+    """Test the per-session coalescing window."""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_answered_as_one_turn(self, offline_graph, monkeypatch):
+        """A burst inside the window runs once and every request gets the same reply."""
+        monkeypatch.setattr(settings, "coalesce_window_ms", 50)
+        coalescer = MessageCoalescer(offline_graph.process_message)
+        session_id = "coalesce-test-1"
+        redis_client.delete_state(session_id)
+
+        burst = [f"{SCAM_MESSAGE} part {i}" for i in range(3)]
+        results = await asyncio.gather(*(
+            coalescer.submit(session_id, "scammer", text) for text in burst
+        ))
+
+        assert len(set(results)) == 1
+        assert results[0][1] == 1
+
+        state = redis_client.load_state(session_id)
+        scammer_messages = [m["content"] for m in state["messages"] if m["role"] == "scammer"]
+        assert scammer_messages == burst
+        assert [entry["message_preview"] for entry in state["forensic_ledger"]] == burst
+
+        redis_client.delete_state(session_id)
+
+
+class TestReplayCache:
+    """Test idempotent handling of retried requests."""
+
+    @pytest.mark.asyncio
+    async def test_duplicates_run_once(self):
+        """Concurrent duplicates and later retries share one execution."""
+        cache = ReplayCache()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "Who is this?", len(calls), False
+
+        concurrent = await asyncio.gather(*(
+            cache.run("replay-test-1", 1700000000000, compute) for _ in range(3)
+        ))
+        retried = await cache.run("replay-test-1", 1700000000000, compute)
+        other = await cache.run("replay-test-1", 1700000000001, compute)
+
+        assert concurrent == [("Who is this?", 1, False)] * 3
+        assert retried == ("Who is this?", 1, False)
+        assert other == ("Who is this?", 2, False)
+        assert len(calls) == 2
+
+
+class TestAdmissionControl:
+    """Test per-worker admission control and load shedding."""
+
+    @pytest.mark.asyncio
+    async def test_sheds_when_queue_full_or_slo_exceeded(self, monkeypatch):
+        """One slot, one queue place: the third request is shed at once, the second after the SLO."""
+        monkeypatch.setattr(settings, "admission_max_concurrency", 1)
+        monkeypatch.setattr(settings, "admission_max_queue", 1)
+        monkeypatch.setattr(settings, "admission_queue_timeout_ms", 50)
+        controller = AdmissionController()
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.admit():
+                await release.wait()
+
+        async def attempt():
+            try:
+                async with controller.admit():
+                    return "admitted"
+            except AdmissionRejected as e:
+                return e.reason
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(attempt())
+        await asyncio.sleep(0)
+
+        assert await attempt() == "queue_full"
+        assert await queued == "queue_timeout"
+
+        release.set()
+        await holder
+        assert await attempt() == "admitted"
+
+        stats = controller.stats()
+        assert stats["shed_queue_full"] == 1
+        assert stats["shed_timeout"] == 1
+        assert stats["active"] == 0 and stats["queue_depth"] == 0
+
+    @pytest.mark.asyncio
+    async def test_session_lock_wait_is_not_admission_wait(self, offline_graph, monkeypatch):
+        """Turns queued behind their own session hold no slot, so a one-slot worker sheds none of them."""
+        monkeypatch.setattr(settings, "admission_max_concurrency", 1)
+        monkeypatch.setattr(settings, "admission_max_queue", 0)
+        session_id = "admission-test-1"
+        redis_client.delete_state(session_id)
+        shed_before = admission_controller.shed_queue_full
+
+        results = await asyncio.gather(*(
+            offline_graph.process_message(session_id, "scammer", f"{SCAM_MESSAGE} #{i}")
+            for i in range(3)
+        ))
+
+        assert sorted(turn for _, turn, _ in results) == [1, 2, 3]
+        assert admission_controller.shed_queue_full == shed_before
+        assert admission_controller.active == 0
+
+        redis_client.delete_state(session_id)
+
+    @pytest.mark.asyncio
+    async def test_slot_handed_over_as_wait_times_out(self, monkeypatch):
+        """A waiter that receives the slot in the same tick as its timeout is admitted, not leaked."""
+        monkeypatch.setattr(settings, "admission_max_concurrency", 1)
+        controller = AdmissionController()
+        release = asyncio.Event()
+
+        async def racing_wait_for(waiter, timeout):
+            await asyncio.wait({waiter})
+            raise asyncio.TimeoutError
+
+        async def hold():
+            async with controller.admit():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        monkeypatch.setattr(asyncio, "wait_for", racing_wait_for)
+
+        async def attempt():
+            async with controller.admit():
+                return "admitted"
+
+        queued = asyncio.create_task(attempt())
+        await asyncio.sleep(0)
+        release.set()
+        await holder
+
+        assert await queued == "admitted"
+        stats = controller.stats()
+        assert stats["shed_timeout"] == 0
+        assert stats["active"] == 0 and stats["queue_depth"] == 0
@@ -0,0 +1,871 @@
+"""
+🛡️ Performance Control Tests
+Tests the latency-driven degradation ladder, metrics, tracing, the
+slow-request flight recorder, log sampling, on-demand profiling, lazy
+resource initialization, the startup warm-up, health probes, the
+event-loop monitor, the offline LLM stubs, traffic recording, the graph
+executors and the Redis checkpointer.
+"""
+
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from config import settings
+from services.degradation import DegradationController, DegradationLevel
+from services.health import HealthMonitor, ProviderCircuits
+from services.warmup import WarmUp, sample_messages
+from utils.forensics import ForensicsAnalyzer
+from utils.metrics import NODE_LATENCY, render_metrics
+from utils import tracing
+from utils.flight_recorder import FlightRecorder, note, note_node
+from utils.logger import _EventGate, logger
+from utils.loop_monitor import LoopMonitor
+from utils.profiling import MemoryProfiler, ProfilerBusy, RequestProfiler
+from utils.resources import ResourceRegistry
+from utils.traffic_recorder import TrafficRecorder
+from tests.stub_llm import ReplayBook, StubBehavior, StubChatClient, install_stubs, record_actor
+
+
+class TestDegradationLadder:
+    """Test adaptive degradation driven by node latency SLOs."""
+
+    @pytest.fixture(autouse=True)
+    def fast_ladder(self, monkeypatch):
+        """No cooldown and a single 100ms SLO on 'engage'."""
+        monkeypatch.setattr(settings, "degradation_enabled", True)
+        monkeypatch.setattr(settings, "degradation_cooldown_s", 0)
+        monkeypatch.setattr(settings, "degradation_slo_ms", {"engage": 100})
+
+    def test_climbs_one_level_at_a_time_and_recovers(self):
+        """Slow samples raise the level step by step; fast samples bring it back."""
+        controller = DegradationController()
+
+        for _ in range(DegradationController.MIN_SAMPLES):
+            controller.record("engage", 50)
+        assert controller.level == DegradationLevel.NORMAL
+
+        for _ in range(200):
+            controller.record("engage", 500)
+        assert controller.level == DegradationLevel.FALLBACK_ONLY
+        assert controller.degraded(DegradationLevel.SKIP_WHOIS)
+
+        for _ in range(1000):
+            controller.record("engage", 10)
+        assert controller.level == DegradationLevel.NORMAL
+
+    def test_unknown_nodes_do_not_degrade(self):
+        """Nodes without an SLO are tracked but never move the level."""
+        controller = DegradationController()
+
+        for _ in range(100):
+            controller.record("callback", 10_000)
+
+        assert controller.level == DegradationLevel.NORMAL
+        assert controller.stats()["p95_ms"]["callback"] == 10_000
+
+    def test_concurrent_recording_from_worker_threads(self):
+        """Sync nodes record from several threads at once without corrupting the window."""
+        controller = DegradationController()
+
+        def hammer():
+            for i in range(2000):
+                controller.record("engage", 500 if i % 2 else 10)
+                controller.stats()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for future in [pool.submit(hammer) for _ in range(8)]:
+                future.result()
+
+        assert controller.p95("engage") == 500
+        assert controller.level > DegradationLevel.NORMAL
+
+
+class TestMetrics:
+    """Test latency metrics and the WHOIS cache."""
+
+    def test_whois_lookups_are_cached(self, monkeypatch):
+        """Repeated domains hit WHOIS once."""
+        calls = []
+
+        def fake_lookup(domain):
+            calls.append(domain)
+            return 3, "⚠️ Very new domain (< 30 days)"
+
+        monkeypatch.setattr(ForensicsAnalyzer, "_lookup_domain_age", staticmethod(fake_lookup))
+        monkeypatch.setattr(ForensicsAnalyzer, "_whois_cache", type(ForensicsAnalyzer._whois_cache)())
+
+        for _ in range(3):
+            assert ForensicsAnalyzer.check_domain_age("sbi-kyc.xyz")[0] == 3
+
+        assert calls == ["sbi-kyc.xyz"]
+
+    def test_whois_cache_is_locked_but_lookups_are_not(self, monkeypatch):
+        """Profiler threads share the cache under a lock; slow WHOIS calls run outside it."""
+        lock = ForensicsAnalyzer._whois_lock
+        cache_type = type(ForensicsAnalyzer._whois_cache)
+
+        class GuardedCache(cache_type):
+            def get(self, *args):
+                assert lock.locked()
+                return super().get(*args)
+
+            def move_to_end(self, *args, **kwargs):
+                assert lock.locked()
+                return super().move_to_end(*args, **kwargs)
+
+            def popitem(self, *args, **kwargs):
+                assert lock.locked()
+                return super().popitem(*args, **kwargs)
+
+        def lookup(domain):
+            assert not lock.locked()
+            return 400, "✓ Established domain"
+
+        monkeypatch.setattr(ForensicsAnalyzer, "_lookup_domain_age", staticmethod(lookup))
+        monkeypatch.setattr(ForensicsAnalyzer, "_whois_cache", GuardedCache())
+        monkeypatch.setattr(ForensicsAnalyzer, "WHOIS_CACHE_MAX", 2)
+
+        for domain in ("a.in", "b.in", "a.in", "c.in", "a.in"):
+            assert ForensicsAnalyzer.check_domain_age(domain)[0] == 400
+        assert list(ForensicsAnalyzer._whois_cache) == ["c.in", "a.in"]
+
+    def test_whois_errors_expire_quickly(self, monkeypatch):
+        """A failed lookup is retried once the short error TTL has passed."""
+        calls = []
+        clock = [1000.0]
+
+        def failing_lookup(domain):
+            calls.append(domain)
+            return None, f"{ForensicsAnalyzer.WHOIS_ERROR}: timed out"
+
+        monkeypatch.setattr(ForensicsAnalyzer, "_lookup_domain_age", staticmethod(failing_lookup))
+        monkeypatch.setattr(ForensicsAnalyzer, "_whois_cache", type(ForensicsAnalyzer._whois_cache)())
+        monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+
+        ForensicsAnalyzer.check_domain_age("sbi-kyc.xyz")
+        ForensicsAnalyzer.check_domain_age("sbi-kyc.xyz")
+        clock[0] += ForensicsAnalyzer.WHOIS_ERROR_TTL + 1
+        ForensicsAnalyzer.check_domain_age("sbi-kyc.xyz")
+
+        assert calls == ["sbi-kyc.xyz", "sbi-kyc.xyz"]
+
+    def test_node_latency_is_exposed(self):
+        """Observed node latencies appear in the scrape output."""
+        NODE_LATENCY.labels("detect").observe(0.02)
+
+        body, content_type = render_metrics()
+
+        assert content_type.startswith("text/plain")
+        assert b'honeypot_node_duration_seconds_bucket{le="0.025",node="detect"}' in body
+
+
+class TestTracing:
+    """Test span nesting and the no-op mode."""
+
+    @pytest.fixture
+    def exporter(self, monkeypatch):
+        """Route spans to memory for the duration of a test."""
+        sdk = pytest.importorskip("opentelemetry.sdk.trace")
+        from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+        memory = InMemorySpanExporter()
+        provider = sdk.TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(memory))
+        monkeypatch.setattr(tracing, "_tracer", provider.get_tracer("test"))
+        return memory
+
+    def test_spans_are_noops_when_disabled(self, monkeypatch):
+        """Without setup_tracing() nothing is recorded."""
+        monkeypatch.setattr(tracing, "_tracer", None)
+
+        with tracing.span("node.detect") as current:
+            assert current is None
+        assert tracing.current_trace_id() is None
+
+    def test_child_spans_share_the_request_trace(self, exporter):
+        """Nested and after-the-fact spans hang off the root span."""
+        with tracing.span("honeypot.request", session_id="abc") as root:
+            with tracing.span("node.engage"):
+                tracing.record_span("llm.groq", time.perf_counter(), TimeoutError("slow"))
+
+        spans = {s.name: s for s in exporter.get_finished_spans()}
+        trace_id = root.get_span_context().trace_id
+
+        assert set(spans) == {"honeypot.request", "node.engage", "llm.groq"}
+        assert all(s.context.trace_id == trace_id for s in spans.values())
+        assert spans["llm.groq"].parent.span_id == spans["node.engage"].context.span_id
+        assert not spans["llm.groq"].status.is_ok
+
+
+class TestFlightRecorder:
+    """Test the bounded slowest-requests recorder."""
+
+    def test_keeps_only_the_slowest(self, monkeypatch):
+        """Fast requests are dropped once the recorder is full."""
+        monkeypatch.setattr(settings, "flight_recorder_size", 2)
+        recorder = FlightRecorder()
+        clock = iter([0.0, 0.5, 0.0, 0.1, 0.0, 0.9])
+        monkeypatch.setattr("utils.flight_recorder.time.perf_counter", lambda: next(clock))
+
+        for session_id in ("slow", "fast", "slowest"):
+            with recorder.capture(session_id, message_length=10):
+                note_node("engage", 1.0)
+                note(degradation_level="NORMAL")
+
+        dumped = recorder.dump()
+        assert [e["session_id"] for e in dumped] == ["slowest", "slow"]
+        assert dumped[0]["duration_ms"] == 900.0
+        assert dumped[0]["nodes"] == [{"node": "engage", "ms": 1.0}]
+        assert dumped[0]["degradation_level"] == "NORMAL"
+
+    def test_disabled_recorder_captures_nothing(self, monkeypatch):
+        """Size 0 turns capture into a no-op."""
+        monkeypatch.setattr(settings, "flight_recorder_size", 0)
+        recorder = FlightRecorder()
+
+        with recorder.capture("abc", message_length=10) as record:
+            note_node("engage", 1.0)
+
+        assert record is None
+        assert recorder.dump() == []
+
+
+class TestLogSampling:
+    """Test per-event-type sampling and rate limiting."""
+
+    def test_sampled_out_types_are_dropped(self, monkeypatch):
+        """A 0.0 sample rate drops only that event type."""
+        monkeypatch.setattr(settings, "log_sample_rates", {"ACTOR": 0.0})
+        gate = _EventGate()
+
+        assert not gate.allow("ACTOR", logger)
+        assert gate.allow("SYSTEM", logger)
+
+    def test_rate_limit_caps_events_per_second(self, monkeypatch):
+        """Events past the per-second limit are suppressed."""
+        monkeypatch.setattr(settings, "log_rate_limits", {"SYSTEM": 3})
+        monkeypatch.setattr(time, "monotonic", lambda: 100.0)
+        gate = _EventGate()
+
+        allowed = [gate.allow("SYSTEM", logger) for _ in range(10)]
+
+        assert allowed.count(True) == 3
+
+
+class TestProfiling:
+    """Test the on-demand CPU and memory profilers."""
+
+    def test_cprofile_covers_exactly_the_armed_requests(self):
+        """The profile finishes after N requests and returns pstats text."""
+        profiler = RequestProfiler()
+        profiler.arm("cprofile", requests=2, interval_ms=5)
+
+        with pytest.raises(ProfilerBusy):
+            profiler.arm("sampling", requests=1, interval_ms=5)
+
+        for _ in range(2):
+            assert profiler.report() is None
+            with profiler.track():
+                sorted(range(1000), reverse=True)
+
+        assert profiler.session is None
+        assert "function calls" in profiler.report()
+
+        # Not armed any more: tracking is a no-op
+        with profiler.track():
+            pass
+        assert profiler.status()["status"] == "done"
+
+    def test_memory_diff_reports_growth(self):
+        """Allocations made after a snapshot show up in the diff."""
+        profiler = MemoryProfiler()
+        try:
+            snapshot_id = profiler.snapshot()["snapshot_id"]
+            retained = [bytearray(4096) for _ in range(100)]
+
+            diff = profiler.diff(snapshot_id, limit=5)
+
+            assert diff["total_growth_bytes"] >= 4096 * 100
+            assert any("test_performance.py" in entry["site"] for entry in diff["top"])
+            assert retained
+        finally:
+            profiler.stop()
+
+
+class TestLazyResources:
+    """Test lazy, fork-aware singletons."""
+
+    class Client:
+        instances = 0
+
+        def __init__(self):
+            TestLazyResources.Client.instances += 1
+            self.serial = TestLazyResources.Client.instances
+
+    @pytest.mark.asyncio
+    async def test_built_on_warm_and_rebuilt_after_fork(self, monkeypatch):
+        """Nothing is built at registration; a new PID gets a new instance."""
+        registry = ResourceRegistry()
+        TestLazyResources.Client.instances = 0
+        client = registry.register("client", TestLazyResources.Client)
+
+        assert TestLazyResources.Client.instances == 0
+        assert not registry.ready
+
+        assert await registry.warm()
+        assert registry.ready
+        assert client.serial == 1
+
+        client.serial = 42
+        assert client.serial == 42
+
+        monkeypatch.setattr("os.getpid", lambda: -1)
+        assert not registry.ready
+        assert client.serial == 2
+
+
+class TestWarmUp:
+    """Test the startup warm-up stage."""
+
+    def test_samples_fill_every_template(self):
+        """Template placeholders are all substituted."""
+        messages = sample_messages()
+
+        assert len(messages) > 10
+        assert not any("{" in message for message in messages)
+
+    @pytest.mark.asyncio
+    async def test_offline_warm_up_completes(self, monkeypatch):
+        """Without LLM connections every step succeeds and the stage is done."""
+        monkeypatch.setattr(settings, "warmup_llm_connections", False)
+        stage = WarmUp()
+
+        await stage.run()
+
+        assert stage.done
+        assert set(stage.steps) == {"extraction", "forensics"}
+        assert all(step["ok"] for step in stage.steps.values())
+
+
+class TestHealthMonitor:
+    """Test cached health checks and provider circuits."""
+
+    def test_circuit_opens_and_half_opens(self, monkeypatch):
+        """Consecutive failures open the circuit; a success closes it."""
+        circuits = ProviderCircuits()
+        now = [1000.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+
+        for _ in range(settings.circuit_failure_threshold):
+            circuits.record("groq", ok=False)
+        assert circuits.state("groq") == "open"
+
+        now[0] += settings.circuit_cooldown_s + 1
+        assert circuits.state("groq") == "half_open"
+
+        circuits.record("groq", ok=True)
+        assert circuits.summary()["groq"]["state"] == "closed"
+
+    @pytest.mark.asyncio
+    async def test_readiness_needs_fresh_checks(self, monkeypatch):
+        """Probes read the cached snapshot and go stale without refreshes."""
+        monitor = HealthMonitor()
+        assert not monitor.readiness(started=True)["ok"]
+        assert monitor.liveness()["ok"]
+
+        await monitor.check()
+        assert monitor.readiness(started=True)["ok"]
+        assert not monitor.readiness(started=False)["ok"]
+
+        checked_at = monitor.checked_at
+        monkeypatch.setattr(time, "monotonic", lambda: checked_at + 10 * settings.health_check_interval_s)
+        assert not monitor.liveness()["ok"]
+        assert not monitor.readiness(started=True)["ok"]
+
+
+class TestLoopMonitor:
+    """Test event-loop lag sampling and blocking-call detection."""
+
+    @staticmethod
+    def block_the_loop(seconds):
+        time.sleep(seconds)
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_site_recorded(self, monkeypatch):
+        """A sync sleep on the loop shows up as lag and as a call site."""
+        monkeypatch.setattr(settings, "debug", True)
+        monkeypatch.setattr(settings, "loop_monitor_interval_ms", 10)
+        monkeypatch.setattr(settings, "loop_block_threshold_ms", 50)
+        monitor = LoopMonitor()
+
+        monitor.start()
+        try:
+            await asyncio.sleep(0.05)
+            self.block_the_loop(0.3)
+            await asyncio.sleep(0.05)
+        finally:
+            await monitor.stop()
+
+        report = monitor.report()
+        assert report["lag_ms"]["max"] >= 200
+        sites = [block["site"] for block in report["blocking_sites"]]
+        assert any("test_performance.py" in site and "block_the_loop" in site for site in sites)
+        assert report["blocking_sites"][0]["max_ms"] >= 150
+
+    def test_block_sites_past_the_cap_share_one_series(self, monkeypatch):
+        """The metric's label set is capped like the report."""
+        monitor = LoopMonitor()
+        monkeypatch.setattr(LoopMonitor, "MAX_SITES", 1)
+        frame = sys._getframe()
+
+        monitor._record_block("capped-site-a.py:1 in a", frame)
+        monitor._record_block("capped-site-b.py:2 in b", frame)
+
+        assert [block["site"] for block in monitor.report()["blocking_sites"]] == ["capped-site-a.py:1 in a"]
+        body, _ = render_metrics()
+        assert b"capped-site-a.py" in body
+        assert b"capped-site-b.py" not in body
+        assert b'honeypot_event_loop_blocks_total{site="other"}' in body
+
+
+class TestStubLLM:
+    """Test the offline provider stubs against the Actor's fallback chain."""
+
+    def test_rate_limited_primary_falls_back(self):
+        """A 429 from Groq is classified and OpenAI answers instead."""
+        from agents.actor import ActorAgent
+
+        actor = ActorAgent()
+        groq = StubBehavior(median_ms=1, rate_limit_rate=1.0, seed=1)
+        openai = StubBehavior(median_ms=1, replies=["Which bank are you calling from?"], seed=1)
+        install_stubs(actor, groq=groq, openai=openai)
+
+        result = actor.generate_response({
+            "session_id": "stub-fallback",
+            "turn_number": 1,
+            "persona_used": "confused_senior",
+            "current_message": "Your bank account is locked",
+            "messages": [],
+        })
+
+        assert groq.calls["rate_limited"] == 1
+        assert openai.calls["success"] == 1
+        assert "Which bank" in result["actor_response"]
+
+    def test_hang_times_out_and_stream_closes(self):
+        """Hangs end at the caller's timeout; streams emit the whole reply."""
+        from agents.actor import ActorAgent
+
+        hanging = StubChatClient("groq", StubBehavior(hang_rate=1.0, hang_s=5))
+        started = time.perf_counter()
+        with pytest.raises(Exception) as error:
+            hanging.chat.completions.create(messages=[], timeout=0.05)
+        assert time.perf_counter() - started < 1
+        assert ActorAgent._llm_outcome(error.value) == "timeout"
+
+        streaming = StubChatClient("openai", StubBehavior(median_ms=1, tokens_per_s=1000, replies=["one two three"]))
+        stream = streaming.chat.completions.create(messages=[], stream=True)
+        text = "".join(chunk.choices[0].delta.content or "" for chunk in stream)
+        stream.close()
+        assert text == "one two three"
+        assert stream.closed
+
+    def test_record_and_replay(self, tmp_path):
+        """Recorded responses are served again for the same request."""
+        path = tmp_path / "recordings.jsonl"
+        messages = [{"role": "user", "content": "Send OTP now"}]
+
+        live = SimpleNamespace(
+            groq_client=StubChatClient("groq", StubBehavior(median_ms=1, replies=["What is OTP beta?"])),
+            openai_client=None,
+            gemini_model=None,
+        )
+        record_actor(live, str(path))
+        live.groq_client.chat.completions.create(messages=messages)
+
+        replayed = StubChatClient("groq", StubBehavior(replay=ReplayBook.load(str(path)), latency="recorded"))
+        response = replayed.chat.completions.create(messages=messages)
+        assert response.choices[0].message.content == "What is OTP beta?"
+
+
+class TestTrafficRecorder:
+    """Test recording requests for offline replay."""
+
+    def test_requests_written_per_worker(self, monkeypatch, tmp_path):
+        """Recorded requests land in a per-PID JSONL file."""
+        monkeypatch.setattr(settings, "traffic_record_path", str(tmp_path / "traffic.jsonl"))
+        recorder = TrafficRecorder()
+
+        request = {"sessionId": "s1", "message": {"sender": "scammer", "text": "Pay now", "timestamp": 1}}
+        recorder.record(request)
+        recorder.record(request)
+        recorder.close()
+
+        (path,) = tmp_path.glob("traffic.*.jsonl")
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["request"] for line in lines] == [request, request]
+
+
+class TestDirectExecutor:
+    """Differential test: the direct executor matches the compiled LangGraph."""
+
+    CONVERSATION = [
+        "URGENT! Your SBI account is blocked. Verify KYC at http://sbi-kyc.xyz now",
+        "Send Rs 10 to verify@ybl and share the OTP, or call 9876543210",
+        "Sir, transfer to account 123456789012 IFSC SBIN0001234 immediately",
+    ]
+
+    @pytest.mark.asyncio
+    async def test_same_outputs_as_langgraph(self, monkeypatch):
+        """Replies, turn numbers and saved state are identical under both executors."""
+        import random
+
+        from graph import DirectExecutor, HoneyPotGraph
+        from services.callback import callback_service
+        from utils.redis_client import redis_client
+
+        async def accept_callback(payload, session_id):
+            return True, None
+
+        # The last turn takes the callback branch
+        monkeypatch.setattr(settings, "max_conversation_turns", len(self.CONVERSATION))
+        monkeypatch.setattr(callback_service, "send_callback", accept_callback)
+
+        runs = {}
+        for executor in ("langgraph", "direct"):
+            monkeypatch.setattr(settings, "graph_executor", executor)
+            graph = HoneyPotGraph()
+            assert isinstance(graph.graph, DirectExecutor) == (executor == "direct")
+            install_stubs(graph.actor, groq=StubBehavior(median_ms=1, seed=7))
+
+            random.seed(7)
+            session_id = f"executor-diff-{executor}"
+            redis_client.delete_state(session_id)
+            replies = [await graph.process_message(session_id, "+919812345678", text) for text in self.CONVERSATION]
+            # A benign opener is routed to END after detection
+            replies.append(await graph.process_message(f"{session_id}-benign", "friend", "Hi, lunch at 1?"))
+            assert replies[len(self.CONVERSATION) - 1][2], "callback branch not taken"
+
+            state = redis_client.load_state(session_id)
+            redis_client.delete_state(session_id)
+            redis_client.delete_state(f"{session_id}-benign")
+            runs[executor] = (replies, self._comparable(state))
+
+        assert runs["direct"] == runs["langgraph"]
+
+    @classmethod
+    def _comparable(cls, value):
+        """Drop timings and session ids, which differ between runs."""
+        if isinstance(value, dict):
+            return {
+                key: cls._comparable(item) for key, item in value.items()
+                if "time" not in key and "duration" not in key and key not in ("session_id", "_saved_at", "fencing_token")
+            }
+        if isinstance(value, list):
+            return [cls._comparable(item) for item in value]
+        return value
+
+
+class TestRedisCheckpointer:
+    """Test the Redis checkpoint saver against the manual Redis save path."""
+
+    @pytest.fixture
+    def fake_redis(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        return fakeredis.FakeRedis(decode_responses=True)
+
+    @pytest.mark.asyncio
+    async def test_resumes_with_one_read_and_writes_only_changes(self, monkeypatch, fake_redis):
+        """Checkpointed turns match the manual save path, with small incremental writes."""
+        import random
+
+        from graph import HoneyPotGraph
+        from utils.checkpointer import RedisCheckpointSaver
+        from utils.redis_client import redis_client
+
+        saver = RedisCheckpointSaver(fake_redis)
+        reads, puts = [], []
+        hgetall, put_checkpoint = fake_redis.hgetall, saver._put_checkpoint
+
+        def counted_hgetall(key):
+            reads.append(key)
+            return hgetall(key)
+
+        def recorded_put(keys, args):
+            puts.append(args)
+            return put_checkpoint(keys=keys, args=args)
+
+        monkeypatch.setattr(fake_redis, "hgetall", counted_hgetall)
+        monkeypatch.setattr(saver, "_put_checkpoint", recorded_put)
+        monkeypatch.setattr(HoneyPotGraph, "_build_checkpointer", lambda self: saver)
+        monkeypatch.setattr(settings, "graph_executor", "langgraph")
+        monkeypatch.setattr(settings, "checkpoint_history", 3)
+
+        runs = {}
+        for checkpointed in (False, True):
+            monkeypatch.setattr(settings, "graph_checkpointer", checkpointed)
+            graph = HoneyPotGraph()
+            install_stubs(graph.actor, groq=StubBehavior(median_ms=1, seed=7))
+
+            random.seed(7)
+            session_id = f"checkpoint-diff-{checkpointed}"
+            replies = []
+            for text in TestDirectExecutor.CONVERSATION:
+                reads.clear()
+                replies.append(await graph.process_message(session_id, "+919812345678", text))
+            last_turn_reads = list(reads)
+            runs[checkpointed] = (replies, TestDirectExecutor._comparable(await graph.load_session(session_id)))
+            redis_client.delete_state(session_id)
+
+        assert runs[True] == runs[False]
+        assert [turn for _, turn, _ in runs[True][0]] == [1, 2, 3]
+
+        # The last turn resumed with a single read of the session hash
+        assert last_turn_reads == ["honeypot:ckpt:checkpoint-diff-True"]
+
+        # Each step of a resumed turn writes only the channels it changed
+        state_size = len(runs[True][1])
+        written = [set(args[5::2]) for args in puts[-6:]]
+        assert all(len(fields) < state_size / 2 for fields in written)
+        assert sum("c:messages" in fields for fields in written) == 2  # start and engage
+
+        # TTL and compaction
+        head, history = "honeypot:ckpt:checkpoint-diff-True", "honeypot:ckpt:checkpoint-diff-True:history"
+        assert 0 < fake_redis.ttl(head) <= settings.redis_ttl
+        assert fake_redis.llen(history) == 3
+        assert not [field for field in fake_redis.hkeys(head) if field.startswith("w:")]
+
+        await graph.delete_session(session_id)
+        assert not fake_redis.exists(head, history)
+
+    @pytest.mark.asyncio
+    async def test_platform_history_is_never_stored(self, monkeypatch, fake_redis):
+        """conversationHistory rebuilds a new session but never lands in a checkpoint."""
+        from graph import HoneyPotGraph
+        from utils.checkpointer import RedisCheckpointSaver
+
+        saver = RedisCheckpointSaver(fake_redis)
+        stored = []
+        put_checkpoint = saver._put_checkpoint
+
+        def recorded_put(keys, args):
+            stored.extend(json.loads(value) for field, value in zip(args[5::2], args[6::2]) if field == "c:conversation_history")
+            return put_checkpoint(keys=keys, args=args)
+
+        monkeypatch.setattr(saver, "_put_checkpoint", recorded_put)
+        monkeypatch.setattr(HoneyPotGraph, "_build_checkpointer", lambda self: saver)
+        monkeypatch.setattr(settings, "graph_executor", "langgraph")
+        monkeypatch.setattr(settings, "graph_checkpointer", True)
+        graph = HoneyPotGraph()
+        install_stubs(graph.actor, groq=StubBehavior(median_ms=1, seed=7))
+
+        history = [
+            {"sender": "scammer", "text": TestDirectExecutor.CONVERSATION[0], "timestamp": 1700000000000},
+            {"sender": "user", "text": "Which account?", "timestamp": 1700000060000},
+        ]
+        _, turn, _ = await graph.process_message("transient", "+919812345678", TestDirectExecutor.CONVERSATION[1], history)
+
+        assert turn == 2
+        assert stored and all(kind == "empty" for _, kind, _ in stored)
+        await graph.delete_session("transient")
+
+    def test_redis_errors_fail_the_write(self, monkeypatch, fake_redis):
+        """A checkpoint that could not be stored raises instead of passing as saved."""
+        from langgraph.checkpoint.base import empty_checkpoint
+        from redis.exceptions import ConnectionError
+
+        from utils.checkpointer import RedisCheckpointSaver
+
+        saver = RedisCheckpointSaver(fake_redis)
+
+        def unavailable(keys, args):
+            raise ConnectionError("Redis down")
+
+        monkeypatch.setattr(saver, "_put_checkpoint", unavailable)
+
+        with pytest.raises(ConnectionError):
+            saver.put({"configurable": {"thread_id": "down"}}, empty_checkpoint(), {}, {})
+
+    def test_stale_fencing_token_is_rejected(self, fake_redis):
+        """A writer whose lease was superseded cannot overwrite the session."""
+        from langgraph.checkpoint.base import empty_checkpoint
+
+        from utils.checkpointer import RedisCheckpointSaver
+
+        saver = RedisCheckpointSaver(fake_redis)
+        fake_redis.set("honeypot:fence:fenced", 5)
+
+        def put(token: int, value: str):
+            checkpoint = empty_checkpoint()
+            checkpoint["channel_values"] = {"current_message": value}
+            checkpoint["channel_versions"] = {"current_message": token}
+            config = {"configurable": {"thread_id": "fenced", "fencing_token": token}}
+            saver.put(config, checkpoint, {}, {"current_message": token})
+
+        put(5, "current holder")
+        put(4, "expired holder")
+
+        stored = saver.get_tuple({"configurable": {"thread_id": "fenced"}})
+        assert stored.checkpoint["channel_values"] == {"current_message": "current holder"}
+
+
+class TestSpeculativeActor:
+    """Test the Actor running concurrently with the Profiler."""
+
+    @pytest.fixture
+    def slow_profiler(self):
+        """Wrap a graph's Profiler so it takes 200 ms, optionally overriding its verdict."""
+        def wrap(graph, verdict=None):
+            assess = graph.profiler.assess
+
+            def slow_assess(state):
+                time.sleep(0.2)
+                return {**assess(state), **(verdict or {})}
+
+            graph.profiler.assess = slow_assess
+        return wrap
+
+    @pytest.mark.asyncio
+    async def test_turn_costs_max_of_profile_and_generate(self, monkeypatch, slow_profiler):
+        """Same replies as the sequential graph, without paying for both latencies."""
+        from graph import HoneyPotGraph
+
+        runs = {}
+        for speculative in (False, True):
+            monkeypatch.setattr(settings, "speculative_actor", speculative)
+            graph = HoneyPotGraph()
+            install_stubs(graph.actor, groq=StubBehavior(median_ms=200, latency="fixed", tokens_per_s=1000, seed=7))
+            slow_profiler(graph)
+
+            started = time.perf_counter()
+            reply = await graph.process_message(f"speculative-{speculative}", "+919812345678", TestDirectExecutor.CONVERSATION[0])
+            runs[speculative] = (reply, time.perf_counter() - started)
+
+        assert runs[True][0] == runs[False][0]
+        assert runs[False][1] >= 0.4
+        assert runs[True][1] < 0.35
+
+    @pytest.mark.asyncio
+    async def test_generation_cancelled_when_not_engaged(self, monkeypatch, slow_profiler):
+        """A message that is not engaged gets no LLM reply and no further provider attempts."""
+        from graph import HoneyPotGraph
+
+        monkeypatch.setattr(settings, "speculative_actor", True)
+        graph = HoneyPotGraph()
+        groq = StubBehavior(median_ms=300, latency="fixed", error_rate=1.0)
+        backup = StubBehavior(median_ms=1, latency="fixed")
+        install_stubs(graph.actor, groq=groq, openai=backup)
+        slow_profiler(graph, verdict={"scam_probability": 0.0, "should_continue": False})
+
+        reply, _, _ = await graph.process_message("speculative-benign", "friend", "Hi, lunch at 1?")
+        assert reply not in backup.replies
+
+        # The in-flight primary call finishes in the background; nothing runs after it
+        await asyncio.gather(*graph._abandoned, return_exceptions=True)
+        assert groq.calls["error"] == 1
+        assert sum(backup.calls.values()) == 0
+        assert not graph._speculations
+
+    @pytest.mark.asyncio
+    async def test_speculation_dropped_when_turn_is_cancelled(self, monkeypatch, slow_profiler):
+        """A turn cancelled while ENGAGE waits leaves no speculation behind and stops further attempts."""
+        from graph import HoneyPotGraph
+
+        monkeypatch.setattr(settings, "speculative_actor", True)
+        graph = HoneyPotGraph()
+        groq = StubBehavior(median_ms=400, latency="fixed", error_rate=1.0)
+        backup = StubBehavior(median_ms=1, latency="fixed")
+        install_stubs(graph.actor, groq=groq, openai=backup)
+        slow_profiler(graph)
+
+        turn = asyncio.create_task(graph.process_message("speculative-cancel", "+919812345678", TestDirectExecutor.CONVERSATION[0]))
+        await asyncio.sleep(0.3)
+        turn.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await turn
+
+        assert not graph._speculations
+        assert len(graph._abandoned) == 1
+        await asyncio.gather(*graph._abandoned, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert not graph._abandoned
+        assert groq.calls["error"] == 1
+        assert sum(backup.calls.values()) == 0
+
+
+class TestStreamingReplies:
+    """Test streamed Actor replies cut at the sentence limit."""
+
+    def test_trim_reply(self):
+        """Ellipses and abbreviations do not end sentences; notes are dropped."""
+        from agents.actor import trim_reply
+
+        assert trim_reply("Wait... I am looking. Okay sir! Third one.", 2) == ("Wait... I am looking. Okay sir!", True)
+        assert trim_reply("Send Rs. 500 now. Which account? More", 2) == ("Send Rs. 500 now. Which account?", True)
+        assert trim_reply("Okay. (Note: staying in character) Which UPI", 2) == ("Okay. Which UPI", False)
+        assert trim_reply("Haan beta... (note: unfinished", 2) == ("Haan beta...", False)
+        assert trim_reply("One. Two. Three.", 0) == ("One. Two. Three.", False)
+
+    @pytest.mark.parametrize("provider", ["groq", "gemini"])
+    def test_stream_closed_at_second_sentence(self, monkeypatch, provider):
+        """The Actor stops reading at the second sentence and closes the stream."""
+        from agents.actor import ActorAgent
+
+        monkeypatch.setattr(settings, "actor_streaming", True)
+        reply = "Arre beta... which account? (Note: stalling) Tell me slowly. " + "I am looking for my glasses now " * 10
+        behavior = StubBehavior(median_ms=1, latency="fixed", tokens_per_s=200, replies=[reply])
+        actor = ActorAgent()
+        install_stubs(actor, **{provider: behavior})
+
+        streams = []
+        if provider == "groq":
+            create = actor.groq_client.chat.completions.create
+            actor.groq_client.chat.completions.create = lambda **kwargs: streams.append(create(**kwargs)) or streams[-1]
+        else:
+            generate = actor.gemini_model.generate_content
+            actor.gemini_model.generate_content = lambda *args, **kwargs: streams.append(generate(*args, **kwargs)) or streams[-1]
+
+        started = time.perf_counter()
+        update = actor.respond({"session_id": "stream-test", "turn_number": 1, "current_message": "Your account is blocked"})
+        elapsed = time.perf_counter() - started
+
+        assert update["actor_response"] == "Arre beta... which account? Tell me slowly."
+        assert streams[0].closed
+        assert elapsed < len(reply.split()) / behavior.tokens_per_s / 2
+
+    def test_unstreamed_reply_is_not_cut(self, monkeypatch):
+        """With streaming off the provider's reply is used as is."""
+        from agents.actor import ActorAgent
+
+        monkeypatch.setattr(settings, "actor_streaming", False)
+        reply = "Arre beta... which account? Tell me slowly. I am looking for my glasses."
+        actor = ActorAgent()
+        install_stubs(actor, groq=StubBehavior(median_ms=1, latency="fixed", replies=[reply]))
+
+        update = actor.respond({"session_id": "no-stream-test", "turn_number": 1, "current_message": "Your account is blocked"})
+
+        assert update["actor_response"] == reply
+
+    def test_meta_commentary_only_reply_falls_through(self, monkeypatch):
+        """A streamed reply that is all "(Note: ...)" counts as a failed attempt, not an empty answer."""
+        from agents.actor import ActorAgent
+
+        monkeypatch.setattr(settings, "actor_streaming", True)
+        note = "(Note: I will stay in character as the senior.)"
+        state = {"session_id": "note-only-test", "turn_number": 1, "current_message": "Your account is blocked"}
+
+        actor = ActorAgent()
+        backup = StubBehavior(median_ms=1, latency="fixed", replies=["Which account beta?"])
+        install_stubs(actor, groq=StubBehavior(median_ms=1, latency="fixed", replies=[note]), openai=backup)
+        assert actor.respond(state)["actor_response"] == "Which account beta?"
+
+        actor = ActorAgent()
+        install_stubs(actor, groq=StubBehavior(median_ms=1, latency="fixed", replies=[note]))
+        assert actor.respond(state)["actor_response"].strip()
@@ -7,12 +7,13 @@ import pytest
 import asyncio
 from datetime import datetime
 
-from models.state import HoneyPotState
+from models.state import HoneyPotState, apply_update, with_update
 from agents.profiler import ProfilerAgent
 from agents.actor import ActorAgent
 from agents.auditor import AuditorAgent
 from utils.extraction import IntelligenceExtractor
 from utils.forensics import ForensicsAnalyzer
+from utils.redis_client import redis_client
 
 
 class TestIntelligenceExtraction:
@@ -167,6 +168,60 @@ class TestAuditorAgent:
         assert len(result["forensic_ledger"]) > 0
 
 
+class TestStateUpdates:
+    """Test node updates and state reducers."""
+    
+    def test_reducers_merge_updates(self):
+        """Messages and ledger append; indicators are a set union."""
+        state: HoneyPotState = {
+            "turn_number": 1,
+            "messages": [{"role": "scammer", "content": "Pay now"}],
+            "extracted_upi_ids": ["a@ybl"],
+        }
+        
+        apply_update(state, {
+            "turn_number": 2,
+            "messages": [{"role": "agent", "content": "Which UPI?"}],
+            "extracted_upi_ids": ["b@ybl", "a@ybl"],
+            "forensic_ledger": [{"turn_number": 2}],
+        })
+        
+        assert state["turn_number"] == 2
+        assert [m["content"] for m in state["messages"]] == ["Pay now", "Which UPI?"]
+        assert state["extracted_upi_ids"] == ["a@ybl", "b@ybl"]
+        assert state["forensic_ledger"] == [{"turn_number": 2}]
+    
+    def test_append_is_in_place_and_with_update_copies(self):
+        """Appending reuses the history list; with_update leaves the source state alone."""
+        messages = [{"role": "scammer", "content": "Pay now"}]
+        state: HoneyPotState = {"messages": messages}
+        
+        merged = with_update(state, {"messages": [{"role": "agent", "content": "How?"}]})
+        assert len(state["messages"]) == 1 and len(merged["messages"]) == 2
+        
+        apply_update(state, {"messages": [{"role": "agent", "content": "How?"}]})
+        assert state["messages"] is messages and len(messages) == 2
+    
+    def test_auditor_returns_only_new_intelligence(self):
+        """The audit update holds this turn's findings, not the whole session."""
+        auditor = AuditorAgent()
+        
+        state: HoneyPotState = {
+            "session_id": "test-123",
+            "turn_number": 5,
+            "current_message": "Pay scammer@paytm or fraud@ybl",
+            "extracted_upi_ids": ["scammer@paytm"],
+            "forensic_ledger": [{"turn_number": n} for n in range(1, 5)],
+        }
+        
+        update = auditor.audit(state)
+        
+        assert update["extracted_upi_ids"] == ["fraud@ybl"]
+        assert len(update["forensic_ledger"]) == 1
+        assert state["extracted_upi_ids"] == ["scammer@paytm"]
+        assert len(state["forensic_ledger"]) == 4
+
+
 class TestEndToEndWorkflow:
     """Test complete workflow."""
     
@@ -212,6 +267,74 @@ class TestEndToEndWorkflow:
         assert len(state["extracted_urls"]) > 0
 
 
+class TestSessionHydration:
+    """Test rebuilding session state from conversationHistory."""
+    
+    @pytest.mark.asyncio
+    async def test_evicted_session_is_rebuilt(self, offline_graph):
+        """A session missing from Redis continues from the platform history."""
+        session_id = "hydration-test-123"
+        redis_client.delete_state(session_id)
+        
+        history = [
+            {"sender": "scammer", "text": "URGENT! Account blocked. Pay to winner2024@paytm", "timestamp": 1770000000000},
+            {"sender": "user", "text": "Arre beta, kya hua?", "timestamp": 1770000005000},
+            {"sender": "scammer", "text": "Call 9876543210 immediately to verify", "timestamp": 1770000010000},
+            {"sender": "user", "text": "Which number?", "timestamp": 1770000015000},
+        ]
+        
+        response, turn_number, _ = await offline_graph.process_message(
+            session_id=session_id,
+            sender_id="scammer",
+            message="URGENT! Verify OTP now or account blocked",
+            history=history,
+        )
+        
+        # Two scammer turns in history + this one
+        assert turn_number == 3
+        
+        state = redis_client.load_state(session_id)
+        assert [m["content"] for m in state["messages"][:4]] == [m["text"] for m in history]
+        assert "winner2024@paytm" in state["extracted_upi_ids"]
+        assert len(state["extracted_phone_numbers"]) > 0
+        assert state["forensic_ledger"][0]["hydrated"] is True
+        assert "conversation_history" not in state
+        
+        redis_client.delete_state(session_id)
+    
+    @pytest.mark.asyncio
+    async def test_stale_session_catches_up(self, offline_graph):
+        """Stored state behind the platform history keeps its ledger and gets only the missing messages."""
+        session_id = "hydration-test-456"
+        redis_client.delete_state(session_id)
+        
+        first = "URGENT! Account blocked. Pay to winner2024@paytm"
+        reply, _, _ = await offline_graph.process_message(session_id, "scammer", first)
+        stored = redis_client.load_state(session_id)
+        
+        # The second turn was answered by another worker whose save was lost
+        history = [
+            {"sender": "scammer", "text": first, "timestamp": 1770000000000},
+            {"sender": "user", "text": reply, "timestamp": 1770000005000},
+            {"sender": "scammer", "text": "Call 9876543210 immediately to verify", "timestamp": 1770000010000},
+            {"sender": "user", "text": "Which number?", "timestamp": 1770000015000},
+        ]
+        _, turn_number, _ = await offline_graph.process_message(
+            session_id, "scammer", "URGENT! Verify OTP now or account blocked", history=history
+        )
+        
+        assert turn_number == 3
+        
+        state = redis_client.load_state(session_id)
+        assert [m["content"] for m in state["messages"][:4]] == [m["text"] for m in history]
+        assert state["forensic_ledger"][0] == stored["forensic_ledger"][0]
+        assert state["forensic_ledger"][1]["hydrated"] is True
+        assert state["start_time"] == stored["start_time"]
+        assert len(state["extracted_phone_numbers"]) > 0
+        
+        redis_client.delete_state(session_id)
+
+
 if __name__ == "__main__":
     # Run tests
     pytest.main([__file__, "-v", "--tb=short"])
@@ -4,6 +4,7 @@ from utils.logger import logger, log_security_event, setup_logging
 from utils.redis_client import redis_client, RedisClient
 from utils.extraction import IntelligenceExtractor
 from utils.forensics import ForensicsAnalyzer
+from utils.session_lock import session_locks, SessionLockManager, SessionLockTimeout
 
 __all__ = [
     "logger",
@@ -13,4 +14,7 @@ __all__ = [
     "RedisClient",
     "IntelligenceExtractor",
     "ForensicsAnalyzer",
+    "session_locks",
+    "SessionLockManager",
+    "SessionLockTimeout",
 ]
@@ -0,0 +1,427 @@
+"""
+💾 Redis Checkpointer
+LangGraph checkpoint saver that keeps each session's graph state in Redis,
+keyed by session_id as the thread ID.
+
+Layout per session (both keys expire after REDIS_TTL):
+    honeypot:ckpt:{session_id}          hash
+        checkpoint                      latest checkpoint (ids, versions, metadata)
+        id                              latest checkpoint id
+        c:{channel}                     latest value of one channel, with its version
+        w:{checkpoint_id}:{task}:{idx}  pending writes of the latest checkpoint
+    honeypot:ckpt:{session_id}:history  list of older checkpoints, newest first
+
+Each step writes only the channels whose version changed, so a turn costs a
+handful of small hash fields instead of the whole state. Resuming a session
+is one HGETALL. Compaction is built in: superseded channel values are
+overwritten in place, pending writes are dropped once the next checkpoint
+lands, and the history list is trimmed to CHECKPOINT_HISTORY entries
+(without channel values).
+"""
+
+import asyncio
+import base64
+import json
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_metadata,
+)
+from redis.exceptions import RedisError
+
+from config import settings
+from models.state import TRANSIENT_FIELDS
+from utils.logger import logger
+from utils.metrics import REDIS_LATENCY
+from utils.tracing import span
+
+
+# Store a checkpoint unless a newer lease holder exists (same fencing
+# counter as RedisClient.save_state). The previous checkpoint moves to the
+# trimmed history list; pending writes of older checkpoints are dropped
+# (their effect is part of this checkpoint).
+#   KEYS: head hash, history list, fence counter
+#   ARGV: ttl, fencing token (0 = unfenced), history size, checkpoint,
+#         checkpoint id, field, value, ...
+PUT_CHECKPOINT_SCRIPT = """
+local token = tonumber(ARGV[2])
+if token > 0 and token < tonumber(redis.call('GET', KEYS[3]) or '0') then
+    return 0
+end
+local keep = tonumber(ARGV[3])
+local previous = redis.call('HGET', KEYS[1], 'checkpoint')
+if previous and keep > 0 then
+    redis.call('LPUSH', KEYS[2], previous)
+    redis.call('LTRIM', KEYS[2], 0, keep - 1)
+    redis.call('EXPIRE', KEYS[2], ARGV[1])
+end
+local own = 'w:' .. ARGV[5] .. ':'
+for _, field in ipairs(redis.call('HKEYS', KEYS[1])) do
+    if string.sub(field, 1, 2) == 'w:' and string.sub(field, 1, #own) ~= own then
+        redis.call('HDEL', KEYS[1], field)
+    end
+end
+redis.call('HSET', KEYS[1], 'checkpoint', ARGV[4], 'id', ARGV[5])
+for i = 6, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+# Store pending writes unless a newer checkpoint has already landed (LangGraph
+# saves writes and checkpoints concurrently; ids sort by creation time).
+#   KEYS: head hash
+#   ARGV: ttl, checkpoint id, field, value, ...
+PUT_WRITES_SCRIPT = """
+local head = redis.call('HGET', KEYS[1], 'id')
+if head and head > ARGV[2] then
+    return 0
+end
+for i = 3, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+
+class RedisCheckpointSaver(BaseCheckpointSaver):
+    """
+    Incremental, TTL-bound checkpoint storage for HoneyPotGraph sessions.
+    """
+
+    def __init__(self, client: Any):
+        """
+        Args:
+            client: Connected redis.Redis client (decode_responses=True)
+        """
+        super().__init__()
+        self.client = client
+        self._put_checkpoint = client.register_script(PUT_CHECKPOINT_SCRIPT)
+        self._put_writes = client.register_script(PUT_WRITES_SCRIPT)
+
+    # ===================================
+    # Keys and Encoding
+    # ===================================
+
+    @staticmethod
+    def _head_key(thread_id: str, checkpoint_ns: str = "") -> str:
+        """Redis key of the latest checkpoint hash."""
+        suffix = f":{checkpoint_ns}" if checkpoint_ns else ""
+        return f"honeypot:ckpt:{thread_id}{suffix}"
+
+    def _history_key(self, thread_id: str, checkpoint_ns: str = "") -> str:
+        """Redis key of the older checkpoints list."""
+        return f"{self._head_key(thread_id, checkpoint_ns)}:history"
+
+    @staticmethod
+    def _fence_key(thread_id: str) -> str:
+        """Redis key of the session fencing counter (see RedisClient)."""
+        return f"honeypot:fence:{thread_id}"
+
+    def _dump(self, value: Any) -> List[str]:
+        """Serialize a value to [type, base64 payload]."""
+        kind, payload = self.serde.dumps_typed(value)
+        return [kind, base64.b64encode(payload).decode("ascii")]
+
+    def _load(self, kind: str, payload: str) -> Any:
+        """Inverse of _dump."""
+        return self.serde.loads_typed((kind, base64.b64decode(payload)))
+
+    @contextmanager
+    def _op(self, op: str) -> Iterator[None]:
+        """Time and trace one Redis command."""
+        with REDIS_LATENCY.labels(op).time(), span(f"redis.{op}", **{"db.system": "redis"}):
+            yield
+
+    def _tuple(self, thread_id: str, checkpoint_ns: str, doc: Dict[str, Any], fields: Dict[str, str]) -> CheckpointTuple:
+        """
+        Build a CheckpointTuple from a stored checkpoint and the head hash.
+
+        Channel values come from the head hash, so a historical checkpoint
+        only gets the channels that have not changed since (the rest were
+        compacted away).
+        """
+        checkpoint = self._load(*doc["checkpoint"])
+
+        values = {}
+        for channel, version in checkpoint["channel_versions"].items():
+            stored = fields.get(f"c:{channel}")
+            if stored:
+                stored_version, kind, payload = json.loads(stored)
+                if stored_version == version and kind != "empty":
+                    values[channel] = self._load(kind, payload)
+
+        pending = []
+        prefix = f"w:{doc['id']}:"
+        for field, stored in fields.items():
+            if field.startswith(prefix):
+                task_id, channel, kind, payload, _ = json.loads(stored)
+                pending.append((task_id, channel, self._load(kind, payload)))
+
+        parent = doc.get("parent")
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": doc["id"]}},
+            checkpoint={**checkpoint, "channel_values": values},
+            metadata=self._load(*doc["metadata"]),
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent}}
+                if parent else None
+            ),
+            pending_writes=pending,
+        )
+
+    # ===================================
+    # BaseCheckpointSaver API
+    # ===================================
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """
+        Load the latest checkpoint, or the one named in the config.
+
+        Args:
+            config: {"configurable": {"thread_id", "checkpoint_ns"?, "checkpoint_id"?}}
+
+        Returns:
+            Checkpoint tuple, or None for an unknown session
+        """
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = configurable.get("checkpoint_id")
+
+        try:
+            with self._op("checkpoint_get"):
+                fields = self.client.hgetall(self._head_key(thread_id, checkpoint_ns))
+        except RedisError as e:
+            logger.error(f"❌ Failed to load checkpoint for {thread_id}: {e}")
+            return None
+        if not fields or "checkpoint" not in fields:
+            return None
+
+        doc = json.loads(fields["checkpoint"])
+        if checkpoint_id and checkpoint_id != doc["id"]:
+            doc = next((d for d in self._history(thread_id, checkpoint_ns) if d["id"] == checkpoint_id), None)
+            if doc is None:
+                return None
+        return self._tuple(thread_id, checkpoint_ns, doc, fields)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """
+        List a session's checkpoints, newest first.
+
+        Listing across sessions is not supported (config is required).
+        """
+        if not config:
+            return
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        before_id = before["configurable"].get("checkpoint_id") if before else None
+
+        with self._op("checkpoint_list"):
+            fields = self.client.hgetall(self._head_key(thread_id, checkpoint_ns))
+        if "checkpoint" not in fields:
+            return
+
+        docs = [json.loads(fields["checkpoint"]), *self._history(thread_id, checkpoint_ns)]
+        for doc in docs:
+            if before_id and doc["id"] >= before_id:
+                continue
+            item = self._tuple(thread_id, checkpoint_ns, doc, fields)
+            if filter and any(item.metadata.get(k) != v for k, v in filter.items()):
+                continue
+            if limit is not None:
+                if limit <= 0:
+                    return
+                limit -= 1
+            yield item
+
+    def _history(self, thread_id: str, checkpoint_ns: str) -> List[Dict[str, Any]]:
+        """Older checkpoints, newest first."""
+        with self._op("checkpoint_history"):
+            return [json.loads(doc) for doc in self.client.lrange(self._history_key(thread_id, checkpoint_ns), 0, -1)]
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """
+        Store a checkpoint with the values of the channels that changed.
+
+        Args:
+            config: Config of the parent checkpoint (may carry fencing_token)
+            checkpoint: Checkpoint to store
+            metadata: Checkpoint metadata
+            new_versions: Channels updated since the parent checkpoint
+
+        Returns:
+            Config pointing at the stored checkpoint
+
+        Raises:
+            RedisError: If the checkpoint could not be written
+        """
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        parent_id = configurable.get("checkpoint_id")
+
+        snapshot = checkpoint.copy()
+        values = snapshot.pop("channel_values")
+        doc = json.dumps({
+            "id": checkpoint["id"],
+            "parent": parent_id,
+            "checkpoint": self._dump(snapshot),
+            "metadata": self._dump(get_checkpoint_metadata(config, metadata)),
+        })
+
+        channels: List[str] = []
+        for channel, version in new_versions.items():
+            # Request-scoped fields (the platform history) are never stored
+            if channel in values and channel not in TRANSIENT_FIELDS:
+                encoded = self._dump(values[channel])
+            else:
+                encoded = ["empty", ""]
+            channels += [f"c:{channel}", json.dumps([version, *encoded])]
+
+        try:
+            with self._op("checkpoint_put"):
+                written = self._put_checkpoint(
+                    keys=[
+                        self._head_key(thread_id, checkpoint_ns),
+                        self._history_key(thread_id, checkpoint_ns),
+                        self._fence_key(thread_id),
+                    ],
+                    args=[
+                        settings.redis_ttl,
+                        configurable.get("fencing_token") or 0,
+                        settings.checkpoint_history,
+                        doc,
+                        checkpoint["id"],
+                        *channels,
+                    ],
+                )
+        except RedisError as e:
+            # Fail the turn rather than answer from state that was never saved
+            logger.error(f"❌ Failed to save checkpoint for {thread_id}: {e}")
+            raise
+        if not written:
+            logger.warning(
+                f"⚠️ Stale checkpoint rejected for {thread_id} "
+                f"(fencing token {configurable.get('fencing_token')} superseded)"
+            )
+
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint["id"]}}
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """
+        Store a task's writes against the current checkpoint.
+
+        Args:
+            config: Config of the checkpoint the task ran from
+            writes: (channel, value) pairs
+            task_id: Task identifier
+            task_path: Task path
+        """
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = configurable["checkpoint_id"]
+
+        fields: List[str] = []
+        for idx, (channel, value) in enumerate(writes):
+            fields += [
+                f"w:{checkpoint_id}:{task_id}:{WRITES_IDX_MAP.get(channel, idx)}",
+                json.dumps([task_id, channel, *self._dump(value), task_path]),
+            ]
+        if not fields:
+            return
+
+        try:
+            with self._op("checkpoint_writes"):
+                self._put_writes(
+                    keys=[self._head_key(thread_id, checkpoint_ns)],
+                    args=[settings.redis_ttl, checkpoint_id, *fields],
+                )
+        except RedisError as e:
+            logger.error(f"❌ Failed to save pending writes for {thread_id}: {e}")
+
+    def delete_thread(self, thread_id: str) -> None:
+        """
+        Delete all checkpoints of a session.
+
+        Args:
+            thread_id: Session identifier
+        """
+        try:
+            with self._op("checkpoint_delete"):
+                self.client.delete(self._head_key(thread_id), self._history_key(thread_id))
+        except RedisError as e:
+            logger.error(f"❌ Failed to delete checkpoints for {thread_id}: {e}")
+
+    # Async variants run the blocking Redis calls in a worker thread
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Async get_tuple."""
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """Async list."""
+        items = await asyncio.to_thread(lambda: [*self.list(config, filter=filter, before=before, limit=limit)])
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Async put."""
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Async put_writes."""
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Async delete_thread."""
+        await asyncio.to_thread(self.delete_thread, thread_id)
@@ -92,10 +92,14 @@ class IntelligenceExtractor:
         return list(set(filtered))
     
     @staticmethod
-    def extract_phone_numbers(text: str) -> List[str]:
+    def extract_phone_numbers(text: str, second_pass: bool = True) -> List[str]:
         """
         Extract phone numbers using phonenumbers library.
         Focuses on Indian numbers but supports international.
+        
+        Args:
+            text: Text to scan
+            second_pass: Also run the region-less pass for international numbers
         """
         phone_numbers_found: Set[str] = set()
         
@@ -108,12 +112,13 @@ class IntelligenceExtractor:
             phone_numbers_found.add(formatted)
         
         # Also try without region
-        for match in phonenumbers.PhoneNumberMatcher(text, None):
-            formatted = phonenumbers.format_number(
-                match.number,
-                phonenumbers.PhoneNumberFormat.E164
-            )
-            phone_numbers_found.add(formatted)
+        if second_pass:
+            for match in phonenumbers.PhoneNumberMatcher(text, None):
+                formatted = phonenumbers.format_number(
+                    match.number,
+                    phonenumbers.PhoneNumberFormat.E164
+                )
+                phone_numbers_found.add(formatted)
         
         return list(phone_numbers_found)
     
@@ -153,10 +158,14 @@ class IntelligenceExtractor:
         return found_keywords
     
     @staticmethod
-    def extract_all(text: str) -> Dict[str, Any]:
+    def extract_all(text: str, phone_second_pass: bool = True) -> Dict[str, Any]:
         """
         Extract all intelligence from text.
         
+        Args:
+            text: Text to scan
+            phone_second_pass: Run the region-less phone number pass
+        
         Returns:
             Dictionary with all extracted data and timestamp
         """
@@ -166,7 +175,7 @@ class IntelligenceExtractor:
             "timestamp": datetime.utcnow().isoformat(),
             "upi_ids": IntelligenceExtractor.extract_upi_ids(text),
             "bank_accounts": IntelligenceExtractor.extract_bank_accounts(text),
-            "phone_numbers": IntelligenceExtractor.extract_phone_numbers(text),
+            "phone_numbers": IntelligenceExtractor.extract_phone_numbers(text, phone_second_pass),
             "urls": urls,
             "suspicious_urls": IntelligenceExtractor.identify_suspicious_urls(urls),
             "emails": IntelligenceExtractor.extract_emails(text),
@@ -0,0 +1,170 @@
+"""
+🛩️ Slow-Request Flight Recorder
+Keeps the N slowest recent /api/honeypot requests with enough detail to
+explain them: per-node timings, LLM provider attempts, state size, message
+length and degradation level.
+
+Each request gets a small record dict in a context variable; the graph,
+Actor and Redis client append to it as they go. On completion a request
+is kept only if it beats the fastest entry already stored, so fast
+requests cost one comparison.
+"""
+
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config import settings
+
+
+_current: ContextVar[Optional[Dict[str, Any]]] = ContextVar("flight_record", default=None)
+
+
+def note(**fields: Any) -> None:
+    """
+    Attach fields to the current request's record, if one is being captured.
+
+    Args:
+        **fields: Fields to set (e.g. state_bytes, degradation_level)
+    """
+    record = _current.get()
+    if record is not None:
+        record.update(fields)
+
+
+def note_node(node: str, duration_ms: float) -> None:
+    """
+    Append a graph node timing to the current record.
+
+    Args:
+        node: Node name
+        duration_ms: Node duration in milliseconds
+    """
+    record = _current.get()
+    if record is not None:
+        record["nodes"].append((node, duration_ms))
+
+
+def note_llm(provider: str, outcome: str, duration_ms: float) -> None:
+    """
+    Append an LLM provider attempt to the current record.
+
+    Args:
+        provider: "groq", "openai" or "gemini"
+        outcome: "success", "rate_limited", "timeout" or "error"
+        duration_ms: Attempt duration in milliseconds
+    """
+    record = _current.get()
+    if record is not None:
+        record["llm"].append((provider, outcome, duration_ms))
+
+
+class FlightRecorder:
+    """
+    Bounded min-heap of the slowest requests seen in the recent window.
+    """
+
+    # Seconds between sweeps of entries older than the window
+    PRUNE_INTERVAL = 10.0
+
+    def __init__(self):
+        """Initialize an empty recorder."""
+        # (duration_ms, seq, finished_at, record); heap[0] is the fastest kept
+        self._heap: List[Tuple[float, int, float, Dict[str, Any]]] = []
+        self._seq = itertools.count()
+        self._last_prune = 0.0
+
+    @contextmanager
+    def capture(self, session_id: str, message_length: int) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        Capture one request.
+
+        Args:
+            session_id: Session identifier
+            message_length: Length of the incoming message
+
+        Yields:
+            The request record, or None when the recorder is disabled
+        """
+        if settings.flight_recorder_size <= 0:
+            yield None
+            return
+
+        record: Dict[str, Any] = {
+            "session_id": session_id,
+            "message_length": message_length,
+            "nodes": [],
+            "llm": [],
+        }
+        token = _current.set(record)
+        started = time.perf_counter()
+
+        try:
+            yield record
+        except BaseException:
+            record.setdefault("outcome", "error")
+            raise
+        finally:
+            _current.reset(token)
+            self._finish(record, (time.perf_counter() - started) * 1000)
+
+    def _finish(self, record: Dict[str, Any], duration_ms: float) -> None:
+        """Keep the record if it is among the slowest."""
+        now = time.time()
+        if now - self._last_prune > self.PRUNE_INTERVAL:
+            self._prune(now)
+
+        if len(self._heap) >= settings.flight_recorder_size and duration_ms <= self._heap[0][0]:
+            return
+
+        record["duration_ms"] = round(duration_ms, 1)
+        record.setdefault("outcome", "success")
+        entry = (duration_ms, next(self._seq), now, record)
+
+        if len(self._heap) >= settings.flight_recorder_size:
+            heapq.heapreplace(self._heap, entry)
+        else:
+            heapq.heappush(self._heap, entry)
+
+    def _prune(self, now: float) -> None:
+        """Drop entries older than the window."""
+        horizon = now - settings.flight_recorder_window_s
+        kept = [entry for entry in self._heap if entry[2] >= horizon]
+        if len(kept) != len(self._heap):
+            heapq.heapify(kept)
+            self._heap = kept
+        self._last_prune = now
+
+    def dump(self) -> List[Dict[str, Any]]:
+        """
+        Recorded requests, slowest first.
+
+        Returns:
+            JSON-ready list of request records
+        """
+        self._prune(time.time())
+
+        entries = []
+        for _, _, finished_at, record in sorted(self._heap, key=lambda e: e[0], reverse=True):
+            entries.append({
+                **record,
+                "finished_at": datetime.fromtimestamp(finished_at).isoformat(),
+                "nodes": [{"node": n, "ms": round(ms, 1)} for n, ms in record["nodes"]],
+                "llm": [
+                    {"provider": p, "outcome": o, "ms": round(ms, 1)}
+                    for p, o, ms in record["llm"]
+                ],
+            })
+        return entries
+
+    def clear(self) -> None:
+        """Forget all recorded requests."""
+        self._heap = []
+
+
+# Global flight recorder (one per worker process)
+flight_recorder = FlightRecorder()
@@ -4,14 +4,18 @@ Zero-trust validation using TRAI headers and domain age verification.
 """
 
 import re
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional, Tuple, List
 from datetime import datetime, timedelta
 import socket
 
 import tldextract
-import whois
 
 from utils.logger import logger
+from utils.metrics import WHOIS_CACHE, WHOIS_LATENCY
+from utils.tracing import span
 
 
 class ForensicsAnalyzer:
@@ -29,6 +33,15 @@ class ForensicsAnalyzer:
         'PNBSMS', 'BOISMS', 'CANBNK', 'UNIONSMS', 'IDBIBN',
     }
     
+    # WHOIS results per domain (registration dates rarely change)
+    WHOIS_CACHE_TTL = 86400  # seconds
+    WHOIS_ERROR_TTL = 60  # seconds; failed lookups are retried soon
+    WHOIS_ERROR = "⚠️ Error"
+    WHOIS_CACHE_MAX = 1024
+    _whois_cache: "OrderedDict[str, Tuple[float, Tuple[Optional[int], Optional[str]]]]" = OrderedDict()
+    # Profiler nodes run in worker threads; the lookup itself runs unlocked
+    _whois_lock = threading.Lock()
+    
     @staticmethod
     def validate_trai_header(sender_id: str) -> Tuple[bool, Optional[str]]:
         """
@@ -87,7 +100,44 @@ class ForensicsAnalyzer:
     @staticmethod
     def check_domain_age(domain: str) -> Tuple[Optional[int], Optional[str]]:
         """
-        Check domain registration age using WHOIS.
+        Check domain registration age using WHOIS, cached per domain.
+        
+        Args:
+            domain: Domain to check
+            
+        Returns:
+            (age_in_days, status_message) tuple
+        """
+        cache = ForensicsAnalyzer._whois_cache
+        now = time.monotonic()
+        
+        with ForensicsAnalyzer._whois_lock:
+            cached = cache.get(domain)
+            hit = cached is not None and cached[0] > now
+            if hit:
+                cache.move_to_end(domain)
+        if hit:
+            WHOIS_CACHE.labels("hit").inc()
+            return cached[1]
+        
+        WHOIS_CACHE.labels("miss").inc()
+        with WHOIS_LATENCY.time(), span("whois.lookup", domain=domain):
+            result = ForensicsAnalyzer._lookup_domain_age(domain)
+        
+        failed = result[0] is None and (result[1] or "").startswith(ForensicsAnalyzer.WHOIS_ERROR)
+        ttl = ForensicsAnalyzer.WHOIS_ERROR_TTL if failed else ForensicsAnalyzer.WHOIS_CACHE_TTL
+        with ForensicsAnalyzer._whois_lock:
+            cache[domain] = (now + ttl, result)
+            cache.move_to_end(domain)
+            while len(cache) > ForensicsAnalyzer.WHOIS_CACHE_MAX:
+                cache.popitem(last=False)
+        
+        return result
+    
+    @staticmethod
+    def _lookup_domain_age(domain: str) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Uncached WHOIS lookup behind check_domain_age.
         
         Args:
             domain: Domain to check
@@ -96,6 +146,9 @@ class ForensicsAnalyzer:
             (age_in_days, status_message) tuple
         """
         try:
+            # Only needed when domain age checks are on; slow to import
+            import whois
+            
             w = whois.whois(domain)
             
             # Get creation date
@@ -122,7 +175,7 @@ class ForensicsAnalyzer:
                 
         except Exception as e:
             logger.warning(f"WHOIS error for {domain}: {e}")
-            return None, f"⚠️ Error: {str(e)[:50]}"
+            return None, f"{ForensicsAnalyzer.WHOIS_ERROR}: {str(e)[:50]}"
     
     @staticmethod
     def calculate_risk_score(
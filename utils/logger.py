@@ -1,23 +1,30 @@
 """
 🛡️ National Security Grade Logger
 Rich-formatted logging with visual excellence for demo purposes.
+
+Records are handed to a QueueHandler and written by a QueueListener thread,
+so the event loop never blocks on stdout. Security event messages are
+formatted on that thread, only for events that pass the level check,
+per-event-type sampling and rate limits.
 """
 
+import atexit
 import logging
+import os
+import queue
+import random
 import sys
-from typing import Optional
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
 from datetime import datetime
 
-from rich.console import Console
-from rich.logging import RichHandler
-from rich.theme import Theme
-import structlog
-
-from config import settings
+from config import settings, LogFormat
 
 
 # Custom theme for "National Security" aesthetics
-SECURITY_THEME = Theme({
+SECURITY_THEME = {
     "info": "cyan bold",
     "warning": "yellow bold",
     "error": "red bold",
@@ -25,9 +32,131 @@ SECURITY_THEME = Theme({
     "success": "green bold",
     "agent": "magenta bold",
     "intel": "blue bold",
-})
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Create the Rich `console` on first use; rich is slow to import."""
+    if name == "console":
+        from rich.console import Console
+        from rich.theme import Theme
+        
+        global console
+        console = Console(theme=Theme(SECURITY_THEME))
+        return console
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-console = Console(theme=SECURITY_THEME)
+
+class _LazyQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+    
+    The stock handler formats every record before queueing it so it can be
+    pickled; our queue never leaves the process.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _SecurityMessage:
+    """Security event message, rendered only when a handler formats it."""
+    
+    __slots__ = ("event_type", "prefix", "session_id", "message", "details")
+    
+    def __init__(
+        self,
+        event_type: str,
+        prefix: str,
+        session_id: Optional[str],
+        message: str,
+        details: Dict[str, Any],
+    ):
+        self.event_type = event_type
+        self.prefix = prefix
+        self.session_id = session_id
+        self.message = message
+        self.details = details
+    
+    def __str__(self) -> str:
+        session_info = f"({self.session_id[:8]}...)" if self.session_id else ""
+        log_msg = f"{self.prefix} {session_info} {self.message}"
+        
+        if self.details:
+            details = " | ".join([f"{k}={v}" for k, v in self.details.items()])
+            log_msg += f" | {details}"
+        
+        return log_msg
+
+
+def _add_security_fields(_, __, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """structlog processor: lift security event fields to top-level JSON keys."""
+    record = event_dict.get("_record")
+    security = getattr(record, "security", None)
+    if security is not None:
+        event_dict["event"] = security.message
+        event_dict["event_type"] = security.event_type
+        if security.session_id:
+            event_dict["session_id"] = security.session_id
+        for key, value in security.details.items():
+            event_dict.setdefault(key, value if isinstance(value, (int, float, bool)) or value is None else str(value))
+    return event_dict
+
+
+def _build_formatter() -> logging.Formatter:
+    """
+    Formatter for the selected LOG_FORMAT.
+    
+    Returns:
+        Plain console formatter, or a structlog JSON formatter
+    """
+    if settings.log_format == LogFormat.JSON:
+        import structlog
+        
+        return structlog.stdlib.ProcessorFormatter(
+            processor=structlog.processors.JSONRenderer(ensure_ascii=False),
+            foreign_pre_chain=[
+                structlog.stdlib.add_log_level,
+                structlog.stdlib.add_logger_name,
+                structlog.processors.TimeStamper(fmt="iso", utc=True),
+                _add_security_fields,
+                structlog.processors.format_exc_info,
+            ],
+        )
+    
+    return logging.Formatter(
+        fmt='[%(asctime)s] %(levelname)-8s %(message)s',
+        datefmt='%H:%M:%S',
+    )
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[_LazyQueueHandler] = None
+
+
+def _start_listener(output: logging.Handler) -> None:
+    """Start a fresh queue and writer thread feeding `output`."""
+    global _listener
+    
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _queue_handler.queue = log_queue
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_after_fork() -> None:
+    """Writer threads do not survive fork(); give the child its own."""
+    if _listener is not None:
+        _start_listener(_listener.handlers[0])
 
 
 def setup_logging() -> logging.Logger:
@@ -37,21 +166,78 @@ def setup_logging() -> logging.Logger:
     Returns:
         Configured logger instance
     """
+    global _queue_handler
     
     # Clear existing handlers
+    _stop_listener()
     logging.root.handlers.clear()
+    logging.root.setLevel(getattr(logging, settings.log_level))
     
     # Use simple console logging for Windows compatibility
-    logging.basicConfig(
-        level=getattr(logging, settings.log_level),
-        format='[%(asctime)s] %(levelname)-8s %(message)s',
-        datefmt='%H:%M:%S',
-        stream=sys.stdout,
-    )
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(_build_formatter())
+    
+    if settings.log_async:
+        _queue_handler = _LazyQueueHandler(queue.SimpleQueue())
+        logging.root.addHandler(_queue_handler)
+        _start_listener(output)
+    else:
+        logging.root.addHandler(output)
     
     return logging.getLogger("honeypot")
 
 
+class _EventGate:
+    """
+    Per-event-type sampling and per-second rate limiting.
+    """
+    
+    def __init__(self):
+        """Initialize empty per-type windows."""
+        self._lock = threading.Lock()
+        # event_type -> [window_second, emitted, dropped]
+        self._windows: Dict[str, list] = {}
+    
+    def allow(self, event_type: str, logger: logging.Logger) -> bool:
+        """
+        Decide whether an event of this type is logged.
+        
+        Args:
+            event_type: Security event type
+            logger: Logger used to report suppressed events
+            
+        Returns:
+            True if the event should be logged
+        """
+        rate = settings.log_sample_rates.get(event_type)
+        if rate is not None and random.random() >= rate:
+            return False
+        
+        limit = settings.log_rate_limits.get(event_type)
+        if not limit:
+            return True
+        
+        now = int(time.monotonic())
+        with self._lock:
+            window = self._windows.get(event_type)
+            if window is None or window[0] != now:
+                dropped = window[2] if window else 0
+                self._windows[event_type] = [now, 1, 0]
+            else:
+                dropped = 0
+                if window[1] >= limit:
+                    window[2] += 1
+                    return False
+                window[1] += 1
+        
+        if dropped:
+            logger.warning(f"[SYST] Rate limit suppressed {dropped} {event_type} events")
+        return True
+
+
+_event_gate = _EventGate()
+
+
 def log_security_event(
     logger: logging.Logger,
     event_type: str,
@@ -69,6 +255,12 @@ def log_security_event(
         session_id: Optional session identifier
         **kwargs: Additional context data
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
+    event_type = event_type.upper()
+    if not _event_gate.allow(event_type, logger):
+        return
     
     prefix_map = {
         "PROFILER": "[PROF]",
@@ -79,17 +271,13 @@ def log_security_event(
         "INTEL": "[INTL]",
     }
     
-    prefix = prefix_map.get(event_type.upper(), "[INFO]")
-    
-    session_info = f"({session_id[:8]}...)" if session_id else ""
-    log_msg = f"{prefix} {session_info} {message}"
-    
-    if kwargs:
-        details = " | ".join([f"{k}={v}" for k, v in kwargs.items()])
-        log_msg += f" | {details}"
+    prefix = prefix_map.get(event_type, "[INFO]")
     
-    logger.info(log_msg)
+    security = _SecurityMessage(event_type, prefix, session_id, message, kwargs)
+    logger.info("%s", security, extra={"security": security})
 
 
 # Initialize global logger
 logger = setup_logging()
+atexit.register(_stop_listener)
+os.register_at_fork(after_in_child=_restart_after_fork)
@@ -0,0 +1,255 @@
+"""
+⏱️ Event-Loop Monitor
+Continuous event-loop lag measurement and blocking-call detection.
+
+A small task ticks every `loop_monitor_interval_ms` and records how late
+each tick runs. Lag percentiles over the recent window are exported as
+metrics and feed the /readyz loop-lag check.
+
+In DEBUG mode a watchdog thread also watches the tick heartbeat. When the
+loop thread is stuck longer than `loop_block_threshold_ms` it captures that
+thread's stack, so sync SDK calls, WHOIS lookups, sync Redis or time.sleep
+on the async path show up with their call site in /admin/event-loop.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from utils.logger import logger
+from utils.metrics import LOOP_BLOCKS, LOOP_LAG, LOOP_LAG_QUANTILE
+from config import settings
+
+
+# Call sites inside this tree are preferred over library frames
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+
+# Tick interval between percentile gauge updates
+_QUANTILE_EVERY = 50
+
+
+def _application_site(frame) -> str:
+    """
+    Innermost frame that belongs to this application (not a library).
+
+    Args:
+        frame: Innermost frame of the blocked thread
+
+    Returns:
+        "path/to/file.py:line function"
+    """
+    innermost = frame
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_ROOT) and "site-packages" not in filename and filename != __file__:
+            break
+        frame = frame.f_back
+    frame = frame or innermost
+    filename = frame.f_code.co_filename
+    if filename.startswith(_ROOT):
+        filename = filename[len(_ROOT):]
+    return f"{filename}:{frame.f_lineno} {frame.f_code.co_name}"
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class LoopMonitor:
+    """
+    Lag sampler plus (DEBUG only) blocking-call watchdog for one event loop.
+    """
+
+    # Distinct call sites kept in the block report
+    MAX_SITES = 100
+
+    def __init__(self):
+        """Initialize as stopped."""
+        self._task: Optional[asyncio.Task] = None
+        self._lags: Deque[float] = deque()
+        self._heartbeat = 0.0
+        self._loop_thread: Optional[int] = None
+
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._blocks: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def running(self) -> bool:
+        """Whether the lag sampler is running."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def watchdog_enabled(self) -> bool:
+        """Stack capture runs in DEBUG mode with a non-zero threshold."""
+        return settings.debug and settings.loop_block_threshold_ms > 0
+
+    def start(self) -> None:
+        """Start sampling the running loop (and the watchdog in DEBUG)."""
+        if not settings.loop_monitor_enabled or self.running:
+            return
+
+        interval = settings.loop_monitor_interval_ms / 1000
+        self._lags = deque(maxlen=max(int(settings.loop_monitor_window_s / interval), 1))
+        self._heartbeat = time.perf_counter()
+        self._loop_thread = threading.get_ident()
+        self._task = asyncio.create_task(self._run(interval))
+
+        if self.watchdog_enabled:
+            self._stop.clear()
+            self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop the sampler and the watchdog."""
+        if self._watchdog is not None:
+            self._stop.set()
+            self._watchdog.join()
+            self._watchdog = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, interval: float) -> None:
+        """Tick, measure the overshoot, repeat."""
+        ticks = 0
+        while True:
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            now = time.perf_counter()
+            self._heartbeat = now
+
+            lag = max(now - expected, 0.0)
+            self._lags.append(lag)
+            LOOP_LAG.observe(lag)
+
+            ticks += 1
+            if ticks % _QUANTILE_EVERY == 0:
+                ordered = sorted(self._lags)
+                for q in (0.5, 0.95, 0.99):
+                    LOOP_LAG_QUANTILE.labels(str(q)).set(_percentile(ordered, q))
+
+    def _watch(self) -> None:
+        """Watchdog thread: capture the loop thread's stack while it is stuck."""
+        threshold = settings.loop_block_threshold_ms / 1000
+        interval = settings.loop_monitor_interval_ms / 1000
+        poll = max(threshold / 4, 0.005)
+        captured_beat = None
+        site = None
+
+        while not self._stop.wait(poll):
+            beat = self._heartbeat
+            # How long past the next tick's due time the loop has been stuck
+            stalled = time.perf_counter() - beat - interval
+            if stalled < threshold:
+                continue
+
+            if beat != captured_beat:
+                frame = sys._current_frames().get(self._loop_thread)
+                if frame is None:
+                    continue
+                captured_beat = beat
+                site = _application_site(frame)
+                self._record_block(site, frame)
+            self._extend_block(site, stalled * 1000)
+
+    def _record_block(self, site: str, frame) -> None:
+        """Count a new stall at `site` and keep its stack."""
+        stack = "".join(traceback.format_stack(frame, limit=25))
+        with self._lock:
+            entry = self._blocks.get(site)
+            if entry is None and len(self._blocks) < self.MAX_SITES:
+                entry = self._blocks[site] = {"count": 0, "max_ms": 0.0, "total_ms": 0.0}
+            if entry is not None:
+                entry["count"] += 1
+                entry["last_seen"] = time.time()
+                entry["stack"] = stack
+                entry["_current_ms"] = 0.0
+        # Sites past MAX_SITES share one series so the label set stays bounded
+        LOOP_BLOCKS.labels(site if entry is not None else "other").inc()
+        logger.warning(f"⏱️ Event loop blocked at {site}")
+
+    def _extend_block(self, site: str, blocked_ms: float) -> None:
+        """Grow the duration of the stall currently in progress."""
+        with self._lock:
+            entry = self._blocks.get(site)
+            if entry is None:
+                return
+            entry["total_ms"] += max(blocked_ms - entry["_current_ms"], 0.0)
+            entry["_current_ms"] = blocked_ms
+            entry["max_ms"] = max(entry["max_ms"], blocked_ms)
+
+    def lag_ms(self, q: float = 0.95) -> float:
+        """
+        Lag percentile over the recent window.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Lag in milliseconds
+        """
+        return _percentile(sorted(self._lags), q) * 1000
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Lag percentiles and blocking call sites.
+
+        Returns:
+            Report dictionary, worst call sites first
+        """
+        ordered = sorted(self._lags)
+        with self._lock:
+            blocks = sorted(
+                (
+                    {
+                        "site": site,
+                        "count": entry["count"],
+                        "max_ms": round(entry["max_ms"], 1),
+                        "total_ms": round(entry["total_ms"], 1),
+                        "last_seen": entry["last_seen"],
+                        "stack": entry["stack"],
+                    }
+                    for site, entry in self._blocks.items()
+                ),
+                key=lambda block: block["total_ms"],
+                reverse=True,
+            )
+
+        return {
+            "running": self.running,
+            "watchdog": self._watchdog is not None,
+            "interval_ms": settings.loop_monitor_interval_ms,
+            "samples": len(ordered),
+            "lag_ms": {
+                "p50": round(_percentile(ordered, 0.5) * 1000, 2),
+                "p95": round(_percentile(ordered, 0.95) * 1000, 2),
+                "p99": round(_percentile(ordered, 0.99) * 1000, 2),
+                "max": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+            },
+            "block_threshold_ms": settings.loop_block_threshold_ms,
+            "blocking_sites": blocks,
+        }
+
+    def clear(self) -> None:
+        """Forget recorded lag samples and blocking sites."""
+        self._lags.clear()
+        with self._lock:
+            self._blocks.clear()
+
+
+# Global loop monitor (one per worker process)
+loop_monitor = LoopMonitor()
@@ -0,0 +1,165 @@
+"""
+📊 Prometheus Metrics
+Latency histograms and outcome counters for every stage of a turn.
+
+Safe across gunicorn workers: when PROMETHEUS_MULTIPROC_DIR is set (see
+gunicorn.conf.py and the Dockerfile), each worker writes its samples to that
+directory and /metrics aggregates all of them.
+"""
+
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+
+# Request-level and node-level latencies span milliseconds to LLM timeouts
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+# ===================================
+# Requests & Graph Nodes
+# ===================================
+REQUEST_LATENCY = Histogram(
+    "honeypot_request_duration_seconds",
+    "End-to-end /api/honeypot latency",
+    ["outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+NODE_LATENCY = Histogram(
+    "honeypot_node_duration_seconds",
+    "Graph node latency (start, detect, engage, extract, callback)",
+    ["node"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# ===================================
+# LLM Providers
+# ===================================
+LLM_LATENCY = Histogram(
+    "honeypot_llm_duration_seconds",
+    "LLM provider call latency",
+    ["provider", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# ===================================
+# Redis & State
+# ===================================
+REDIS_LATENCY = Histogram(
+    "honeypot_redis_duration_seconds",
+    "Redis operation latency",
+    ["op"],
+    buckets=FAST_BUCKETS,
+)
+STATE_SIZE = Histogram(
+    "honeypot_state_size_bytes",
+    "Serialized session state size",
+    buckets=(1024, 4096, 16384, 32768, 65536, 131072, 262144, 524288, 1048576),
+)
+
+# ===================================
+# Forensics
+# ===================================
+WHOIS_LATENCY = Histogram(
+    "honeypot_whois_duration_seconds",
+    "WHOIS lookup latency (cache misses only)",
+    buckets=LATENCY_BUCKETS,
+)
+WHOIS_CACHE = Counter(
+    "honeypot_whois_cache_total",
+    "WHOIS domain age cache lookups",
+    ["result"],
+)
+
+# ===================================
+# Callback
+# ===================================
+CALLBACKS = Counter(
+    "honeypot_callbacks_total",
+    "GUVI callback outcomes",
+    ["outcome"],
+)
+
+# ===================================
+# Admission & Degradation
+# ===================================
+ADMISSION_ACTIVE = Gauge(
+    "honeypot_admission_active",
+    "Requests holding an admission slot",
+    multiprocess_mode="livesum",
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "honeypot_admission_queue_depth",
+    "Requests waiting for an admission slot",
+    multiprocess_mode="livesum",
+)
+ADMISSION_WAIT = Histogram(
+    "honeypot_admission_wait_seconds",
+    "Queue wait of admitted requests",
+    buckets=FAST_BUCKETS + (2.5, 5.0),
+)
+ADMISSION_SHED = Counter(
+    "honeypot_admission_shed_total",
+    "Requests shed by admission control",
+    ["reason"],
+)
+DEGRADATION_LEVEL = Gauge(
+    "honeypot_degradation_level",
+    "Current degradation level (0 = normal)",
+    multiprocess_mode="livemax",
+)
+
+# ===================================
+# Event Loop
+# ===================================
+LOOP_LAG = Histogram(
+    "honeypot_event_loop_lag_seconds",
+    "How late the loop monitor's periodic tick ran",
+    buckets=FAST_BUCKETS + (2.5, 5.0),
+)
+LOOP_LAG_QUANTILE = Gauge(
+    "honeypot_event_loop_lag_quantile_seconds",
+    "Event-loop lag percentiles over the recent window",
+    ["quantile"],
+    multiprocess_mode="livemax",
+)
+LOOP_BLOCKS = Counter(
+    "honeypot_event_loop_blocks_total",
+    "Loop stalls over the block threshold, by innermost application call site",
+    ["site"],
+)
+
+# ===================================
+# Startup
+# ===================================
+STARTUP_DURATION = Gauge(
+    "honeypot_startup_seconds",
+    "Time from importing main to ready, per worker",
+    multiprocess_mode="liveall",
+)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text format.
+
+    Returns:
+        (body, content_type) tuple
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
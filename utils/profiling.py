@@ -0,0 +1,319 @@
+"""
+🔬 On-Demand Profiling
+CPU and memory profiling of a live worker, driven from admin endpoints.
+
+CPU: arm the profiler for the next N /api/honeypot requests, either with
+cProfile (pstats text) or a stack sampler over all threads (collapsed
+stacks, ready for flamegraph.pl or speedscope).
+
+Memory: tracemalloc snapshots that can be diffed against each other, to
+find growth in long-lived structures such as the in-memory state store.
+
+Everything here is gated by PROFILING_ENABLED; when nothing is armed the
+per-request hooks are a single attribute check.
+"""
+
+import cProfile
+import io
+import itertools
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Literal, Optional
+
+from utils.logger import logger, log_security_event
+from config import settings
+
+
+ProfileMode = Literal["cprofile", "sampling"]
+
+# cProfile follows every thread only from Python 3.12 (sys.monitoring);
+# before that, executor threads need their own profiler
+_PER_THREAD_CPROFILE = sys.version_info < (3, 12)
+
+
+class ProfilerBusy(Exception):
+    """Raised when a profile is requested while another one is running."""
+
+
+class _CpuSession:
+    """One armed CPU profile covering the next `requests` requests."""
+
+    def __init__(self, mode: ProfileMode, requests: int, interval_ms: int):
+        self.mode = mode
+        self.requests = requests
+        self.interval_ms = interval_ms
+        self.started = 0
+        self.finished = 0
+        self.running = False
+
+        self.profile: Optional[cProfile.Profile] = None
+        self.thread_profiles: List[cProfile.Profile] = []
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Start collecting (on the event loop thread)."""
+        self.running = True
+        if self.mode == "cprofile":
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        else:
+            self._sampler = threading.Thread(target=self._sample, name="stack-sampler", daemon=True)
+            self._sampler.start()
+
+    def stop(self) -> None:
+        """Stop collecting."""
+        self.running = False
+        if self.profile is not None:
+            self.profile.disable()
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+
+    def _sample(self) -> None:
+        """Sampler thread: record the stack of every other thread."""
+        names = {}
+        interval = self.interval_ms / 1000
+        me = threading.get_ident()
+
+        while not self._stop.wait(interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, "thread"))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def report(self) -> str:
+        """
+        Render the finished profile.
+
+        Returns:
+            pstats text (cprofile) or collapsed stacks (sampling)
+        """
+        if self.mode == "sampling":
+            return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+        out = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=out)
+        for extra in self.thread_profiles:
+            stats.add(extra)
+        stats.sort_stats("cumulative").print_stats(60)
+        return out.getvalue()
+
+
+class RequestProfiler:
+    """
+    Profiles the next N requests handled by this worker.
+    """
+
+    def __init__(self):
+        """Initialize with nothing armed."""
+        self.session: Optional[_CpuSession] = None
+        self._report: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def arm(self, mode: ProfileMode, requests: int, interval_ms: int) -> None:
+        """
+        Profile the next `requests` requests.
+
+        Args:
+            mode: "cprofile" or "sampling"
+            requests: Number of requests to cover
+            interval_ms: Sampling interval (sampling mode)
+
+        Raises:
+            ProfilerBusy: If a profile is already armed or running
+        """
+        if self.session is not None:
+            raise ProfilerBusy("A CPU profile is already in progress")
+
+        self._report = None
+        self.session = _CpuSession(mode, min(requests, settings.profiling_max_requests), interval_ms)
+        log_security_event(
+            logger,
+            "SYSTEM",
+            "🔬 CPU profiler armed",
+            mode=mode,
+            requests=self.session.requests,
+        )
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Count a request towards the armed profile."""
+        session = self.session
+        if session is None or session.started >= session.requests:
+            yield
+            return
+
+        if not session.running:
+            session.start()
+        session.started += 1
+
+        try:
+            yield
+        finally:
+            session.finished += 1
+            if session.finished >= session.requests:
+                self._finish(session)
+
+    @contextmanager
+    def thread_profile(self) -> Iterator[None]:
+        """
+        Profile a graph node running in an executor thread.
+
+        Only needed where cProfile cannot see other threads (Python < 3.12).
+        """
+        session = self.session
+        if session is None or not session.running or session.mode != "cprofile" or not _PER_THREAD_CPROFILE:
+            yield
+            return
+
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self._lock:
+                session.thread_profiles.append(profile)
+
+    def _finish(self, session: _CpuSession) -> None:
+        """Stop the session and keep its report."""
+        session.stop()
+        self._report = session.report()
+        self.session = None
+        log_security_event(
+            logger,
+            "SYSTEM",
+            "🔬 CPU profile finished",
+            mode=session.mode,
+            requests=session.finished,
+            samples=session.samples if session.mode == "sampling" else None,
+        )
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Current profiler state.
+
+        Returns:
+            Status dictionary
+        """
+        session = self.session
+        if session is None:
+            return {"status": "done" if self._report else "idle"}
+        return {
+            "status": "running" if session.running else "armed",
+            "mode": session.mode,
+            "requests": session.requests,
+            "finished": session.finished,
+        }
+
+    def report(self) -> Optional[str]:
+        """Report of the last finished profile, if any."""
+        return self._report
+
+
+class MemoryProfiler:
+    """
+    tracemalloc snapshots kept for diffing.
+    """
+
+    # Snapshots kept before the oldest is dropped
+    MAX_SNAPSHOTS = 5
+
+    def __init__(self):
+        """Initialize with tracing off."""
+        self._snapshots: "OrderedDict[int, tuple[float, tracemalloc.Snapshot]]" = OrderedDict()
+        self._ids = itertools.count(1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Take a snapshot, starting tracemalloc on first use.
+
+        Returns:
+            Snapshot id and traced memory
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(settings.profiling_tracemalloc_frames)
+            log_security_event(logger, "SYSTEM", "🔬 tracemalloc started")
+
+        snapshot_id = next(self._ids)
+        self._snapshots[snapshot_id] = (time.time(), self._take())
+        while len(self._snapshots) > self.MAX_SNAPSHOTS:
+            self._snapshots.popitem(last=False)
+
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "snapshot_id": snapshot_id,
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "snapshots": list(self._snapshots),
+        }
+
+    @staticmethod
+    def _take() -> tracemalloc.Snapshot:
+        """Snapshot without tracemalloc's own bookkeeping."""
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+
+    def diff(self, since: int, limit: int = 25, key_type: str = "lineno") -> Dict[str, Any]:
+        """
+        Compare the current heap to an earlier snapshot.
+
+        Args:
+            since: Snapshot id to compare against
+            limit: Number of top growth entries
+            key_type: "lineno", "filename" or "traceback"
+
+        Returns:
+            Top allocation sites by growth
+
+        Raises:
+            KeyError: If the snapshot is unknown
+        """
+        taken_at, old = self._snapshots[since]
+        stats = self._take().compare_to(old, key_type)
+
+        return {
+            "since": since,
+            "seconds": round(time.time() - taken_at, 1),
+            "total_growth_bytes": sum(stat.size_diff for stat in stats),
+            "top": [
+                {
+                    "site": stat.traceback.format() if key_type == "traceback" else str(stat.traceback[0]),
+                    "size_diff_bytes": stat.size_diff,
+                    "size_bytes": stat.size,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in stats[:limit]
+            ],
+        }
+
+    def stop(self) -> None:
+        """Stop tracemalloc and forget all snapshots."""
+        self._snapshots.clear()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+# Global profilers (one per worker process)
+request_profiler = RequestProfiler()
+memory_profiler = MemoryProfiler()
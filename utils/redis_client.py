@@ -4,14 +4,63 @@ Handles state persistence and retrieval with automatic TTL management.
 """
 
 import json
-from typing import Optional, Dict, Any
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterator
 from datetime import datetime
 
 import redis
 from redis.exceptions import RedisError
 
 from config import settings
+from models.state import TRANSIENT_FIELDS
 from utils.logger import logger, log_security_event
+from utils.metrics import REDIS_LATENCY, STATE_SIZE
+from utils.tracing import span
+from utils.flight_recorder import note
+from utils.resources import resources
+
+
+# Acquire the session lease and mint a fencing token in one round trip.
+# Tokens only grow, so a writer holding an expired lease can be told apart
+# from the current holder.
+ACQUIRE_LEASE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return false
+end
+local token = redis.call('INCR', KEYS[2])
+redis.call('SET', KEYS[1], token, 'PX', ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return token
+"""
+
+# Renew or release the lease only if we are still its owner.
+RENEW_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Write the state blob unless a newer lease holder has already been granted.
+FENCED_SAVE_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[2]) or '0')
+if tonumber(ARGV[3]) < current then
+    return 0
+end
+redis.call('SETEX', KEYS[1], ARGV[1], ARGV[2])
+return 1
+"""
+
+
+# Placeholder stored while a worker is generating a reply
+REPLY_PENDING = "__pending__"
 
 
 class RedisClient:
@@ -31,6 +80,10 @@ class RedisClient:
             )
             # Test connection
             self.client.ping()
+            self._acquire_lease = self.client.register_script(ACQUIRE_LEASE_SCRIPT)
+            self._renew_lease = self.client.register_script(RENEW_LEASE_SCRIPT)
+            self._release_lease = self.client.register_script(RELEASE_LEASE_SCRIPT)
+            self._fenced_save = self.client.register_script(FENCED_SAVE_SCRIPT)
             log_security_event(
                 logger,
                 "SYSTEM",
@@ -54,10 +107,54 @@ class RedisClient:
         except RedisError:
             return False
     
+    @contextmanager
+    def _op(self, op: str) -> Iterator[None]:
+        """Time and trace one Redis command."""
+        with REDIS_LATENCY.labels(op).time(), span(f"redis.{op}", **{"db.system": "redis"}):
+            yield
+    
     def _get_key(self, session_id: str) -> str:
         """Generate Redis key for session."""
         return f"honeypot:session:{session_id}"
     
+    def _get_lease_key(self, session_id: str) -> str:
+        """Generate Redis key for the session lease."""
+        return f"honeypot:lease:{session_id}"
+    
+    def _get_fence_key(self, session_id: str) -> str:
+        """Generate Redis key for the session fencing counter."""
+        return f"honeypot:fence:{session_id}"
+    
+    @staticmethod
+    def serialize_state(state: Dict[str, Any]) -> str:
+        """
+        Encode session state for storage (transient fields dropped).
+        
+        Args:
+            state: State dictionary
+            
+        Returns:
+            JSON string
+        """
+        return json.dumps(
+            {k: v for k, v in state.items() if k not in TRANSIENT_FIELDS},
+            default=str,
+            ensure_ascii=False,
+        )
+    
+    @staticmethod
+    def deserialize_state(serialized: str) -> Dict[str, Any]:
+        """
+        Decode a stored session state.
+        
+        Args:
+            serialized: JSON string written by serialize_state
+            
+        Returns:
+            State dictionary
+        """
+        return json.loads(serialized)
+    
     def save_state(self, session_id: str, state: Dict[str, Any]) -> bool:
         """
         Save session state to Redis with TTL.
@@ -75,15 +172,40 @@ class RedisClient:
             # Add save timestamp
             state["_saved_at"] = datetime.utcnow().isoformat()
             
-            # Serialize state
-            serialized = json.dumps(state, default=str, ensure_ascii=False)
+            serialized = self.serialize_state(state)
+            STATE_SIZE.observe(len(serialized))
+            note(state_bytes=len(serialized))
             
-            if self.client:
-                self.client.setex(
-                    key,
-                    settings.redis_ttl,
-                    serialized
+            fencing_token = state.get("fencing_token")
+            
+            if self.client and fencing_token:
+                with self._op("save"):
+                    written = self._fenced_save(
+                        keys=[key, self._get_fence_key(session_id)],
+                        args=[settings.redis_ttl, serialized, fencing_token],
+                    )
+                if not written:
+                    logger.warning(
+                        f"⚠️ Stale write rejected for {session_id} "
+                        f"(fencing token {fencing_token} superseded)"
+                    )
+                    return False
+                log_security_event(
+                    logger,
+                    "SYSTEM",
+                    f"State saved to Redis",
+                    session_id=session_id,
+                    size_bytes=len(serialized),
+                    fence=fencing_token,
                 )
+                return True
+            elif self.client:
+                with self._op("save"):
+                    self.client.setex(
+                        key,
+                        settings.redis_ttl,
+                        serialized
+                    )
                 log_security_event(
                     logger,
                     "SYSTEM",
@@ -115,12 +237,13 @@ class RedisClient:
         
         try:
             if self.client:
-                serialized = self.client.get(key)
+                with self._op("load"):
+                    serialized = self.client.get(key)
             else:
                 serialized = self._memory_store.get(key)
             
             if serialized:
-                state = json.loads(serialized)
+                state = self.deserialize_state(serialized)
                 log_security_event(
                     logger,
                     "SYSTEM",
@@ -155,7 +278,8 @@ class RedisClient:
         
         try:
             if self.client:
-                self.client.delete(key)
+                with self._op("delete"):
+                    self.client.delete(key)
             else:
                 self._memory_store.pop(key, None)
             
@@ -193,6 +317,172 @@ class RedisClient:
             logger.error(f"❌ Failed to extend TTL for {session_id}: {e}")
             return False
     
+    def _get_reply_key(self, session_id: str, message_timestamp: int) -> str:
+        """Generate Redis key for a cached reply."""
+        return f"honeypot:reply:{session_id}:{message_timestamp}"
+    
+    def get_reply(self, session_id: str, message_timestamp: int) -> Optional[Any]:
+        """
+        Load the cached reply for a message, if one has been generated.
+        
+        Args:
+            session_id: Session identifier
+            message_timestamp: Epoch milliseconds of the incoming message
+            
+        Returns:
+            Cached reply, or None if absent or still being generated
+        """
+        if not self.client:
+            return None
+        
+        try:
+            with self._op("reply_get"):
+                cached = self.client.get(self._get_reply_key(session_id, message_timestamp))
+            if not cached or cached == REPLY_PENDING:
+                return None
+            return json.loads(cached)
+        except (RedisError, json.JSONDecodeError) as e:
+            logger.error(f"❌ Failed to load cached reply for {session_id}: {e}")
+            return None
+    
+    def claim_reply(self, session_id: str, message_timestamp: int, ttl: int) -> bool:
+        """
+        Claim the right to generate the reply for a message.
+        
+        Args:
+            session_id: Session identifier
+            message_timestamp: Epoch milliseconds of the incoming message
+            ttl: Claim TTL in seconds
+            
+        Returns:
+            True if this worker should generate the reply, False if another
+            worker already is (or has)
+        """
+        if not self.client:
+            return True
+        
+        try:
+            with self._op("reply_claim"):
+                return bool(self.client.set(
+                    self._get_reply_key(session_id, message_timestamp),
+                    REPLY_PENDING,
+                    nx=True,
+                    ex=ttl,
+                ))
+        except RedisError as e:
+            logger.error(f"❌ Failed to claim reply for {session_id}: {e}")
+            return True
+    
+    def store_reply(self, session_id: str, message_timestamp: int, reply: Any, ttl: int) -> None:
+        """
+        Cache a generated reply for retried requests.
+        
+        Args:
+            session_id: Session identifier
+            message_timestamp: Epoch milliseconds of the incoming message
+            reply: JSON-serializable reply
+            ttl: Cache TTL in seconds
+        """
+        if not self.client:
+            return
+        
+        try:
+            with self._op("reply_store"):
+                self.client.setex(
+                    self._get_reply_key(session_id, message_timestamp),
+                    ttl,
+                    json.dumps(reply, ensure_ascii=False),
+                )
+        except RedisError as e:
+            logger.error(f"❌ Failed to cache reply for {session_id}: {e}")
+    
+    def drop_reply(self, session_id: str, message_timestamp: int) -> None:
+        """
+        Remove a reply claim so a retry can generate it again.
+        
+        Args:
+            session_id: Session identifier
+            message_timestamp: Epoch milliseconds of the incoming message
+        """
+        if not self.client:
+            return
+        
+        try:
+            self.client.delete(self._get_reply_key(session_id, message_timestamp))
+        except RedisError as e:
+            logger.error(f"❌ Failed to drop reply claim for {session_id}: {e}")
+    
+    def acquire_lease(self, session_id: str, ttl_ms: int) -> Optional[int]:
+        """
+        Try to acquire the cross-worker lease for a session.
+        
+        Args:
+            session_id: Session identifier
+            ttl_ms: Lease TTL in milliseconds
+            
+        Returns:
+            Fencing token if acquired, None if another worker holds the
+            lease, 0 if Redis is unavailable (in-process locking only)
+        """
+        if not self.client:
+            return 0
+        
+        try:
+            with self._op("lease_acquire"):
+                token = self._acquire_lease(
+                    keys=[self._get_lease_key(session_id), self._get_fence_key(session_id)],
+                    args=[ttl_ms, settings.redis_ttl],
+                )
+            return int(token) if token else None
+        except RedisError as e:
+            logger.error(f"❌ Failed to acquire lease for {session_id}: {e}")
+            return 0
+    
+    def renew_lease(self, session_id: str, token: int, ttl_ms: int) -> bool:
+        """
+        Extend a held session lease.
+        
+        Args:
+            session_id: Session identifier
+            token: Fencing token returned by acquire_lease
+            ttl_ms: New lease TTL in milliseconds
+            
+        Returns:
+            True if the lease is still ours, False otherwise
+        """
+        if not self.client or not token:
+            return True
+        
+        try:
+            with self._op("lease_renew"):
+                return bool(self._renew_lease(
+                    keys=[self._get_lease_key(session_id)],
+                    args=[token, ttl_ms],
+                ))
+        except RedisError as e:
+            logger.error(f"❌ Failed to renew lease for {session_id}: {e}")
+            return False
+    
+    def release_lease(self, session_id: str, token: int) -> None:
+        """
+        Release a held session lease.
+        
+        Args:
+            session_id: Session identifier
+            token: Fencing token returned by acquire_lease
+        """
+        if not self.client or not token:
+            return
+        
+        try:
+            with self._op("lease_release"):
+                self._release_lease(
+                    keys=[self._get_lease_key(session_id)],
+                    args=[token],
+                )
+        except RedisError as e:
+            logger.error(f"❌ Failed to release lease for {session_id}: {e}")
+    
     def close(self) -> None:
         """Close Redis connection."""
         if self.client:
@@ -200,5 +490,5 @@ class RedisClient:
             log_security_event(logger, "SYSTEM", "Redis connection closed")
 
 
-# Global Redis client instance
-redis_client = RedisClient()
+# Global Redis client instance (connects on first use, once per process)
+redis_client: RedisClient = resources.register("redis", RedisClient)
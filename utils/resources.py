@@ -0,0 +1,169 @@
+"""
+🧰 Lazy Resource Registry
+Global singletons (Redis client, LangGraph, callback service) built on first
+use instead of at import time.
+
+Importing a module no longer opens sockets or creates LLM SDK clients, so
+`gunicorn --preload` is safe and startup does not depend on the network.
+Each proxy remembers the PID that built its instance and rebuilds after a
+fork. The FastAPI lifespan warms all resources in parallel and marks the
+worker ready once they exist.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from utils.logger import logger, log_security_event
+
+
+class LazyResource:
+    """
+    Transparent proxy that builds its target on first attribute access.
+
+    Attribute reads, writes and deletes are forwarded to the instance, so
+    existing `redis_client.load_state(...)` style call sites keep working.
+    """
+
+    __slots__ = ("_lazy_name", "_lazy_factory", "_lazy_instance", "_lazy_pid", "_lazy_lock", "_lazy_build_ms")
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        object.__setattr__(self, "_lazy_name", name)
+        object.__setattr__(self, "_lazy_factory", factory)
+        object.__setattr__(self, "_lazy_instance", None)
+        object.__setattr__(self, "_lazy_pid", None)
+        object.__setattr__(self, "_lazy_lock", threading.Lock())
+        object.__setattr__(self, "_lazy_build_ms", None)
+
+    def _lazy_get(self) -> Any:
+        """Return the instance for this process, building it if needed."""
+        pid = os.getpid()
+        if self._lazy_pid == pid:
+            return self._lazy_instance
+
+        if self._lazy_pid is not None:
+            # Inherited across fork: never reuse the parent's sockets or lock
+            object.__setattr__(self, "_lazy_lock", threading.Lock())
+
+        with self._lazy_lock:
+            if self._lazy_pid != pid:
+                started = time.perf_counter()
+                instance = self._lazy_factory()
+                object.__setattr__(self, "_lazy_instance", instance)
+                object.__setattr__(self, "_lazy_build_ms", round((time.perf_counter() - started) * 1000, 1))
+                object.__setattr__(self, "_lazy_pid", pid)
+
+        return self._lazy_instance
+
+    def _lazy_built(self) -> bool:
+        """Whether this process already has an instance."""
+        return self._lazy_pid == os.getpid()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._lazy_get(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._lazy_get(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self._lazy_get(), name)
+
+    def __repr__(self) -> str:
+        state = "built" if self._lazy_built() else "lazy"
+        return f"<LazyResource {self._lazy_name} ({state})>"
+
+
+class ResourceRegistry:
+    """
+    Named lazy singletons with parallel warm-up and readiness tracking.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._resources: Dict[str, LazyResource] = {}
+        self._errors: Dict[str, str] = {}
+        self._ready_pid: Optional[int] = None
+
+    def register(self, name: str, factory: Callable[[], Any]) -> Any:
+        """
+        Register a singleton.
+
+        Args:
+            name: Resource name for status reporting
+            factory: Zero-argument constructor
+
+        Returns:
+            Lazy proxy standing in for the instance
+        """
+        proxy = LazyResource(name, factory)
+        self._resources[name] = proxy
+        return proxy
+
+    @property
+    def ready(self) -> bool:
+        """Whether every resource was built successfully in this process."""
+        return self._ready_pid == os.getpid()
+
+    async def warm(self) -> bool:
+        """
+        Build all resources concurrently in worker threads.
+
+        Returns:
+            True if every resource was built
+        """
+        names = list(self._resources)
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self._resources[name]._lazy_get) for name in names),
+            return_exceptions=True,
+        )
+
+        self._errors = {
+            name: f"{type(result).__name__}: {str(result)[:200]}"
+            for name, result in zip(names, results)
+            if isinstance(result, BaseException)
+        }
+        for name, error in self._errors.items():
+            logger.error(f"❌ Failed to initialize {name}: {error}")
+
+        if not self._errors:
+            self._ready_pid = os.getpid()
+
+        log_security_event(
+            logger,
+            "SYSTEM",
+            "Resources initialized" if not self._errors else "⚠️ Resources initialized with errors",
+            **{f"{name}_ms": proxy._lazy_build_ms for name, proxy in self._resources.items()},
+        )
+        return not self._errors
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-resource build state.
+
+        Returns:
+            Status dictionary keyed by resource name
+        """
+        return {
+            name: {
+                "built": proxy._lazy_built(),
+                "build_ms": proxy._lazy_build_ms if proxy._lazy_built() else None,
+                "error": self._errors.get(name),
+            }
+            for name, proxy in self._resources.items()
+        }
+
+    def close(self) -> None:
+        """Close resources built in this process that support it."""
+        for name, proxy in self._resources.items():
+            if proxy._lazy_built() and hasattr(proxy._lazy_instance, "close"):
+                try:
+                    proxy._lazy_instance.close()
+                except Exception as e:
+                    logger.warning(f"Error closing {name}: {e}")
+        self._ready_pid = None
+
+
+# Global resource registry
+resources = ResourceRegistry()
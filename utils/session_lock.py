@@ -0,0 +1,130 @@
+"""
+🔒 Per-Session Ordered Execution
+Serializes turns of the same session while different sessions run in parallel.
+
+Two layers:
+- In-process: one asyncio.Lock per active session (FIFO for waiters)
+- Cross-worker: a Redis lease carrying a monotonically increasing fencing
+  token, which save_state uses to reject writes from an expired holder
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from utils.logger import logger, log_security_event
+from utils.redis_client import redis_client
+from config import settings
+
+
+class SessionLockTimeout(Exception):
+    """Raised when a session lease cannot be acquired in time."""
+
+
+class SessionLockManager:
+    """
+    Hands out per-session locks without any global lock on the hot path.
+    """
+
+    def __init__(self):
+        """Initialize the lock map."""
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._holders: Dict[str, int] = {}
+
+    @property
+    def active_sessions(self) -> int:
+        """Number of sessions with a running or queued turn in this worker."""
+        return len(self._locks)
+
+    @asynccontextmanager
+    async def hold(self, session_id: str) -> AsyncIterator[Optional[int]]:
+        """
+        Hold a session exclusively for one turn.
+
+        Args:
+            session_id: Session identifier
+
+        Yields:
+            Fencing token to attach to state writes (0 when Redis is unavailable)
+
+        Raises:
+            SessionLockTimeout: If another worker keeps the lease too long
+        """
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = self._locks[session_id] = asyncio.Lock()
+        self._holders[session_id] = self._holders.get(session_id, 0) + 1
+
+        try:
+            async with lock:
+                token = await self._acquire_lease(session_id)
+                keepalive = None
+                if token:
+                    keepalive = asyncio.create_task(self._keep_lease(session_id, token))
+                try:
+                    yield token
+                finally:
+                    if keepalive:
+                        keepalive.cancel()
+                    await asyncio.to_thread(redis_client.release_lease, session_id, token)
+        finally:
+            self._holders[session_id] -= 1
+            if self._holders[session_id] == 0:
+                del self._holders[session_id]
+                del self._locks[session_id]
+
+    async def _acquire_lease(self, session_id: str) -> int:
+        """
+        Poll for the cross-worker lease with capped backoff.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Fencing token
+        """
+        ttl_ms = settings.session_lease_ttl_ms
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.session_lease_wait_timeout
+        delay = 0.025
+
+        while True:
+            token = await asyncio.to_thread(redis_client.acquire_lease, session_id, ttl_ms)
+            if token is not None:
+                return token
+
+            if loop.time() >= deadline:
+                raise SessionLockTimeout(
+                    f"Session {session_id} is busy on another worker"
+                )
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.25)
+
+    async def _keep_lease(self, session_id: str, token: int) -> None:
+        """
+        Renew the lease while a long turn (LLM, callback retries) is running.
+
+        Args:
+            session_id: Session identifier
+            token: Fencing token of the held lease
+        """
+        ttl_ms = settings.session_lease_ttl_ms
+        interval = ttl_ms / 3000
+
+        while True:
+            await asyncio.sleep(interval)
+            renewed = await asyncio.to_thread(redis_client.renew_lease, session_id, token, ttl_ms)
+            if not renewed:
+                log_security_event(
+                    logger,
+                    "SYSTEM",
+                    "⚠️ Session lease lost, writes from this turn will be fenced",
+                    session_id=session_id,
+                    fence=token,
+                )
+                return
+
+
+# Global session lock manager
+session_locks = SessionLockManager()
@@ -0,0 +1,175 @@
+"""
+🔭 Request Tracing
+OpenTelemetry spans for requests, graph nodes, LLM calls, Redis and callbacks.
+
+Tracing is opt-in (TRACING_ENABLED) and every helper here is a no-op until
+setup_tracing() has installed a tracer, so the OpenTelemetry SDK stays an
+optional dependency. Spans are sampled per request (parent-based), so a
+sampled request carries all of its child spans and an unsampled one none.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from utils.logger import logger
+from config import settings
+
+
+_tracer = None
+_provider = None
+
+
+def setup_tracing() -> bool:
+    """
+    Install the tracer provider and exporter for this worker process.
+
+    Call once per process after fork (from the FastAPI lifespan).
+
+    Returns:
+        True if spans will be recorded
+    """
+    global _tracer, _provider
+
+    if not settings.tracing_enabled or _tracer is not None:
+        return _tracer is not None
+
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError:
+        logger.warning("Tracing enabled but opentelemetry-sdk is not installed")
+        return False
+
+    exporter = _build_exporter()
+    if exporter is None:
+        return False
+
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": "agentic-honeypot", "process.pid": os.getpid()}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+    )
+    _provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(_provider)
+    _tracer = trace.get_tracer("honeypot")
+
+    logger.info(
+        f"✅ Tracing enabled ({settings.tracing_exporter}, "
+        f"sample ratio {settings.tracing_sample_ratio})"
+    )
+    return True
+
+
+def _build_exporter():
+    """
+    Create the configured span exporter.
+
+    Returns:
+        SpanExporter instance, or None if it cannot be created
+    """
+    if settings.tracing_exporter == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.warning("OTLP exporter selected but opentelemetry-exporter-otlp-proto-http is not installed")
+            return None
+        return OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint)
+
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+    directory = os.path.dirname(settings.tracing_file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # One JSON object per line, appended by every worker
+    return ConsoleSpanExporter(
+        out=open(settings.tracing_file_path, "a", encoding="utf-8"),
+        formatter=lambda span: span.to_json(indent=None) + "\n",
+    )
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and stop the exporter."""
+    global _tracer, _provider
+
+    if _provider is not None:
+        _provider.shutdown()
+    _tracer = None
+    _provider = None
+
+
+def _attributes(attributes: dict) -> dict:
+    """Drop None values, which OpenTelemetry rejects."""
+    return {k: v for k, v in attributes.items() if v is not None}
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Any]]:
+    """
+    Run a block inside a child span of the current span.
+
+    Exceptions are recorded on the span and re-raised.
+
+    Args:
+        name: Span name (e.g. "node.detect", "redis.save")
+        **attributes: Span attributes
+
+    Yields:
+        The span, or None when tracing is off
+    """
+    if _tracer is None:
+        yield None
+        return
+
+    with _tracer.start_as_current_span(name, attributes=_attributes(attributes)) as current:
+        yield current
+
+
+def record_span(name: str, started: float, error: Optional[BaseException] = None, **attributes: Any) -> None:
+    """
+    Record a finished operation as a span after the fact.
+
+    For call sites that already time themselves with perf_counter() and
+    would need re-indenting to use span().
+
+    Args:
+        name: Span name
+        started: perf_counter() value at operation start
+        error: Exception the operation failed with, if any
+        **attributes: Span attributes
+    """
+    if _tracer is None:
+        return
+
+    from opentelemetry.trace import Status, StatusCode
+
+    end_ns = time.time_ns()
+    start_ns = end_ns - int((time.perf_counter() - started) * 1e9)
+
+    finished = _tracer.start_span(name, start_time=start_ns, attributes=_attributes(attributes))
+    if error is not None:
+        finished.record_exception(error)
+        finished.set_status(Status(StatusCode.ERROR, str(error)[:200]))
+    finished.end(end_time=end_ns)
+
+
+def current_trace_id() -> Optional[str]:
+    """
+    Trace ID of the active sampled span, for log correlation.
+
+    Returns:
+        32-character hex trace ID, or None
+    """
+    if _tracer is None:
+        return None
+
+    from opentelemetry import trace
+
+    context = trace.get_current_span().get_span_context()
+    if not context.is_valid or not context.trace_flags.sampled:
+        return None
+    return format(context.trace_id, "032x")
@@ -0,0 +1,83 @@
+"""
+📼 Traffic Recorder
+Appends incoming /api/honeypot requests to a JSONL file for offline replay
+with benchmarks/replay.py.
+
+Off unless TRAFFIC_RECORD_PATH is set. Lines are written by a background
+thread, so recording never blocks the event loop; each worker writes its
+own file (the PID is appended to the configured name).
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from utils.logger import logger
+from config import settings
+
+
+class TrafficRecorder:
+    """
+    Queue plus writer thread, started on the first recorded request.
+    """
+
+    def __init__(self):
+        """Initialize as idle."""
+        self._queue: "queue.SimpleQueue[Optional[str]]" = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether requests are being recorded."""
+        return bool(settings.traffic_record_path)
+
+    def record(self, request: Dict[str, Any]) -> None:
+        """
+        Queue one request for writing.
+
+        Args:
+            request: IncomingMessage as a JSON-compatible dict
+        """
+        if not self.enabled:
+            return
+        if self._pid != os.getpid():
+            self._start()
+        self._queue.put(json.dumps({"received_at": time.time(), "request": request}, ensure_ascii=False))
+
+    def _start(self) -> None:
+        """Start this process's writer thread."""
+        self._pid = os.getpid()
+        self._queue = queue.SimpleQueue()
+        root, ext = os.path.splitext(settings.traffic_record_path)
+        path = f"{root}.{self._pid}{ext or '.jsonl'}"
+        self._writer = threading.Thread(target=self._write, args=(path,), name="traffic-recorder", daemon=True)
+        self._writer.start()
+        logger.info(f"📼 Recording traffic to {path}")
+
+    def _write(self, path: str) -> None:
+        """Writer thread: append queued lines, flushing when the queue drains."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            while True:
+                line = self._queue.get()
+                if line is None:
+                    break
+                f.write(line + "\n")
+                if self._queue.empty():
+                    f.flush()
+
+    def close(self) -> None:
+        """Flush and stop the writer thread."""
+        if self._writer is not None and self._pid == os.getpid():
+            self._queue.put(None)
+            self._writer.join(timeout=5)
+            self._writer = None
+            self._pid = None
+
+
+# Global traffic recorder (one writer per worker process)
+traffic_recorder = TrafficRecorder()